@@ -0,0 +1,5 @@
+import sys
+
+from power_research.cli import main
+
+sys.exit(main())
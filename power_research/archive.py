@@ -0,0 +1,113 @@
+import re
+from pathlib import Path
+
+# Per-day CSV archives written by the save_*_history functions.
+#   directory: location under the data root
+#   filename: per-day file name, {date} is YYYY-MM-DD
+#   date_column: column holding the day; added from the file name when the CSV lacks it
+#   key: columns identifying a row within a day (None = whole row)
+#   periods: column naming each row's delivery period, the period length in minutes, the
+#       local hour the delivery day starts at (Nord Pool UK days run 23:00-23:00) and optionally
+#       the first local hour traded, for products covering part of the day. Datasets with rows
+#       only for active periods, like Elexon acceptances, declare none and are complete once stored
+#   outturn: rows describe what happened, so a period only counts once it has ended and a file
+#       fetched during its day stays incomplete
+ARCHIVE_DATASETS = {
+    'nordpool/prices': {
+        'source': 'nordpool',
+        'directory': 'nordpool/prices',
+        'filename': '{date}_prices.csv',
+        'date_column': 'deliveryDate',
+        'key': ['deliveryDate', 'period'],
+        'periods': {'column': 'period', 'minutes': 60, 'day_start_hour': 23},
+    },
+    'nordpool/volumes': {
+        'source': 'nordpool',
+        'directory': 'nordpool/volumes',
+        'filename': '{date}_volumes.csv',
+        'date_column': 'deliveryDate',
+        'key': ['deliveryDate', 'period'],
+        'periods': {'column': 'period', 'minutes': 60, 'day_start_hour': 23},
+    },
+    'epexspot/GB/product_30': {
+        'source': 'epexspot',
+        'directory': 'epexspot/GB/product_30',
+        'filename': '{date}.csv',
+        'date_column': 'deliveryDate',
+        'key': ['deliveryDate', 'period'],
+        'periods': {'column': 'period', 'minutes': 30, 'day_start_hour': 0},
+    },
+    **{
+        f'epexspot_auction/GB/{auction}/product_30': {
+            'source': 'epexspot',
+            'directory': f'epexspot_auction/GB/{auction}/product_30',
+            'filename': '{date}.csv',
+            'date_column': 'deliveryDate',
+            'key': ['deliveryDate', 'period'],
+            # IDA2 and IDA3 only auction the 12:00-24:00 half hours
+            'periods': {'column': 'period', 'minutes': 30, 'day_start_hour': 0, 'first_hour': 0 if auction == 'GB-IDA1' else 12},
+        }
+        for auction in ('GB-IDA1', 'GB-IDA2', 'GB-IDA3')
+    },
+    'elexon/demand_outturn': {
+        'source': 'elexon',
+        'directory': 'elexon',
+        'filename': '{date}_demand_outturn.csv',
+        'date_column': 'settlementDate',
+        'key': ['settlementDate', 'settlementPeriod'],
+        'periods': {'column': 'settlementPeriod', 'minutes': 30, 'day_start_hour': 0},
+        'outturn': True,
+    },
+    'elexon/balancing_costs': {
+        'source': 'elexon',
+        'directory': 'elexon',
+        'filename': '{date}_balancing_costs.csv',
+        'date_column': 'settlementDate',
+        'key': ['settlementDate', 'settlementPeriod'],
+        'periods': {'column': 'settlementPeriod', 'minutes': 30, 'day_start_hour': 0},
+        'outturn': True,
+    },
+    'elexon/acceptances': {
+        'source': 'elexon',
+        'directory': 'elexon',
+        'filename': '{date}_acceptances.csv',
+        'date_column': 'settlementDate',
+        'key': None,
+    },
+}
+
+
+def dataset_spec(dataset: str) -> dict:
+    if dataset not in ARCHIVE_DATASETS:
+        raise ValueError(f"Unknown dataset {dataset!r}, expected one of {sorted(ARCHIVE_DATASETS)}")
+    return ARCHIVE_DATASETS[dataset]
+
+
+def archive_key(dataset: str, date_str: str) -> str:
+    """Storage key of a dataset's per-day file, relative to the data root."""
+    spec = dataset_spec(dataset)
+    return f"{spec['directory']}/{spec['filename'].format(date=date_str)}"
+
+
+def filename_pattern(dataset: str) -> re.Pattern:
+    """Regex matching the dataset's per-day file names, capturing the date."""
+    spec = dataset_spec(dataset)
+    return re.compile('^' + re.escape(spec['filename']).replace(re.escape('{date}'), r'(\d{4}-\d{2}-\d{2})') + '$')
+
+
+def daily_path(data_dir: str, dataset: str, date_str: str) -> Path:
+    return Path(data_dir) / archive_key(dataset, date_str)
+
+
+def daily_files(data_dir: str, dataset: str) -> dict[str, Path]:
+    """Date -> per-day file for every day currently present in a dataset directory."""
+    spec = dataset_spec(dataset)
+    pattern = filename_pattern(dataset)
+    files = {}
+    directory = Path(data_dir) / spec['directory']
+    if directory.is_dir():
+        for path in directory.iterdir():
+            match = pattern.match(path.name)
+            if match:
+                files[match.group(1)] = path
+    return dict(sorted(files.items()))
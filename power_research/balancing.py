@@ -0,0 +1,284 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent))
+
+import numpy as np
+import pandas as pd
+
+from panel import settlement_periods_in_day
+from scrapers.elexon import (
+    get_acceptances_with_prices, get_balancing_nonbm_disbsad_details_day, get_bm_units_reference,
+    join_acceptances_bid_offers,
+)
+
+MS_PER_HOUR = 3_600_000
+MAX_PERIODS = 50
+
+COST_COLUMNS = [
+    'settlementDate', 'settlementPeriod', 'bmUnit', 'acceptanceNumber', 'pairId',
+    'volume_mwh', 'price', 'cost'
+]
+
+
+def _mean_positive(p: np.ndarray, q: np.ndarray) -> np.ndarray:
+    """Mean of max(x, 0) for x moving linearly from p to q."""
+    mixed = (p > 0) != (q > 0)
+    spread = np.where(mixed, np.abs(p - q), 1.0)
+    return np.where(
+        mixed,
+        np.maximum(p, q) ** 2 / (2 * spread),
+        np.where(p > 0, (p + q) / 2, 0.0)
+    )
+
+
+def band_energy(d0: np.ndarray, d1: np.ndarray, hours: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """
+    MWh of a linear MW deviation (d0 to d1 over `hours`) that falls inside the band [lo, hi).
+
+    The energy above lo minus the energy above hi is exact for ramps that cross band edges.
+    """
+    finite = np.isfinite(hi)
+    edge = np.where(finite, hi, 0.0)
+    above_hi = np.where(finite, _mean_positive(d0 - edge, d1 - edge), 0.0)
+    return hours * (_mean_positive(d0 - lo, d1 - lo) - above_hi)
+
+
+def acceptance_costs(joined: pd.DataFrame, baseline: str | None = None) -> pd.DataFrame:
+    """
+    Price every acceptance against the bid-offer bands that applied while it ran.
+
+    Each BOALF row is a straight line from levelFrom at timeFrom to levelTo at timeTo. Volume is
+    the deviation from a baseline level. Increases fill offer bands (pairId 1, 2, ...) in order.
+    Decreases fill bid bands (pairId -1, -2, ...). Each band's width is the pair's |levelFrom|,
+    and the outermost band is open-ended. Cost is volume times price: offers cost the system
+    money, and bids usually pay it back.
+
+    Args:
+        joined: Output of join_acceptances_bid_offers / get_acceptances_with_prices, one or many days
+        baseline: Column holding the reference MW per row, e.g. a physical notification. Defaults
+            to the level each acceptance started from.
+
+    Returns:
+        One row per acceptance segment and priced band, with volume_mwh, price and cost in £
+    """
+    if joined.empty:
+        return pd.DataFrame(columns=COST_COLUMNS)
+
+    t_from = pd.to_datetime(joined['timeFrom_acceptance'], utc=True, format='ISO8601')
+    t_to = pd.to_datetime(joined['timeTo_acceptance'], utc=True, format='ISO8601')
+    t0 = t_from.to_numpy(dtype='datetime64[ms]').astype('int64')
+    t1 = t_to.to_numpy(dtype='datetime64[ms]').astype('int64')
+    o0 = joined['overlapStart'].to_numpy(dtype='datetime64[ms]').astype('int64')
+    o1 = joined['overlapEnd'].to_numpy(dtype='datetime64[ms]').astype('int64')
+    level_from = joined['levelFrom_acceptance'].to_numpy(dtype='float64')
+    level_to = joined['levelTo_acceptance'].to_numpy(dtype='float64')
+
+    # Levels at the edges of the part of the segment this pair covers
+    duration = np.maximum(t1 - t0, 1)
+    slope = (level_to - level_from) / duration
+    l0 = level_from + slope * (o0 - t0)
+    l1 = level_from + slope * (o1 - t0)
+    hours = (o1 - o0) / MS_PER_HOUR
+
+    if baseline is None:
+        first = pd.Series(t0, index=joined.index)
+        ref = (joined.assign(_t0=first).sort_values('_t0')
+               .groupby(['bmUnit', 'acceptanceNumber'])['levelFrom_acceptance'].transform('first'))
+        ref = ref.reindex(joined.index).to_numpy(dtype='float64')
+    else:
+        ref = joined[baseline].to_numpy(dtype='float64')
+
+    pair = joined['pairId'].to_numpy(dtype='int64')
+    sign = np.sign(pair)
+    width = np.abs(joined['levelFrom_bid_offer'].to_numpy(dtype='float64'))
+
+    # Band edges: cumulative widths of the lower pairs on the same side, for the same
+    # acceptance segment and pair validity window
+    bands = pd.DataFrame({
+        'bmUnit': joined['bmUnit'].to_numpy(), 'acceptanceNumber': joined['acceptanceNumber'].to_numpy(),
+        't0': t0, 'window': joined['timeFrom_bid_offer'].to_numpy(), 'sign': sign,
+        'rank': np.abs(pair), 'width': width,
+    })
+    bands = bands.sort_values('rank', kind='stable')
+    group = bands.groupby(['bmUnit', 'acceptanceNumber', 't0', 'window', 'sign'], sort=False)
+    upper = group['width'].cumsum()
+    outermost = group['rank'].transform('max') == bands['rank']
+    lo = (upper - bands['width']).reindex(joined.index).to_numpy()
+    hi = upper.where(~outermost, np.inf).reindex(joined.index).to_numpy()
+
+    # Offers take the increase above the baseline, bids the decrease below it
+    energy = band_energy(sign * (l0 - ref), sign * (l1 - ref), hours, lo, hi)
+    volume = sign * energy
+    price = np.where(pair > 0, joined['offer'].to_numpy(dtype='float64'), joined['bid'].to_numpy(dtype='float64'))
+
+    costs = pd.DataFrame({
+        'settlementDate': joined['settlementDate'].to_numpy(),
+        'settlementPeriod': joined['settlementPeriod'].to_numpy(),
+        'bmUnit': joined['bmUnit'].to_numpy(),
+        'acceptanceNumber': joined['acceptanceNumber'].to_numpy(),
+        'pairId': pair,
+        'volume_mwh': volume,
+        'price': price,
+        'cost': volume * price,
+    })
+    return costs[(pair != 0) & (energy != 0)].reset_index(drop=True)
+
+
+def summarise_costs(costs: pd.DataFrame, bm_units: pd.DataFrame | None = None,
+                    by: list[str] | None = None) -> pd.DataFrame:
+    """
+    Total volume and cost per group, adding fuelType from the BMU reference when given.
+
+    Args:
+        costs: Output of acceptance_costs
+        bm_units: BMU reference with elexonBmUnit and fuelType columns
+        by: Grouping columns (default: settlementDate, settlementPeriod, bmUnit, fuelType)
+    """
+    if bm_units is not None:
+        fuel = bm_units.drop_duplicates('elexonBmUnit').set_index('elexonBmUnit')['fuelType']
+        costs = costs.assign(fuelType=costs['bmUnit'].map(fuel).fillna('UNKNOWN'))
+    by = by or [c for c in ('settlementDate', 'settlementPeriod', 'bmUnit', 'fuelType') if c in costs.columns]
+    split = costs.assign(
+        offer_volume_mwh=costs['volume_mwh'].clip(lower=0),
+        bid_volume_mwh=costs['volume_mwh'].clip(upper=0),
+    )
+    summary = split.groupby(by, sort=True).agg(
+        acceptances=('acceptanceNumber', 'nunique'),
+        offer_volume_mwh=('offer_volume_mwh', 'sum'),
+        bid_volume_mwh=('bid_volume_mwh', 'sum'),
+        cost=('cost', 'sum'),
+    ).reset_index()
+    return summary
+
+
+def balancing_costs(acceptances: pd.DataFrame, bid_offers: pd.DataFrame, bm_units: pd.DataFrame | None = None,
+                    by: list[str] | None = None) -> pd.DataFrame:
+    """Costs per BMU, period and fuel type for any span of already-downloaded BOALF and BOD rows."""
+    return summarise_costs(acceptance_costs(join_acceptances_bid_offers(acceptances, bid_offers)), bm_units, by)
+
+
+def get_balancing_costs(start_date: str, end_date: str | None = None, by: list[str] | None = None,
+                        max_workers: int = 4) -> pd.DataFrame | None:
+    """
+    Download acceptances and bid-offer pairs for a date range and compute balancing costs.
+
+    Args:
+        start_date: First settlement date in YYYY-MM-DD format
+        end_date: Last settlement date (inclusive), defaults to start_date
+        by: Grouping columns passed to summarise_costs
+        max_workers: Days downloaded concurrently
+
+    Returns:
+        DataFrame of acceptances, volumes and £ costs per group, or None without data
+    """
+    dates = [d.strftime('%Y-%m-%d') for d in pd.date_range(start_date, end_date or start_date, freq='D')]
+
+    def day_costs(date: str) -> pd.DataFrame | None:
+        joined = get_acceptances_with_prices(date)
+        return None if joined is None else acceptance_costs(joined)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        frames = [df for df in executor.map(day_costs, dates) if df is not None]
+    if not frames:
+        return None
+    return summarise_costs(pd.concat(frames, ignore_index=True), get_bm_units_reference(), by)
+
+
+class DisbsadCube:
+    """
+    DISBSAD cost (£) and volume (MWh) as dense arrays of shape (date, settlement period, category).
+
+    The category is a details column such as service or assetId. The period axis always has 50
+    slots so that clock-change days fit; padding slots on 46 and 48 period days stay zero.
+    """
+
+    def __init__(self, dates: list[str], categories: np.ndarray, cost: np.ndarray, volume: np.ndarray,
+                 dimension: str = 'service'):
+        self.dates = list(dates)
+        self.categories = categories
+        self.cost = cost
+        self.volume = volume
+        self.dimension = dimension
+
+    @classmethod
+    def from_details(cls, details: pd.DataFrame, dimension: str = 'service',
+                     dates: list[str] | None = None) -> 'DisbsadCube':
+        """Sum DISBSAD detail rows into the cube. Pass dates to keep days without actions."""
+        dates = sorted(details['settlementDate'].astype(str).unique()) if dates is None else list(dates)
+        labels = details[dimension].fillna('UNKNOWN').astype(str).to_numpy()
+        categories, category_index = np.unique(labels, return_inverse=True)
+        date_index = pd.Index(dates).get_indexer(details['settlementDate'].astype(str))
+        period_index = details['settlementPeriod'].to_numpy(dtype='int64') - 1
+
+        keep = date_index >= 0
+        flat = (date_index[keep] * MAX_PERIODS + period_index[keep]) * len(categories) + category_index[keep]
+        shape = (len(dates), MAX_PERIODS, len(categories))
+        size = int(np.prod(shape))
+        cost = np.bincount(flat, weights=details['cost'].to_numpy(dtype='float64')[keep], minlength=size)
+        volume = np.bincount(flat, weights=details['volume'].to_numpy(dtype='float64')[keep], minlength=size)
+        return cls(dates, categories, cost.reshape(shape), volume.reshape(shape), dimension)
+
+    def slice(self, start_date: str, end_date: str | None = None) -> 'DisbsadCube':
+        """Days from start_date to end_date (inclusive) as views on the same arrays."""
+        end_date = end_date or start_date
+        positions = [i for i, date in enumerate(self.dates) if start_date <= date <= end_date]
+        window = slice(positions[0], positions[-1] + 1) if positions else slice(0, 0)
+        return DisbsadCube(self.dates[window], self.categories, self.cost[window], self.volume[window], self.dimension)
+
+    def by_period(self) -> pd.DataFrame:
+        """Cost and net volume per settlement date and period, over every period of each day."""
+        periods = [settlement_periods_in_day(date) for date in self.dates]
+        mask = np.arange(MAX_PERIODS)[None, :] < np.array(periods, dtype='int64')[:, None]
+        date_index, period_index = np.nonzero(mask)
+        return pd.DataFrame({
+            'settlementDate': np.array(self.dates, dtype=object)[date_index],
+            'settlementPeriod': period_index + 1,
+            'cost': self.cost.sum(axis=2)[mask],
+            'volume': self.volume.sum(axis=2)[mask],
+        })
+
+    def by_category(self) -> pd.DataFrame:
+        """Total cost and net volume per category, most expensive first."""
+        return pd.DataFrame({
+            self.dimension: self.categories,
+            'cost': self.cost.sum(axis=(0, 1)),
+            'volume': self.volume.sum(axis=(0, 1)),
+        }).sort_values('cost', ascending=False, ignore_index=True)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Long format, one row per non-empty (date, period, category) cell."""
+        date_index, period_index, category_index = np.nonzero((self.cost != 0) | (self.volume != 0))
+        return pd.DataFrame({
+            'settlementDate': np.array(self.dates, dtype=object)[date_index],
+            'settlementPeriod': period_index + 1,
+            self.dimension: self.categories[category_index],
+            'cost': self.cost[date_index, period_index, category_index],
+            'volume': self.volume[date_index, period_index, category_index],
+        })
+
+
+def load_disbsad_cube(start_date: str, end_date: str | None = None, dimension: str = 'service',
+                      max_workers: int = 2) -> DisbsadCube:
+    """
+    Build a DISBSAD cube for a date range from the per-day details.
+
+    Each day's settlement period requests run concurrently and complete days are cached, so building
+    the cube again or for an overlapping range only downloads new days.
+
+    Args:
+        start_date: First settlement date in YYYY-MM-DD format
+        end_date: Last settlement date (inclusive), defaults to start_date
+        dimension: Details column for the category axis, e.g. service or assetId
+        max_workers: Days downloaded concurrently
+    """
+    dates = [d.strftime('%Y-%m-%d') for d in pd.date_range(start_date, end_date or start_date, freq='D')]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        frames = [df for df in executor.map(get_balancing_nonbm_disbsad_details_day, dates) if df is not None]
+    details = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+        columns=['settlementDate', 'settlementPeriod', dimension, 'cost', 'volume'])
+    return DisbsadCube.from_details(details, dimension, dates)
+
+
+if __name__ == "__main__":
+    print(get_balancing_costs('2025-10-17', by=['fuelType']))
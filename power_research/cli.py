@@ -0,0 +1,359 @@
+import argparse
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable
+sys.path.append(str(Path(__file__).parent))
+sys.path.append(str(Path(__file__).parent / 'scrapers'))
+
+import pandas as pd
+
+from archive import ARCHIVE_DATASETS, archive_key
+from compact import compact_archive, compaction_plan, load_manifest, verify_manifest
+from coverage import plan_gaps, summarise_gaps, update_coverage
+from metrics import observe, serve_metrics, write_prometheus
+from profiling import PROFILE_MODES, profile_run, stage
+
+# Daily sources the CLI can fetch.
+#   datasets: archive datasets the per-day save function writes
+#   prefix: storage prefix under the data root that the save function is given
+#   save: module, per-day save function and extra keyword arguments
+#   repair: module and function re-requesting the missing periods of incomplete days (optional)
+#   browser: scraped with Selenium, limited by --browser-workers
+SOURCES = {
+    'nordpool': {
+        'datasets': ['nordpool/prices', 'nordpool/volumes'],
+        'prefix': 'nordpool',
+        'save': ('scrapers.nordpool', 'save_nordpool_day', {}),
+        'browser': True,
+    },
+    'epexspot': {
+        'datasets': ['epexspot/GB/product_30'],
+        'prefix': 'epexspot',
+        'save': ('scrapers.epexspot', 'save_epexspot_day', {}),
+        'browser': True,
+    },
+    **{
+        f'epexspot_auction/{auction}': {
+            'datasets': [f'epexspot_auction/GB/{auction}/product_30'],
+            'prefix': 'epexspot_auction',
+            'save': ('scrapers.epexspot', 'save_epexspot_auction_day', {'auction': auction}),
+            'browser': True,
+        }
+        for auction in ('GB-IDA1', 'GB-IDA2', 'GB-IDA3')
+    },
+    'elexon': {
+        'datasets': ['elexon/demand_outturn', 'elexon/balancing_costs', 'elexon/acceptances'],
+        'prefix': 'elexon',
+        'save': ('scrapers.elexon', 'save_elexon_day', {}),
+        'repair': ('scrapers.elexon', 'repair_elexon_day'),
+        'browser': False,
+    },
+}
+NESO_SOURCE = 'neso'
+
+
+def make_logger(log_format: str, stream=None) -> Callable[..., None]:
+    """Event logger writing one JSON object per line, or a short text line per event."""
+    stream = stream or sys.stdout
+    lock = threading.Lock()
+
+    def log(event: str, **fields) -> None:
+        if log_format == 'json':
+            record = {'ts': datetime.now(timezone.utc).isoformat(timespec='seconds'), 'event': event, **fields}
+            line = json.dumps(record, default=str)
+        else:
+            line = ' '.join([event, *(f"{k}={v}" for k, v in fields.items())])
+        with lock:
+            print(line, file=stream, flush=True)
+
+    return log
+
+
+def date_range(start_date: str, end_date: str) -> list[str]:
+    start = datetime.strptime(start_date, '%Y-%m-%d')
+    end = datetime.strptime(end_date, '%Y-%m-%d')
+    return [(start + timedelta(days=i)).strftime('%Y-%m-%d') for i in range((end - start).days + 1)]
+
+
+def source_storage(location: str, prefix: str = ''):
+    from scrapers.storage import get_storage
+    location = str(location).rstrip('/')
+    return get_storage(f"{location}/{prefix}" if prefix else location)
+
+
+def compacted_dates(data_dir: str) -> dict[str, set[str]]:
+    """Dataset -> dates already folded into monthly partitions (their daily files may be gone)."""
+    return {
+        dataset: {d for entry in months.values() for d in entry['dates']}
+        for dataset, months in load_manifest(data_dir)['datasets'].items()
+    }
+
+
+def source_datasets(sources: list[str]) -> list[str]:
+    return [dataset for source in sources for dataset in SOURCES[source]['datasets']]
+
+
+def find_gaps(sources: list[str], dates: list[str], location: str, data_dir: str, save: bool = True,
+              verify: bool = False) -> pd.DataFrame:
+    """Missing and incomplete days for the sources' datasets, from the coverage index."""
+    datasets = source_datasets(sources)
+    index = update_coverage(source_storage(location), datasets, save=save, verify=verify)
+    return summarise_gaps(plan_gaps(index, datasets, dates, compacted_dates(data_dir)))
+
+
+def fetch_plan(sources: list[str], dates: list[str], location: str, data_dir: str,
+               gaps: pd.DataFrame | None = None) -> list[tuple[str, str]]:
+    """(source, date) pairs with at least one dataset file neither archived nor compacted."""
+    if gaps is None:
+        gaps = find_gaps(sources, dates, location, data_dir)
+    missing = set(zip(gaps.loc[gaps['status'] == 'missing', 'dataset'], gaps.loc[gaps['status'] == 'missing', 'date']))
+    return [
+        (source, date)
+        for source in sources
+        for date in dates
+        if any((dataset, date) in missing for dataset in SOURCES[source]['datasets'])
+    ]
+
+
+def repair_plan(sources: list[str], gaps: pd.DataFrame, today: str) -> list[tuple[str, str, dict[str, list[int]]]]:
+    """(source, date, {key: missing periods}) for incomplete past days of sources that can repair them."""
+    incomplete = gaps[(gaps['status'] == 'incomplete') & (gaps['date'] < today)]
+    plan = []
+    for source in sources:
+        if 'repair' not in SOURCES[source]:
+            continue
+        prefix = SOURCES[source]['prefix']
+        rows = incomplete[incomplete['dataset'].isin(SOURCES[source]['datasets'])]
+        for date, day in rows.groupby('date', sort=True):
+            missing = {
+                archive_key(row.dataset, date)[len(prefix) + 1:]: list(row.missing_periods)
+                for row in day.itertuples()
+            }
+            plan.append((source, date, missing))
+    return plan
+
+
+def run_fetch(sources: list[str], dates: list[str], location: str, data_dir: str,
+              workers: int, browser_workers: int, dry_run: bool, log, repair: bool = False) -> int:
+    daily_sources = [s for s in sources if s != NESO_SOURCE]
+    gaps = find_gaps(daily_sources, dates, location, data_dir, save=not dry_run)
+    plan = fetch_plan(daily_sources, dates, location, data_dir, gaps)
+    repairs = repair_plan(daily_sources, gaps, datetime.now().strftime('%Y-%m-%d')) if repair else []
+    log('plan', tasks=len(plan), repairs=len(repairs), sources=daily_sources, start=dates[0], end=dates[-1],
+        workers=workers)
+    for source, date in plan:
+        log('planned', source=source, date=date)
+    for source, date, missing in repairs:
+        log('planned', source=source, date=date, repair={key: len(periods) for key, periods in missing.items()})
+    for row in gaps[gaps['status'] == 'incomplete'].itertuples():
+        log('incomplete', dataset=row.dataset, date=row.date, missing_periods=row.missing_periods)
+
+    failures = 0
+    if NESO_SOURCE in sources:
+        failures += run_neso(int(dates[0][:4]), location, workers, dry_run, log)
+    if dry_run or not (plan or repairs):
+        return 1 if failures else 0
+
+    browser_slots = threading.BoundedSemaphore(browser_workers)
+
+    def fetch(task: tuple[str, str]) -> bool:
+        source, date = task
+        config = SOURCES[source]
+        module, function, kwargs = config['save']
+        save_day = getattr(importlib.import_module(module), function)
+        started = time.perf_counter()
+        try:
+            with stage(source):
+                if config['browser']:
+                    with browser_slots:
+                        saved = save_day(date, source_storage(location, config['prefix']), **kwargs)
+                else:
+                    saved = save_day(date, source_storage(location, config['prefix']), **kwargs)
+        except Exception as e:
+            log('fetch', source=source, date=date, status='failed', error=str(e),
+                seconds=round(time.perf_counter() - started, 3))
+            return False
+        finally:
+            observe('power_research_stage_duration_seconds', time.perf_counter() - started, stage='fetch', source=source)
+        log('fetch', source=source, date=date, status='saved' if saved else 'incomplete',
+            seconds=round(time.perf_counter() - started, 3))
+        return True
+
+    def repair_day(task: tuple[str, str, dict[str, list[int]]]) -> bool:
+        source, date, missing = task
+        config = SOURCES[source]
+        module, function = config['repair']
+        repair_missing = getattr(importlib.import_module(module), function)
+        started = time.perf_counter()
+        try:
+            with stage(source):
+                still_missing = repair_missing(date, source_storage(location, config['prefix']), missing)
+        except Exception as e:
+            log('repair', source=source, date=date, status='failed', error=str(e),
+                seconds=round(time.perf_counter() - started, 3))
+            return False
+        finally:
+            observe('power_research_stage_duration_seconds', time.perf_counter() - started, stage='repair', source=source)
+        log('repair', source=source, date=date, status='incomplete' if still_missing else 'repaired',
+            periods=sum(len(periods) for periods in missing.values()),
+            still_missing=sum(len(periods) for periods in still_missing.values()),
+            seconds=round(time.perf_counter() - started, 3))
+        return True
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(fetch, plan)) + list(executor.map(repair_day, repairs))
+    failures += results.count(False)
+    touched = {date for _, date in plan} | {date for _, date, _ in repairs}
+    update_coverage(source_storage(location), source_datasets(daily_sources), refresh_dates=touched)
+    log('done', command='fetch', tasks=len(plan), repairs=len(repairs), failed=failures)
+    return 1 if failures else 0
+
+
+def run_neso(start_year: int, location: str, workers: int, dry_run: bool, log) -> int:
+    if location.startswith('s3://'):
+        log('fetch', source=NESO_SOURCE, status='failed', error='NESO demand is written to a local directory only')
+        return 1
+    neso_dir = str(Path(location) / 'neso' / 'demand')
+    current_year = datetime.now().year
+    years = [y for y in range(start_year, current_year + 1)
+             if y == current_year or not (Path(neso_dir) / f"demanddata_{y}.parquet").exists()]
+    log('planned', source=NESO_SOURCE, years=years)
+    if dry_run:
+        return 0
+
+    from scrapers.neso import save_neso_demand_history
+    started = time.perf_counter()
+    try:
+        saved = save_neso_demand_history(start_year, neso_dir, max_workers=workers)
+    except Exception as e:
+        log('fetch', source=NESO_SOURCE, status='failed', error=str(e))
+        return 1
+    log('fetch', source=NESO_SOURCE, status='saved', years=saved, seconds=round(time.perf_counter() - started, 3))
+    return 0
+
+
+def run_compact(data_dir: str, datasets: list[str] | None, before: str | None,
+                remove_sources: bool, dry_run: bool, log) -> int:
+    plan = compaction_plan(data_dir, datasets, before)
+    log('plan', partitions=len(plan))
+    for dataset, month in plan:
+        log('planned', dataset=dataset, month=month)
+    if dry_run:
+        return 0
+    started = time.perf_counter()
+    compacted = compact_archive(data_dir, datasets, before, remove_sources)
+    log('done', command='compact', partitions=compacted, seconds=round(time.perf_counter() - started, 3))
+    return 0
+
+
+def run_verify(data_dir: str, log) -> int:
+    problems = verify_manifest(data_dir)
+    for problem in problems:
+        log('problem', detail=problem)
+    log('done', command='verify', problems=len(problems))
+    return 1 if problems else 0
+
+
+def run_gaps(sources: list[str], dates: list[str], location: str, data_dir: str, log, verify: bool = False) -> int:
+    gaps = find_gaps(sources, dates, location, data_dir, verify=verify)
+    for row in gaps.itertuples():
+        log('gap', dataset=row.dataset, date=row.date, status=row.status, periods=len(row.missing_periods))
+    log('done', command='gaps', days=len(gaps), periods=int(gaps['missing_periods'].str.len().sum()) if len(gaps) else 0)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='power_research', description='Fetch and maintain the power market archive.')
+    parser.add_argument('--data-dir', default='power_research/data', help='Local data root (default: %(default)s)')
+    parser.add_argument('--log-format', choices=['text', 'json'], default='text',
+                        help='json writes one event per line to stdout and sends scraper output to stderr')
+    parser.add_argument('--metrics-file', default=os.environ.get('POWER_RESEARCH_METRICS_FILE'),
+                        help='Write Prometheus metrics here on exit, e.g. for the node_exporter textfile collector')
+    parser.add_argument('--metrics-port', type=int, help='Serve Prometheus metrics on this port while running')
+    parser.add_argument('--profile', choices=PROFILE_MODES,
+                        help='Write per-stage timings and a profile for the run (default: POWER_RESEARCH_PROFILE)')
+    parser.add_argument('--profile-dir', help='Directory for profile runs (default: power_research/profiles)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    def add_fetch_options(sub: argparse.ArgumentParser) -> None:
+        sub.add_argument('--sources', nargs='+', choices=[*SOURCES, NESO_SOURCE], default=[*SOURCES, NESO_SOURCE],
+                         help='Sources to fetch (default: all)')
+        sub.add_argument('--storage', help='Write to this location instead of --data-dir, e.g. s3://bucket/raw')
+        sub.add_argument('--workers', type=int, default=4, help='Days fetched concurrently (default: %(default)s)')
+        sub.add_argument('--browser-workers', type=int, default=2,
+                         help='Concurrent Selenium scrapes, within --workers (default: %(default)s)')
+        sub.add_argument('--repair', action='store_true',
+                         help='Also re-request the missing settlement periods of incomplete past days')
+        sub.add_argument('--dry-run', action='store_true', help='Only log the days that would be fetched')
+
+    fetch = subparsers.add_parser('fetch', help='Fetch recent days that are missing from the archive')
+    fetch.add_argument('--days-back', type=int, default=3, help='Days before today to cover (default: %(default)s)')
+    add_fetch_options(fetch)
+
+    backfill = subparsers.add_parser('backfill', help='Fetch a date range that is missing from the archive')
+    backfill.add_argument('--start', required=True, help='First date, YYYY-MM-DD')
+    backfill.add_argument('--end', help='Last date, YYYY-MM-DD (default: today)')
+    add_fetch_options(backfill)
+
+    compact = subparsers.add_parser('compact', help='Compact closed months into Parquet partitions')
+    compact.add_argument('--datasets', nargs='+', choices=list(ARCHIVE_DATASETS), help='Datasets to compact (default: all)')
+    compact.add_argument('--before', help='Only compact months before the one containing this date (default: today)')
+    compact.add_argument('--remove-sources', action='store_true', help='Delete per-day files once compacted')
+    compact.add_argument('--dry-run', action='store_true', help='Only log the partitions that would be built')
+
+    subparsers.add_parser('verify', help='Check compacted partitions against the manifest')
+
+    gaps = subparsers.add_parser('gaps', help='List missing and incomplete days from the coverage index')
+    gaps.add_argument('--start', required=True, help='First date, YYYY-MM-DD')
+    gaps.add_argument('--end', help='Last date, YYYY-MM-DD (default: today)')
+    gaps.add_argument('--sources', nargs='+', choices=list(SOURCES), default=list(SOURCES),
+                      help='Sources to check (default: all daily sources)')
+    gaps.add_argument('--storage', help='Check this location instead of --data-dir, e.g. s3://bucket/raw')
+    gaps.add_argument('--verify', action='store_true', help='Hash every file and re-index the ones that changed')
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    log = make_logger(args.log_format)
+    output = sys.stderr if args.log_format == 'json' else sys.stdout
+    if args.metrics_port:
+        serve_metrics(args.metrics_port)
+
+    try:
+        with redirect_stdout(output), profile_run(args.command, args.profile, args.profile_dir):
+            return run_command(args, log)
+    finally:
+        if args.metrics_file:
+            write_prometheus(args.metrics_file)
+            log('metrics', path=args.metrics_file)
+
+
+def run_command(args: argparse.Namespace, log) -> int:
+    if args.command in ('fetch', 'backfill'):
+        today = datetime.now().strftime('%Y-%m-%d')
+        if args.command == 'fetch':
+            start = (datetime.now() - timedelta(days=args.days_back)).strftime('%Y-%m-%d')
+            end = today
+        else:
+            start, end = args.start, args.end or today
+        return run_fetch(args.sources, date_range(start, end), args.storage or args.data_dir, args.data_dir,
+                         args.workers, args.browser_workers, args.dry_run, log, args.repair)
+    if args.command == 'gaps':
+        dates = date_range(args.start, args.end or datetime.now().strftime('%Y-%m-%d'))
+        return run_gaps(args.sources, dates, args.storage or args.data_dir, args.data_dir, log, verify=args.verify)
+    if args.command == 'compact':
+        return run_compact(args.data_dir, args.datasets, args.before, args.remove_sources, args.dry_run, log)
+    return run_verify(args.data_dir, log)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
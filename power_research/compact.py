@@ -0,0 +1,227 @@
+import hashlib
+import json
+import os
+import pandas as pd
+import pyarrow.parquet as pq
+from datetime import datetime
+from pathlib import Path
+
+from archive import ARCHIVE_DATASETS, dataset_spec, daily_files
+
+COMPACTED_DIR = 'compacted'
+MANIFEST_FILE = 'manifest.json'
+
+
+def manifest_path(data_dir: str) -> Path:
+    return Path(data_dir) / COMPACTED_DIR / MANIFEST_FILE
+
+
+def load_manifest(data_dir: str = "power_research/data") -> dict:
+    path = manifest_path(data_dir)
+    if path.exists():
+        with open(path) as f:
+            return json.load(f)
+    return {'version': 1, 'datasets': {}}
+
+
+def save_manifest(manifest: dict, data_dir: str = "power_research/data") -> None:
+    path = manifest_path(data_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.json.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_daily_csv(path: Path, date_str: str, date_column: str) -> pd.DataFrame:
+    df = pd.read_csv(path)
+    if date_column not in df.columns:
+        df.insert(0, date_column, date_str)
+    else:
+        df[date_column] = df[date_column].astype(str)
+    return df
+
+
+def compact_month(dataset: str, month: str, data_dir: str = "power_research/data",
+                  manifest: dict | None = None) -> dict | None:
+    """
+    Merge one month of per-day CSVs for a dataset into a single zstd Parquet file.
+
+    Rows already compacted for the month are kept for days without a per-day file, and a
+    re-scraped day replaces all of that day's compacted rows. The written file is read back
+    and its rows per day checked against the per-day files and the kept partition rows before
+    the manifest entry is returned.
+
+    Args:
+        dataset: Key in ARCHIVE_DATASETS, e.g. 'nordpool/prices'
+        month: 'YYYY-MM'
+        data_dir: Root of the data lake
+        manifest: Existing manifest, used to find a previous partition for the month
+
+    Returns:
+        Manifest entry for the partition, or None if the month has no files
+    """
+    spec = dataset_spec(dataset)
+    date_column = spec['date_column']
+    sources = {d: p for d, p in daily_files(data_dir, dataset).items() if d.startswith(month)}
+    if not sources:
+        return None
+
+    frames = [read_daily_csv(path, date_str, date_column) for date_str, path in sources.items()]
+    replaced = 0
+    entry = (manifest or {}).get('datasets', {}).get(dataset, {}).get(month)
+    output_path = Path(data_dir) / COMPACTED_DIR / dataset / f"{month}.parquet"
+    if entry is not None and output_path.exists():
+        previous = pd.read_parquet(output_path)
+        rescraped = previous[date_column].astype(str).isin(sources)
+        replaced = int(rescraped.sum())
+        frames.insert(0, previous[~rescraped])
+
+    expected = pd.concat([frame[date_column].astype(str) for frame in frames]).value_counts()
+    df = pd.concat(frames, ignore_index=True)
+    df = df.sort_values(date_column, kind='stable').reset_index(drop=True)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_suffix('.parquet.tmp')
+    df.to_parquet(tmp_path, index=False, compression='zstd')
+    written = pd.read_parquet(tmp_path, columns=[date_column])[date_column].astype(str).value_counts()
+    if not written.sort_index().equals(expected.sort_index()):
+        tmp_path.unlink()
+        raise RuntimeError(f"Row count mismatch compacting {dataset} {month}: wrote {int(written.sum())} rows, "
+                           f"expected {int(expected.sum())} from the per-day files and kept partition rows")
+    os.replace(tmp_path, output_path)
+
+    dates = sorted(set(df[date_column].astype(str)))
+    entry = {
+        'path': output_path.relative_to(data_dir).as_posix(),
+        'rows': int(len(df)),
+        'replaced_rows': replaced,
+        'dates': dates,
+        'sha256': file_sha256(output_path),
+        'compacted_at': datetime.now().isoformat(timespec='seconds'),
+    }
+
+    return entry
+
+
+def remove_compacted_sources(dataset: str, entry: dict, data_dir: str = "power_research/data") -> int:
+    """Delete the per-day files a saved partition holds, keeping any rewritten since it was built."""
+    built = (Path(data_dir) / entry['path']).stat().st_mtime
+    removed = 0
+    for date_str, path in daily_files(data_dir, dataset).items():
+        if date_str in entry['dates'] and path.stat().st_mtime <= built:
+            path.unlink()
+            removed += 1
+    return removed
+
+
+def is_partition_current(entry: dict, sources: dict[str, Path], data_dir: str) -> bool:
+    """True when no per-day file is new or has been rewritten since the partition was built."""
+    path = Path(data_dir) / entry['path']
+    if not path.exists() or not set(sources) <= set(entry['dates']):
+        return False
+    built = path.stat().st_mtime
+    return all(source.stat().st_mtime <= built for source in sources.values())
+
+
+def closed_months(dates: list[str], before: str | None = None) -> list[str]:
+    """Months with data that end before the month containing `before` (default: today)."""
+    current = (before or datetime.now().strftime('%Y-%m-%d'))[:7]
+    return sorted({d[:7] for d in dates if d[:7] < current})
+
+
+def compaction_plan(data_dir: str = "power_research/data",
+                    datasets: list[str] | None = None,
+                    before: str | None = None,
+                    manifest: dict | None = None) -> list[tuple[str, str]]:
+    """(dataset, month) pairs whose partition is missing or older than its per-day files."""
+    manifest = manifest or load_manifest(data_dir)
+    plan = []
+    for dataset in datasets or list(ARCHIVE_DATASETS):
+        files = daily_files(data_dir, dataset)
+        for month in closed_months(list(files), before):
+            previous = manifest['datasets'].get(dataset, {}).get(month)
+            month_files = {d: p for d, p in files.items() if d.startswith(month)}
+            if previous is None or not is_partition_current(previous, month_files, data_dir):
+                plan.append((dataset, month))
+    return plan
+
+
+def compact_archive(data_dir: str = "power_research/data",
+                    datasets: list[str] | None = None,
+                    before: str | None = None,
+                    remove_sources: bool = False) -> int:
+    """Compact every closed month of every dataset and update the manifest.
+
+    With remove_sources, per-day files are deleted only once the manifest listing their
+    partition has been saved, so a crash never leaves days held only by an unlisted partition.
+    """
+    manifest = load_manifest(data_dir)
+    compacted_count = 0
+
+    for dataset, month in compaction_plan(data_dir, datasets, before, manifest):
+        entry = compact_month(dataset, month, data_dir, manifest)
+        if entry is None:
+            continue
+        manifest['datasets'].setdefault(dataset, {})[month] = entry
+        save_manifest(manifest, data_dir)
+        if remove_sources:
+            remove_compacted_sources(dataset, entry, data_dir)
+        compacted_count += 1
+        print(f"  ✓ Compacted {dataset} {month}: {entry['rows']} rows "
+              f"({entry['replaced_rows']} re-scraped rows replaced)")
+
+    print(f"Completed: {compacted_count} partitions compacted")
+    return compacted_count
+
+
+def verify_manifest(data_dir: str = "power_research/data") -> list[str]:
+    """Check every manifest partition exists with the recorded row count and checksum."""
+    problems = []
+    for dataset, months in load_manifest(data_dir)['datasets'].items():
+        for month, entry in months.items():
+            path = Path(data_dir) / entry['path']
+            if not path.exists():
+                problems.append(f"{dataset} {month}: missing {entry['path']}")
+            elif pq.ParquetFile(path).metadata.num_rows != entry['rows']:
+                problems.append(f"{dataset} {month}: row count differs from manifest")
+            elif file_sha256(path) != entry['sha256']:
+                problems.append(f"{dataset} {month}: checksum differs from manifest")
+    return problems
+
+
+def compacted_partitions(dataset: str, start_date: str, end_date: str,
+                         data_dir: str = "power_research/data") -> list[Path]:
+    """Parquet partitions covering a date range, found from the manifest alone."""
+    months = load_manifest(data_dir)['datasets'].get(dataset, {})
+    return [
+        Path(data_dir) / entry['path']
+        for month, entry in sorted(months.items())
+        if start_date[:7] <= month <= end_date[:7]
+    ]
+
+
+def read_compacted(dataset: str, start_date: str, end_date: str,
+                   columns: list[str] | None = None,
+                   data_dir: str = "power_research/data") -> pd.DataFrame | None:
+    date_column = dataset_spec(dataset)['date_column']
+    paths = compacted_partitions(dataset, start_date, end_date, data_dir)
+    if not paths:
+        return None
+    if columns is not None and date_column not in columns:
+        columns = [date_column, *columns]
+    df = pd.concat([pd.read_parquet(path, columns=columns) for path in paths], ignore_index=True)
+    dates = df[date_column].astype(str)
+    return df[(dates >= start_date) & (dates <= end_date)].reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    compact_archive()
@@ -1,4 +1,6 @@
+import argparse
 from scrapers.elexon import analyze_balancing_costs_simple, get_acceptances_with_prices
+from profiling import PROFILE_MODES, profile_run, stage
 import pandas as pd
 
 def compare_approaches():
@@ -10,7 +12,8 @@ def compare_approaches():
     print("1. COMPLEX APPROACH (Direct Join):")
     print("=" * 50)
 
-    df_complex = get_acceptances_with_prices(date)
+    with stage('complex_approach'):
+        df_complex = get_acceptances_with_prices(date)
 
     if df_complex is not None and len(df_complex) > 0:
         print(f"✓ Merged data: {len(df_complex)} records")
@@ -31,7 +34,8 @@ def compare_approaches():
     print("2. SIMPLE APPROACH (Three-Step Analysis):")
     print("=" * 50)
 
-    summary_df = analyze_balancing_costs_simple(date)  # Now returns DataFrame
+    with stage('simple_approach'):
+        summary_df = analyze_balancing_costs_simple(date)  # Now returns DataFrame
 
     if summary_df is not None:
         print(f"✓ DISBSAD Summary:")
@@ -82,4 +86,9 @@ def compare_approaches():
         print("- No significant balancing activity detected by either approach")
 
 if __name__ == '__main__':
-    compare_approaches()
\ No newline at end of file
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--profile', choices=PROFILE_MODES,
+                        help='Profile the run (default: POWER_RESEARCH_PROFILE, off when unset)')
+    args = parser.parse_args()
+    with profile_run('compare_approaches', args.profile):
+        compare_approaches()
\ No newline at end of file
@@ -0,0 +1,236 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent))
+
+import numpy as np
+import pandas as pd
+
+from archive import ARCHIVE_DATASETS, dataset_spec, filename_pattern
+from panel import LONDON_TZ, local_midnight_utc, period_label_index
+from scrapers.storage import COVERAGE_INDEX, content_hash
+
+# One row per stored per-day file. period_mask has bit (p - 1) set when delivery period p has
+# at least one row, so completeness checks never need to reopen the file.
+COVERAGE_COLUMNS = [
+    'source', 'dataset', 'date', 'key', 'periods', 'expected_periods', 'period_mask', 'rows', 'md5'
+]
+
+
+@lru_cache(maxsize=4096)
+def _day_slots(minutes: int, day_start_hour: int, first_hour: int, date_str: str) -> tuple[pd.Timestamp, tuple[int, ...]]:
+    start = local_midnight_utc(date_str)[0]
+    if day_start_hour:
+        start -= pd.Timedelta(hours=24 - day_start_hour)
+    end = local_midnight_utc(pd.Timestamp(date_str) + pd.Timedelta(days=1))[0]
+    if day_start_hour:
+        end -= pd.Timedelta(hours=24 - day_start_hour)
+    starts = pd.date_range(start, end, freq=pd.Timedelta(minutes=minutes), inclusive='left')
+    slots = np.arange(1, len(starts) + 1)
+    if first_hour:
+        local = starts.tz_convert(LONDON_TZ)
+        slots = slots[(local.hour >= first_hour) & (local.strftime('%Y-%m-%d') == date_str)]
+    return start, tuple(int(s) for s in slots)
+
+
+def expected_periods(dataset: str, date_str: str) -> tuple[int, ...]:
+    """
+    Delivery period numbers a complete file holds, e.g. 1-46 on a spring clock-change day.
+
+    A dataset without a period layout counts its day as the single period 1.
+    """
+    periods = dataset_spec(dataset).get('periods')
+    if periods is None:
+        return (1,)
+    return _day_slots(periods['minutes'], periods['day_start_hour'], periods.get('first_hour', 0), date_str)[1]
+
+
+def ended_periods(dataset: str, date_str: str, now: pd.Timestamp | None = None) -> tuple[int, ...]:
+    """Expected delivery periods that have finished by now, all of them for a past day."""
+    periods = dataset_spec(dataset)['periods']
+    start, slots = _day_slots(periods['minutes'], periods['day_start_hour'], periods.get('first_hour', 0), date_str)
+    now = now or pd.Timestamp.now(tz='UTC')
+    return tuple(s for s in slots if start + pd.Timedelta(minutes=periods['minutes'] * s) <= now)
+
+
+def present_periods(dataset: str, date_str: str, df: pd.DataFrame) -> np.ndarray:
+    """Delivery period numbers with at least one row in a day's frame (period 1 for any stored file
+    of a dataset without a period layout)."""
+    periods = dataset_spec(dataset).get('periods')
+    if periods is None:
+        return np.ones(1, dtype='int64')
+    column = periods['column']
+    if df.empty or column not in df.columns:
+        return np.empty(0, dtype='int64')
+    if column != 'period':
+        values = pd.to_numeric(df[column], errors='coerce').dropna().astype('int64')
+        return np.unique(values.to_numpy())
+
+    # "HH:MM - HH:MM" labels are numbered from the start of the delivery day
+    start, _ = _day_slots(periods['minutes'], periods['day_start_hour'], periods.get('first_hour', 0), date_str)
+    index = period_label_index(df[column], date_str, periods['day_start_hour'])
+    index = index[index.notna()]
+    slots = ((index - start) // pd.Timedelta(minutes=periods['minutes'])).to_numpy(dtype='int64') + 1
+    return np.unique(slots)
+
+
+def period_mask(periods) -> int:
+    mask = 0
+    for period in periods:
+        if 1 <= period <= 63:
+            mask |= 1 << (int(period) - 1)
+    return mask
+
+
+def coverage_entry(dataset: str, date_str: str, key: str, data: bytes, now: pd.Timestamp | None = None) -> dict:
+    """Coverage row for one stored file's bytes.
+
+    Rows of an outturn dataset for periods that had not ended are not counted, so a file fetched
+    during its day stays incomplete and is repaired once the day is over.
+    """
+    try:
+        df = pd.read_csv(BytesIO(data))
+    except pd.errors.EmptyDataError:
+        df = pd.DataFrame()
+    expected = set(expected_periods(dataset, date_str))
+    if dataset_spec(dataset).get('outturn'):
+        counted = expected & set(ended_periods(dataset, date_str, now))
+    else:
+        counted = expected
+    present = [int(p) for p in present_periods(dataset, date_str, df) if p in counted]
+    return {
+        'source': dataset_spec(dataset)['source'],
+        'dataset': dataset,
+        'date': date_str,
+        'key': key,
+        'periods': len(present),
+        'expected_periods': len(expected),
+        'period_mask': period_mask(present),
+        'rows': len(df),
+        'md5': content_hash(data),
+    }
+
+
+def load_coverage(storage) -> pd.DataFrame:
+    if storage.exists(COVERAGE_INDEX):
+        # Indexes written before the hash column was named for its algorithm call it sha256
+        return pd.read_parquet(BytesIO(storage.read_bytes(COVERAGE_INDEX))).rename(columns={'sha256': 'md5'})
+    return pd.DataFrame(columns=COVERAGE_COLUMNS).astype({'periods': 'int64', 'expected_periods': 'int64',
+                                                          'period_mask': 'int64', 'rows': 'int64'})
+
+
+def save_coverage(storage, index: pd.DataFrame) -> None:
+    buffer = BytesIO()
+    index.sort_values(['dataset', 'date'], ignore_index=True).to_parquet(buffer, index=False, compression='zstd')
+    storage.write_bytes(COVERAGE_INDEX, buffer.getvalue())
+
+
+def update_coverage(storage, datasets: list[str] | None = None, refresh_dates: set[str] | None = None,
+                    max_workers: int = 8, save: bool = True, verify: bool = False) -> pd.DataFrame:
+    """
+    Bring the coverage index in line with the files in storage.
+
+    Each dataset directory is listed once, instead of an exists() call per file and day. Only
+    files missing from the index, or on refresh_dates, are read. Entries for deleted files are
+    dropped. With verify, every other listed file is read too and re-indexed when its MD5 differs
+    from the indexed one, e.g. after a file was rewritten by another tool.
+
+    Args:
+        storage: LocalStorage or S3Storage rooted at the data root
+        datasets: Datasets to index (default: all archive datasets)
+        refresh_dates: Dates to re-read, e.g. days that were just fetched or repaired
+        max_workers: Files read concurrently
+        save: Write the updated index back to storage
+        verify: Hash every listed file to catch changes the index has not seen
+
+    Returns:
+        The full coverage index
+    """
+    datasets = datasets or list(ARCHIVE_DATASETS)
+    refresh_dates = refresh_dates or set()
+    index = load_coverage(storage)
+
+    listings: dict[str, list[str]] = {}
+    listed: dict[str, tuple[str, str]] = {}
+    for dataset in datasets:
+        directory = dataset_spec(dataset)['directory']
+        if directory not in listings:
+            listings[directory] = storage.list_keys(directory + '/')
+        pattern = filename_pattern(dataset)
+        for key in listings[directory]:
+            match = pattern.match(key[len(directory) + 1:])
+            if match:
+                listed[key] = (dataset, match.group(1))
+
+    known = dict(zip(index['key'], index['md5']))
+    stale = {key for key, (_, date) in listed.items() if key not in known or date in refresh_dates}
+    to_read = list(listed) if verify else sorted(stale)
+
+    def entry(key: str) -> dict | None:
+        dataset, date = listed[key]
+        data = storage.read_bytes(key)
+        if key not in stale and content_hash(data) == known[key]:
+            return None
+        return coverage_entry(dataset, date, key, data)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        entries = [e for e in executor.map(entry, to_read) if e is not None]
+
+    reindexed = {e['key'] for e in entries}
+    other_datasets = ~index['dataset'].isin(datasets)
+    still_listed = index['key'].isin(listed) & ~index['key'].isin(reindexed)
+    kept = index[other_datasets | still_listed]
+    changed = bool(entries) or len(kept) != len(index)
+    if entries:
+        kept = pd.concat([kept, pd.DataFrame(entries, columns=COVERAGE_COLUMNS)], ignore_index=True)
+    if changed and save:
+        save_coverage(storage, kept)
+    return kept.reset_index(drop=True)
+
+
+def plan_gaps(index: pd.DataFrame, datasets: list[str], dates: list[str],
+              compacted: dict[str, set[str]] | None = None) -> pd.DataFrame:
+    """
+    Every (dataset, date, period) unit with no stored rows.
+
+    Dates folded into compacted partitions count as complete.
+
+    Returns:
+        DataFrame of dataset, date, period and status ('missing' when the day has no file,
+        'incomplete' when the file lacks some periods)
+    """
+    compacted = compacted or {}
+    grid = pd.DataFrame(
+        [(dataset, date, period)
+         for dataset in datasets
+         for date in dates if date not in compacted.get(dataset, set())
+         for period in expected_periods(dataset, date)],
+        columns=['dataset', 'date', 'period']
+    )
+    masks = index.drop_duplicates(['dataset', 'date'], keep='last')[['dataset', 'date', 'period_mask']]
+    grid = grid.merge(masks, on=['dataset', 'date'], how='left')
+
+    has_file = grid['period_mask'].notna().to_numpy()
+    mask = grid['period_mask'].fillna(0).to_numpy(dtype='int64')
+    present = (mask >> (grid['period'].to_numpy(dtype='int64') - 1)) & 1
+    gaps = grid[present == 0].drop(columns='period_mask')
+    gaps['status'] = np.where(has_file[present == 0], 'incomplete', 'missing')
+    return gaps.reset_index(drop=True)
+
+
+def summarise_gaps(gaps: pd.DataFrame) -> pd.DataFrame:
+    """One row per (dataset, date) with its status and missing period numbers."""
+    if gaps.empty:
+        return pd.DataFrame(columns=['dataset', 'date', 'status', 'missing_periods'])
+    return gaps.groupby(['dataset', 'date', 'status'], sort=True)['period'].agg(list).reset_index().rename(
+        columns={'period': 'missing_periods'})
+
+
+if __name__ == "__main__":
+    from scrapers.storage import LocalStorage
+    storage = LocalStorage('power_research/data')
+    index = update_coverage(storage)
+    dates = [d.strftime('%Y-%m-%d') for d in pd.date_range('2025-12-01', '2025-12-19')]
+    print(summarise_gaps(plan_gaps(index, list(ARCHIVE_DATASETS), dates)))
@@ -0,0 +1,170 @@
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent))
+
+import numpy as np
+import pandas as pd
+
+from scrapers.elexon import get_balancing_dynamic
+
+DYNAMIC_FILE = 'dynamic/changes.parquet'
+DYNAMIC_DATASETS = ('SEL', 'SIL', 'NDZ', 'NTO', 'NTB', 'MZT', 'MNZT')
+
+
+def to_seconds(times) -> np.ndarray:
+    """ISO strings or datetimes as int64 seconds since the Unix epoch (UTC)."""
+    stamps = pd.to_datetime(pd.Series(times), utc=True, format='ISO8601')
+    return stamps.to_numpy(dtype='datetime64[s]').astype('int64')
+
+
+class DynamicStore:
+    """
+    Change log of BMU dynamic parameters (SEL, SIL, NDZ, ...), one sorted slice per
+    (bmUnit, dataset) series holding only the times the value changed.
+
+    A parameter's value at t is the last change at or before t, found by binary search, so
+    looking up thousands of acceptances needs no API calls.
+    """
+
+    def __init__(self, series: pd.MultiIndex, offsets: np.ndarray, times: np.ndarray, values: np.ndarray):
+        self.series = series
+        self.offsets = offsets
+        self.times = times
+        self.values = values
+        self._span = int(times.max()) + 1 if len(times) else 1
+        series_index = np.repeat(np.arange(len(series), dtype='int64'), np.diff(offsets))
+        self._keys = series_index * self._span + times
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'DynamicStore':
+        """Build from dynamic rows with bmUnit, dataset, time and value, keeping only changes."""
+        frame = pd.DataFrame({
+            'bmUnit': df['bmUnit'].astype(str).to_numpy(),
+            'dataset': df['dataset'].astype(str).to_numpy(),
+            'time': to_seconds(df['time']),
+            'value': df['value'].to_numpy(dtype='float64'),
+        })
+        frame = frame.drop_duplicates(['bmUnit', 'dataset', 'time'], keep='last')
+        frame = frame.sort_values(['bmUnit', 'dataset', 'time'], ignore_index=True)
+
+        # Drop resubmissions of an unchanged value
+        same_series = (frame['bmUnit'] == frame['bmUnit'].shift()) & (frame['dataset'] == frame['dataset'].shift())
+        frame = frame[~(same_series & (frame['value'] == frame['value'].shift()))]
+
+        grouped = frame.groupby(['bmUnit', 'dataset'], sort=True).size()
+        return cls(
+            grouped.index if len(grouped) else pd.MultiIndex.from_arrays([[], []], names=['bmUnit', 'dataset']),
+            np.concatenate([[0], np.cumsum(grouped.to_numpy())]).astype('int64'),
+            frame['time'].to_numpy(dtype='int64'),
+            frame['value'].to_numpy(dtype='float64'),
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        counts = np.diff(self.offsets)
+        return pd.DataFrame({
+            'bmUnit': np.repeat(self.series.get_level_values('bmUnit').to_numpy(), counts),
+            'dataset': np.repeat(self.series.get_level_values('dataset').to_numpy(), counts),
+            'time': pd.to_datetime(self.times, unit='s', utc=True),
+            'value': self.values,
+        })
+
+    def merge(self, df: pd.DataFrame) -> 'DynamicStore':
+        """A new store with freshly downloaded rows added; later rows win at the same time."""
+        return DynamicStore.from_frame(pd.concat([self.to_frame(), df], ignore_index=True))
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+        self.to_frame().to_parquet(tmp_path, index=False, compression='zstd')
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> 'DynamicStore':
+        return cls.from_frame(pd.read_parquet(path))
+
+    def lookup(self, bm_units, times, dataset: str) -> np.ndarray:
+        """Value of one parameter for each (bmUnit, time) pair, NaN before a unit's first change."""
+        bm_units = np.asarray(bm_units, dtype=str)
+        seconds = to_seconds(times)
+        if not len(self.series):
+            return np.full(len(bm_units), np.nan)
+        codes = self.series.get_indexer(pd.MultiIndex.from_arrays([bm_units, np.full(len(bm_units), dataset)]))
+        known = codes >= 0
+        codes = np.where(known, codes, 0)
+
+        position = np.searchsorted(self._keys, codes * self._span + seconds, side='right') - 1
+        valid = known & (position >= self.offsets[codes]) & (position < self.offsets[codes + 1])
+        return np.where(valid, self.values[np.where(valid, position, 0)], np.nan)
+
+    def value_at(self, bm_unit: str, dataset: str, when) -> float:
+        """e.g. the BMU's SEL at a given time."""
+        return float(self.lookup([bm_unit], [when], dataset)[0])
+
+
+def dynamic_at(df: pd.DataFrame, store: DynamicStore, datasets: tuple[str, ...] = ('SEL', 'SIL'),
+               time_column: str = 'timeFrom') -> pd.DataFrame:
+    """Add one column per dynamic parameter, as in force at each row's time, e.g. for acceptances."""
+    return df.assign(**{
+        dataset: store.lookup(df['bmUnit'].to_numpy(), df[time_column], dataset) for dataset in datasets
+    })
+
+
+def dynamic_path(data_dir: str = "power_research/data") -> Path:
+    return Path(data_dir) / DYNAMIC_FILE
+
+
+def fetch_dynamic(bm_units: list[str], start_date: str, end_date: str,
+                  datasets: tuple[str, ...] = DYNAMIC_DATASETS, max_workers: int = 8) -> pd.DataFrame:
+    """Values in force at start_date plus every change until end_date, for many BMUs concurrently."""
+    def fetch(bm_unit: str) -> pd.DataFrame | None:
+        try:
+            return get_balancing_dynamic(bm_unit, snapshot_at=start_date, until=end_date, datasets=list(datasets))
+        except Exception as e:
+            print(f"✗ {bm_unit}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        frames = [df for df in executor.map(fetch, bm_units) if df is not None and not df.empty]
+    if not frames:
+        return pd.DataFrame(columns=['bmUnit', 'dataset', 'time', 'value'])
+    return pd.concat(frames, ignore_index=True)
+
+
+def update_dynamic(bm_units: list[str], start_date: str, end_date: str,
+                   datasets: tuple[str, ...] = DYNAMIC_DATASETS, data_dir: str = "power_research/data",
+                   max_workers: int = 8) -> DynamicStore:
+    """
+    Download dynamic data for BMUs over a range and merge it into the stored change log.
+
+    Args:
+        bm_units: Elexon BMU ids
+        start_date: Snapshot date; values already in force then are included
+        end_date: Last date of changes to include
+        datasets: Dynamic parameters to keep
+        data_dir: Data root, the change log is dynamic/changes.parquet
+        max_workers: BMUs downloaded concurrently
+
+    Returns:
+        The updated store
+    """
+    path = dynamic_path(data_dir)
+    store = load_dynamic(data_dir)
+    fresh = fetch_dynamic(bm_units, start_date, end_date, datasets, max_workers)
+    store = store.merge(fresh)
+    store.save(path)
+    print(f"✓ dynamic: {len(store.series)} series, {len(store.times)} changes")
+    return store
+
+
+def load_dynamic(data_dir: str = "power_research/data") -> DynamicStore:
+    path = dynamic_path(data_dir)
+    if path.exists():
+        return DynamicStore.load(path)
+    return DynamicStore.from_frame(pd.DataFrame(columns=['bmUnit', 'dataset', 'time', 'value']))
+
+
+if __name__ == "__main__":
+    store = update_dynamic(['T_DRAXX-1', 'T_PEMB-11'], '2025-10-01', '2025-10-17')
+    print(store.value_at('T_DRAXX-1', 'SEL', '2025-10-10T12:00Z'))
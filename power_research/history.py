@@ -0,0 +1,170 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent))
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
+
+from archive import ARCHIVE_DATASETS, dataset_spec, filename_pattern
+from compact import load_manifest
+from scrapers.storage import LocalStorage
+
+
+def history_dataset(source: str, dataset: str) -> str:
+    """Archive dataset name for a source and dataset, e.g. ('nordpool', 'prices') -> 'nordpool/prices'."""
+    name = dataset if dataset in ARCHIVE_DATASETS else f"{source}/{dataset}"
+    dataset_spec(name)
+    return name
+
+
+def history_partitions(dataset: str, start_date: str, end_date: str, data_dir: str = "power_research/data",
+                       storage=None) -> list[tuple[str, str | Path, set[str] | None]]:
+    """
+    Files holding a dataset's rows for a date range, oldest first.
+
+    Compacted monthly partitions come from the manifest and per-day files from one listing of the
+    dataset directory. A per-day file wins over a compacted partition for its date, as when the day
+    was re-scraped after compaction.
+
+    Returns:
+        (kind, location, dates to skip) per file, kind 'compacted' (a local path) or 'daily' (a key)
+    """
+    storage = storage or LocalStorage(data_dir)
+    spec = dataset_spec(dataset)
+    pattern = filename_pattern(dataset)
+    prefix = spec['directory'] + '/'
+    daily = {}
+    for key in storage.list_keys(prefix):
+        match = pattern.match(key[len(prefix):])
+        if match and start_date <= match.group(1) <= end_date:
+            daily[match.group(1)] = key
+
+    partitions = []
+    for month, entry in sorted(load_manifest(data_dir)['datasets'].get(dataset, {}).items()):
+        dates = {d for d in entry['dates'] if start_date <= d <= end_date}
+        if dates - set(daily):
+            partitions.append((month, 'compacted', Path(data_dir) / entry['path'], set(daily)))
+    partitions += [(date, 'daily', key, None) for date, key in daily.items()]
+    return [partition[1:] for partition in sorted(partitions, key=lambda partition: partition[0])]
+
+
+def _read_daily(storage, key: str, date_str: str, date_column: str, columns: list[str] | None) -> pa.Table:
+    convert_options = pv.ConvertOptions(
+        column_types={date_column: pa.string()},
+        strings_can_be_null=True,
+        include_columns=columns,
+        include_missing_columns=columns is not None,
+    )
+    source = storage.path(key) if isinstance(storage, LocalStorage) else pa.BufferReader(storage.read_bytes(key))
+    # Files are read in parallel, so each read stays on its own thread
+    table = pv.read_csv(source, read_options=pv.ReadOptions(use_threads=False), convert_options=convert_options)
+    if date_column not in table.column_names or table.column(date_column).null_count == len(table):
+        dates = pa.array([date_str] * len(table), pa.string())
+        if date_column in table.column_names:
+            table = table.set_column(table.column_names.index(date_column), date_column, dates)
+        else:
+            table = table.add_column(0, date_column, dates)
+    return table
+
+
+def _read_compacted(path: Path, date_column: str, columns: list[str] | None, start_date: str, end_date: str,
+                    skip_dates: set[str]) -> pa.Table:
+    table = pq.read_table(path, columns=columns and [c for c in columns if c in pq.read_schema(path).names])
+    dates = table.column(date_column).cast(pa.string())
+    keep = pc.and_(pc.greater_equal(dates, start_date), pc.less_equal(dates, end_date))
+    if skip_dates:
+        keep = pc.and_(keep, pc.invert(pc.is_in(dates, pa.array(sorted(skip_dates), pa.string()))))
+    return table.filter(keep).replace_schema_metadata(None)
+
+
+def _typed(table: pa.Table) -> pa.Table:
+    """Dates as 'YYYY-MM-DD' strings, as the archives name days, and one string type."""
+    for i, field in enumerate(table.schema):
+        if pa.types.is_date(field.type) or pa.types.is_large_string(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.string()))
+    return table
+
+
+def _align_timestamps(tables: list[pa.Table]) -> list[pa.Table]:
+    """Parse ISO time strings where other files already hold the column as timestamps.
+
+    Compacted partitions were written from pandas, which keeps times as text, while the Arrow
+    CSV reader types them.
+    """
+    timestamp_types = {
+        field.name: field.type for table in tables for field in table.schema if pa.types.is_timestamp(field.type)
+    }
+    aligned = []
+    for table in tables:
+        for i, field in enumerate(table.schema):
+            if field.name in timestamp_types and pa.types.is_string(field.type):
+                table = table.set_column(i, field.name, table.column(i).cast(timestamp_types[field.name]))
+        aligned.append(table)
+    return aligned
+
+
+def load_history(source: str, dataset: str, start_date: str, end_date: str | None = None,
+                 columns: list[str] | None = None, data_dir: str = "power_research/data",
+                 storage=None, max_workers: int = 8) -> pd.DataFrame | None:
+    """
+    One frame of a history archive over a date range, the reader counterpart of save_*_history.
+
+    Partitions are discovered from the compact manifest and one directory listing, read in
+    parallel threads with Arrow and given one schema: ISO times become UTC timestamps, and null
+    or integer columns widen to the types other days have. Tables are concatenated as Arrow
+    chunks, so the only full copy is the final conversion to pandas.
+
+    Args:
+        source: Archive source, e.g. 'nordpool', 'epexspot_auction' or 'elexon'
+        dataset: Dataset within the source, e.g. 'prices', 'GB/GB-IDA1/product_30' or
+            'demand_outturn', or a full ARCHIVE_DATASETS name
+        start_date: First date in YYYY-MM-DD format
+        end_date: Last date (inclusive), defaults to start_date
+        columns: Columns to read, the date column is always included
+        data_dir: Data root holding the compacted partitions (and the per-day files by default)
+        storage: Storage for the per-day files, e.g. an S3Storage (default: LocalStorage(data_dir))
+        max_workers: Files read concurrently
+
+    Returns:
+        DataFrame sorted by date, or None if no file covers the range
+    """
+    end_date = end_date or start_date
+    storage = storage or LocalStorage(data_dir)
+    name = history_dataset(source, dataset)
+    date_column = dataset_spec(name)['date_column']
+    if columns is not None and date_column not in columns:
+        columns = [date_column, *columns]
+
+    partitions = history_partitions(name, start_date, end_date, data_dir, storage)
+    if not partitions:
+        return None
+
+    def read(partition: tuple[str, str | Path, set[str] | None]) -> pa.Table:
+        kind, location, skip_dates = partition
+        if kind == 'compacted':
+            return _typed(_read_compacted(location, date_column, columns, start_date, end_date, skip_dates))
+        date_str = pattern.match(location[len(prefix):]).group(1)
+        return _typed(_read_daily(storage, location, date_str, date_column, columns))
+
+    pattern = filename_pattern(name)
+    prefix = dataset_spec(name)['directory'] + '/'
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        tables = [table for table in executor.map(read, partitions) if len(table)]
+    if not tables:
+        return None
+
+    table = pa.concat_tables(_align_timestamps(tables), promote_options='permissive')
+    if columns is not None:
+        table = table.select([c for c in columns if c in table.column_names])
+    df = table.to_pandas(split_blocks=True, self_destruct=True)
+    if not df[date_column].is_monotonic_increasing:
+        df = df.sort_values(date_column, kind='stable', ignore_index=True)
+    return df
+
+
+if __name__ == "__main__":
+    print(load_history('nordpool', 'prices', '2025-09-01', '2025-12-31'))
@@ -0,0 +1,181 @@
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent))
+
+import pandas as pd
+
+from scrapers.elexon import (
+    ended_settlement_periods, fetch_settlement_periods, get_balancing_acceptances_all_day,
+    get_balancing_bid_offer_all, settlement_periods,
+)
+
+LEADERBOARD_DIR = 'leaderboard/bmu_partials'
+
+# Per (settlementDate, bmUnit) partial aggregates. Every column merges across days with a
+# plain sum/min/max, which is why the offer mean is kept as a sum and a count.
+PARTIAL_COLUMNS = [
+    'settlementDate', 'bmUnit', 'call_count', 'first_period', 'last_period',
+    'total_level_from', 'total_level_to', 'offer_min', 'offer_max', 'offer_sum', 'offer_count'
+]
+
+
+def partial_path(settlement_date: str, data_dir: str = "power_research/data") -> Path:
+    return Path(data_dir) / LEADERBOARD_DIR / f"{settlement_date}.parquet"
+
+
+def bmu_day_partials(settlement_date: str, acceptances: pd.DataFrame, bid_offers: pd.DataFrame) -> pd.DataFrame:
+    """Call counts, level sums and offer statistics for every BMU accepted on one day."""
+    calls = acceptances.groupby('bmUnit').agg(
+        call_count=('acceptanceNumber', 'count'),
+        first_period=('settlementPeriodFrom', 'min'),
+        last_period=('settlementPeriodFrom', 'max'),
+        total_level_from=('levelFrom', 'sum'),
+        total_level_to=('levelTo', 'sum'),
+    )
+    offers = bid_offers[bid_offers['bmUnit'].isin(calls.index)].groupby('bmUnit')['offer'].agg(
+        offer_min='min', offer_max='max', offer_sum='sum', offer_count='count'
+    )
+
+    partials = calls.join(offers, how='left').reset_index()
+    partials.insert(0, 'settlementDate', settlement_date)
+    partials['offer_count'] = partials['offer_count'].fillna(0)
+    return partials.astype({
+        'call_count': 'int32', 'first_period': 'int8', 'last_period': 'int8', 'offer_count': 'int32'
+    })[PARTIAL_COLUMNS]
+
+
+def fetch_day_partials(settlement_date: str, failed_periods: set[int] | None = None) -> pd.DataFrame | None:
+    """
+    Download one day of acceptances and bid-offer pairs and reduce them to partials.
+
+    Periods whose acceptances or bid-offers got no response are added to failed_periods.
+    """
+    failed = set()
+    acceptances = get_balancing_acceptances_all_day(settlement_date, failed_periods=failed)
+    bid_offers = None
+    if acceptances is not None and not acceptances.empty:
+        periods = sorted(int(p) for p in acceptances['settlementPeriodFrom'].unique())
+        bid_offers, failed_bid_offers = fetch_settlement_periods(get_balancing_bid_offer_all, settlement_date, periods)
+        if failed_bid_offers:
+            print(f"  ✗ Bid-offers {settlement_date}: no response for periods {failed_bid_offers}")
+            failed.update(failed_bid_offers)
+    if failed_periods is not None:
+        failed_periods.update(failed)
+    if bid_offers is None:
+        return None
+
+    return bmu_day_partials(settlement_date, acceptances, bid_offers)
+
+
+def save_day_partials(partials: pd.DataFrame, settlement_date: str, data_dir: str = "power_research/data") -> Path:
+    path = partial_path(settlement_date, data_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.parquet.tmp')
+    partials.to_parquet(tmp_path, index=False, compression='zstd')
+    os.replace(tmp_path, path)
+    return path
+
+
+def update_leaderboard(start_date: str, end_date: str, data_dir: str = "power_research/data",
+                       refresh: bool = False, max_workers: int = 4) -> list[str]:
+    """
+    Compute and store BMU partials for the days in a range that do not have them yet.
+
+    Days that have not finished, or with any period that got no response, are not stored and
+    are fetched again by the next update.
+
+    Args:
+        start_date: First settlement date in YYYY-MM-DD format
+        end_date: Last settlement date in YYYY-MM-DD format (inclusive)
+        data_dir: Data root, partials are stored under leaderboard/bmu_partials
+        refresh: Recompute days that already have partials, e.g. after restated data
+        max_workers: Days downloaded concurrently
+
+    Returns:
+        Dates whose partials were written
+    """
+    dates = [d.strftime('%Y-%m-%d') for d in pd.date_range(start_date, end_date, freq='D')]
+    pending = [date for date in dates if refresh or not partial_path(date, data_dir).exists()]
+    if not pending:
+        return []
+
+    def update(date: str) -> str | None:
+        # Stored partials are not recomputed, so only finished days with every period are saved
+        if len(ended_settlement_periods(date)) < len(settlement_periods(date)):
+            print(f"✗ {date}: day not finished")
+            return None
+        failed = set()
+        try:
+            partials = fetch_day_partials(date, failed)
+        except Exception as e:
+            print(f"✗ {date}: {e}")
+            return None
+        if failed:
+            print(f"✗ {date}: no response for periods {sorted(failed)}, not saved")
+            return None
+        if partials is None:
+            print(f"✗ {date}: no acceptance data")
+            return None
+        save_day_partials(partials, date, data_dir)
+        print(f"✓ {date}: {len(partials)} BMUs")
+        return date
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return [date for date in executor.map(update, pending) if date is not None]
+
+
+def load_partials(start_date: str, end_date: str, data_dir: str = "power_research/data") -> pd.DataFrame:
+    dates = [d.strftime('%Y-%m-%d') for d in pd.date_range(start_date, end_date, freq='D')]
+    paths = [path for path in (partial_path(date, data_dir) for date in dates) if path.exists()]
+    if not paths:
+        return pd.DataFrame(columns=PARTIAL_COLUMNS)
+    return pd.concat([pd.read_parquet(path) for path in paths], ignore_index=True)
+
+
+def merge_partials(partials: pd.DataFrame) -> pd.DataFrame:
+    """Combine per-day partials into one row per BMU, ranked by call count."""
+    merged = partials.groupby('bmUnit').agg(
+        call_count=('call_count', 'sum'),
+        days_called=('settlementDate', 'nunique'),
+        first_date=('settlementDate', 'min'),
+        last_date=('settlementDate', 'max'),
+        total_level_from=('total_level_from', 'sum'),
+        total_level_to=('total_level_to', 'sum'),
+        offer_min=('offer_min', 'min'),
+        offer_max=('offer_max', 'max'),
+        offer_sum=('offer_sum', 'sum'),
+        offer_count=('offer_count', 'sum'),
+    )
+    merged['offer_mean'] = merged['offer_sum'] / merged['offer_count'].where(merged['offer_count'] > 0)
+    merged = merged.drop(columns='offer_sum').reset_index()
+    return merged.sort_values(['call_count', 'bmUnit'], ascending=[False, True], ignore_index=True)
+
+
+def get_top_called_bmus(start_date: str, end_date: str | None = None, top_n: int = 10,
+                        data_dir: str = "power_research/data", update: bool = True) -> pd.DataFrame:
+    """
+    Top called BMUs with offer price statistics over a date range.
+
+    Only days missing from the leaderboard are downloaded; the ranking itself is a merge
+    of the stored per-day partials.
+
+    Args:
+        start_date: First settlement date in YYYY-MM-DD format
+        end_date: Last settlement date (inclusive), defaults to start_date
+        top_n: Number of BMUs to return
+        data_dir: Data root holding the leaderboard partials
+        update: Fetch partials for days that do not have them yet
+
+    Returns:
+        DataFrame with one row per BMU ordered by call count
+    """
+    end_date = end_date or start_date
+    if update:
+        update_leaderboard(start_date, end_date, data_dir)
+    return merge_partials(load_partials(start_date, end_date, data_dir)).head(top_n)
+
+
+if __name__ == "__main__":
+    print(get_top_called_bmus('2025-10-01', '2025-10-17', top_n=20))
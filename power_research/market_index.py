@@ -0,0 +1,176 @@
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent))
+
+import pandas as pd
+
+from panel import settlement_period_index, settlement_periods_in_day
+from scrapers.elexon import get_market_index_data
+
+MARKET_INDEX_DIR = 'market_index'
+MID_PROVIDERS = ('APXMIDP', 'N2EXMIDP')
+CHUNK_DAYS = 7
+KEY = ['settlementDate', 'settlementPeriod']
+
+
+def month_path(month: str, data_dir: str = "power_research/data") -> Path:
+    return Path(data_dir) / MARKET_INDEX_DIR / f"{month}.parquet"
+
+
+def to_matrix(rows: pd.DataFrame) -> pd.DataFrame:
+    """
+    Pivot API rows into one row per settlement period and price/volume columns per provider.
+
+    Each (provider, period) value is held once however many overlapping requests returned it.
+    """
+    rows = rows.drop_duplicates(KEY + ['dataProvider'], keep='last')
+    matrix = rows.pivot(index=KEY, columns='dataProvider', values=['price', 'volume'])
+    matrix.columns = [f"{value}_{provider}" for value, provider in matrix.columns]
+    matrix = matrix.reset_index()
+    matrix['settlementPeriod'] = matrix['settlementPeriod'].astype('int64')
+    matrix.insert(2, 'startTime', settlement_period_index(matrix['settlementDate'], matrix['settlementPeriod']))
+    return matrix.sort_values(KEY, ignore_index=True)
+
+
+def read_matrix(start_date: str, end_date: str, data_dir: str = "power_research/data") -> pd.DataFrame:
+    """Stored matrix rows for settlement dates in a range."""
+    months = pd.period_range(start_date, end_date, freq='M').strftime('%Y-%m')
+    paths = [path for path in (month_path(month, data_dir) for month in months) if path.exists()]
+    if not paths:
+        return pd.DataFrame(columns=KEY + ['startTime'])
+    matrix = pd.concat([pd.read_parquet(path) for path in paths], ignore_index=True)
+    in_range = (matrix['settlementDate'] >= start_date) & (matrix['settlementDate'] <= end_date)
+    return matrix[in_range].reset_index(drop=True)
+
+
+def write_matrix(matrix: pd.DataFrame, data_dir: str = "power_research/data") -> None:
+    """Merge new matrix rows into the monthly files; new values win, missing providers keep the old ones."""
+    for month, rows in matrix.groupby(matrix['settlementDate'].str[:7]):
+        path = month_path(month, data_dir)
+        merged = rows.set_index(KEY)
+        if path.exists():
+            merged = merged.combine_first(pd.read_parquet(path).set_index(KEY))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+        merged.reset_index().sort_values(KEY).to_parquet(tmp_path, index=False, compression='zstd')
+        os.replace(tmp_path, path)
+
+
+def complete_dates(matrix: pd.DataFrame) -> set[str]:
+    """Dates with a price from every provider for every settlement period of the day."""
+    columns = [f"price_{provider}" for provider in MID_PROVIDERS]
+    if matrix.empty or not set(columns) <= set(matrix.columns):
+        return set()
+    counts = matrix[columns].notna().groupby(matrix['settlementDate']).sum().min(axis=1)
+    return {date for date, count in counts.items() if count == settlement_periods_in_day(date)}
+
+
+def missing_dates(start_date: str, end_date: str, data_dir: str = "power_research/data") -> list[str]:
+    """Dates without every provider's price for every period, such as a day first fetched while in progress."""
+    complete = complete_dates(read_matrix(start_date, end_date, data_dir))
+    dates = [d.strftime('%Y-%m-%d') for d in pd.date_range(start_date, end_date, freq='D')]
+    return [date for date in dates if date not in complete]
+
+
+def chunk_dates(dates: list[str], chunk_days: int = CHUNK_DAYS) -> list[tuple[str, str]]:
+    """Group sorted dates into runs of consecutive days, at most chunk_days long."""
+    chunks = []
+    for date in dates:
+        if chunks:
+            first, last = chunks[-1]
+            next_day = (datetime.strptime(last, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+            days = (datetime.strptime(date, '%Y-%m-%d') - datetime.strptime(first, '%Y-%m-%d')).days
+            if date == next_day and days < chunk_days:
+                chunks[-1] = (first, date)
+                continue
+        chunks.append((date, date))
+    return chunks
+
+
+def fetch_chunk(first_date: str, last_date: str) -> pd.DataFrame | None:
+    """Every provider's rows for the settlement dates first_date to last_date."""
+    # from/to filter on UTC start time, and BST settlement days start at 23:00 the day before
+    from_date = (datetime.strptime(first_date, '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d')
+    to_date = (datetime.strptime(last_date, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+    df = get_market_index_data(from_date, to_date)
+    if df is None or df.empty:
+        return None
+    return df[(df['settlementDate'] >= first_date) & (df['settlementDate'] <= last_date)]
+
+
+def update_market_index(start_date: str, end_date: str | None = None, data_dir: str = "power_research/data",
+                        chunk_days: int = CHUNK_DAYS, max_workers: int = 4) -> list[str]:
+    """
+    Download the market index for the days in a range that are not stored yet.
+
+    Missing days are grouped into chunks of up to chunk_days, and the chunks are fetched
+    concurrently. Each request returns every provider.
+
+    Returns:
+        Settlement dates that were written
+    """
+    end_date = end_date or start_date
+    chunks = chunk_dates(missing_dates(start_date, end_date, data_dir), chunk_days)
+    if not chunks:
+        return []
+
+    def fetch(chunk: tuple[str, str]) -> pd.DataFrame | None:
+        try:
+            return fetch_chunk(*chunk)
+        except Exception as e:
+            print(f"✗ market index {chunk[0]} to {chunk[1]}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        frames = [df for df in executor.map(fetch, chunks) if df is not None and not df.empty]
+    if not frames:
+        return []
+    matrix = to_matrix(pd.concat(frames, ignore_index=True))
+    write_matrix(matrix, data_dir)
+    dates = sorted(matrix['settlementDate'].unique())
+    print(f"✓ market index: {len(dates)} days in {len(chunks)} requests")
+    return dates
+
+
+def load_market_index(start_date: str, end_date: str | None = None, data_dir: str = "power_research/data",
+                      update: bool = True) -> pd.DataFrame:
+    """
+    Provider x period matrix of market index prices and volumes for a date range.
+
+    Args:
+        start_date: First settlement date in YYYY-MM-DD format
+        end_date: Last settlement date (inclusive), defaults to start_date
+        data_dir: Data root, the matrix is stored under market_index/<month>.parquet
+        update: Download days that are not stored yet
+
+    Returns:
+        One row per settlement period with startTime and price_<provider>/volume_<provider> columns
+    """
+    end_date = end_date or start_date
+    if update:
+        update_market_index(start_date, end_date, data_dir)
+    return read_matrix(start_date, end_date, data_dir)
+
+
+def provider_prices(start_date: str, end_date: str | None = None, provider: str = 'APXMIDP',
+                    data_dir: str = "power_research/data", update: bool = True) -> pd.DataFrame | None:
+    """One provider's prices in the row layout of get_apx_market_index, e.g. for plot_ccgt_vs_price."""
+    matrix = load_market_index(start_date, end_date, data_dir, update)
+    if f"price_{provider}" not in matrix.columns:
+        return None
+    df = matrix[KEY + ['startTime']].assign(
+        dataProvider=provider,
+        price=matrix[f"price_{provider}"],
+        volume=matrix[f"volume_{provider}"],
+    ).dropna(subset=['price'])
+    if df.empty:
+        return None
+    df['hour'] = ((df['settlementPeriod'] - 1) // 2).astype(int)
+    return df.reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    print(load_market_index('2025-10-01', '2025-10-17'))
@@ -0,0 +1,202 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+
+from archive import dataset_spec
+from scrapers.storage import LocalStorage, read_csv
+
+LONDON_TZ = 'Europe/London'
+HALF_HOUR = pd.Timedelta(minutes=30)
+HOUR = pd.Timedelta(hours=1)
+
+
+def _as_dates(dates) -> pd.DatetimeIndex:
+    """Normalise scalar or array-like dates to a naive midnight DatetimeIndex."""
+    values = pd.Series(dates).to_numpy() if not np.isscalar(dates) else [dates]
+    return pd.DatetimeIndex(pd.to_datetime(values)).normalize()
+
+
+def local_midnight_utc(dates) -> pd.DatetimeIndex:
+    """UTC instant of local (Europe/London) midnight for each date."""
+    # Midnight is never ambiguous or skipped in GB, clocks change at 01:00/02:00
+    return _as_dates(dates).tz_localize(LONDON_TZ).tz_convert('UTC')
+
+
+def settlement_periods_in_day(settlement_date: str) -> int:
+    """Number of settlement periods on a day: 46 in spring, 50 in autumn, 48 otherwise."""
+    start = local_midnight_utc(settlement_date)[0]
+    end = local_midnight_utc(pd.Timestamp(settlement_date) + timedelta(days=1))[0]
+    return int((end - start) / HALF_HOUR)
+
+
+def settlement_period_index(settlement_date, settlement_period) -> pd.DatetimeIndex:
+    """Map Elexon settlementDate + settlementPeriod (1-50) to UTC period start times.
+
+    Settlement periods count elapsed half hours from local midnight, so offsetting
+    the UTC instant of midnight handles 46 and 50 period days without special cases.
+    """
+    periods = np.asarray(settlement_period, dtype='int64')
+    offsets = pd.to_timedelta((periods - 1) * 30, unit='min')
+    return local_midnight_utc(settlement_date) + offsets
+
+
+def period_label_index(labels, delivery_date, day_start_hour: int = 0) -> pd.DatetimeIndex:
+    """Map "HH:MM - HH:MM" period labels for a delivery date to UTC period start times.
+
+    Args:
+        labels: Period strings as returned by the Nord Pool and EPEX scrapers
+        delivery_date: Scalar date or array-like aligned with labels
+        day_start_hour: Local hour the delivery day starts at. Nord Pool UK days run
+            23:00-23:00, so labels at or after this hour belong to the previous date.
+
+    Returns:
+        UTC DatetimeIndex, NaT for wall times skipped by the spring clock change
+    """
+    labels = pd.Series(labels).astype(str)
+    parts = labels.str.extract(r'^\s*(\d{1,2}):(\d{2})')
+    minutes = parts[0].astype('int64').to_numpy() * 60 + parts[1].astype('int64').to_numpy()
+
+    dates = _as_dates(delivery_date)
+    if len(dates) == 1 and len(labels) != 1:
+        dates = dates.repeat(len(labels))
+    if day_start_hour:
+        minutes = np.where(minutes >= day_start_hour * 60, minutes - 24 * 60, minutes)
+    wall = pd.Series(dates + pd.to_timedelta(minutes, unit='min'))
+
+    # The repeated hour on clock-change days appears twice; the first is BST
+    is_dst = ~wall.duplicated(keep='first').to_numpy()
+    local = pd.DatetimeIndex(wall).tz_localize(LONDON_TZ, ambiguous=is_dst, nonexistent='NaT')
+    return local.tz_convert('UTC')
+
+
+def _numeric_frame(df: pd.DataFrame, index: pd.DatetimeIndex, prefix: str,
+                   exclude: tuple[str, ...]) -> pd.DataFrame:
+    columns = [c for c in df.select_dtypes(include='number').columns if c not in exclude]
+    frame = pd.DataFrame(
+        {f"{prefix}_{c}": df[c].to_numpy(dtype='float32') for c in columns},
+        index=pd.DatetimeIndex(index, name='startTime')
+    )
+    frame = frame[frame.index.notna()]
+    return frame[~frame.index.duplicated(keep='last')].sort_index()
+
+
+def align_period_frame(df: pd.DataFrame, prefix: str, delivery_date=None,
+                       day_start_hour: int = 0) -> pd.DataFrame:
+    """Index a Nord Pool/EPEX style frame (period column) by UTC start time.
+
+    Multi-day frames carry a deliveryDate column, single days can pass delivery_date.
+    """
+    dates = df['deliveryDate'] if delivery_date is None else delivery_date
+    index = period_label_index(df['period'], dates, day_start_hour)
+    return _numeric_frame(df, index, prefix, exclude=())
+
+
+def align_nordpool(df: pd.DataFrame, delivery_date=None, prefix: str = 'nordpool') -> pd.DataFrame:
+    return align_period_frame(df, prefix, delivery_date, day_start_hour=23)
+
+
+def align_epex(df: pd.DataFrame, delivery_date=None, prefix: str = 'epex') -> pd.DataFrame:
+    return align_period_frame(df, prefix, delivery_date)
+
+
+def align_settlement(df: pd.DataFrame, prefix: str = 'elexon') -> pd.DataFrame:
+    """Index an Elexon frame with settlementDate/settlementPeriod columns by UTC start time."""
+    index = settlement_period_index(df['settlementDate'], df['settlementPeriod'])
+    return _numeric_frame(df, index, prefix, exclude=('settlementPeriod', 'hour'))
+
+
+def _expand(frame: pd.DataFrame, step: pd.Timedelta, freq: pd.Timedelta) -> pd.DataFrame:
+    """Repeat each row of a coarse series onto every freq slot it covers."""
+    repeats = int(step / freq)
+    if repeats <= 1:
+        return frame
+    offsets = np.tile(np.arange(repeats) * freq, len(frame))
+    index = frame.index.repeat(repeats) + pd.to_timedelta(offsets)
+    return pd.DataFrame(
+        {c: np.repeat(frame[c].to_numpy(), repeats) for c in frame.columns},
+        index=pd.DatetimeIndex(index, name=frame.index.name)
+    )
+
+
+def build_market_panel(nordpool: pd.DataFrame | None = None,
+                       epex: pd.DataFrame | None = None,
+                       epex_auction: pd.DataFrame | None = None,
+                       elexon: pd.DataFrame | None = None,
+                       freq: str = '30min',
+                       tz: str = 'UTC') -> pd.DataFrame | None:
+    """Join Nord Pool, EPEX and Elexon frames onto one half-hourly DatetimeIndex.
+
+    Args:
+        nordpool: Hourly prices/volumes with period and deliveryDate columns
+        epex: EPEX continuous 30-minute data with period and deliveryDate columns
+        epex_auction: EPEX intraday auction data with period and deliveryDate columns
+        elexon: Any frame with settlementDate and settlementPeriod columns
+        freq: Panel resolution; hourly sources are repeated onto each slot
+        tz: Output timezone, 'UTC' or 'Europe/London'
+
+    Returns:
+        Wide float32 DataFrame with source-prefixed columns over a gap-free index
+    """
+    step = pd.Timedelta(freq)
+    aligned = []
+    if nordpool is not None and not nordpool.empty:
+        aligned.append(_expand(align_nordpool(nordpool), HOUR, step))
+    if epex is not None and not epex.empty:
+        aligned.append(_expand(align_epex(epex), HALF_HOUR, step))
+    if epex_auction is not None and not epex_auction.empty:
+        aligned.append(_expand(align_epex(epex_auction, prefix='ida'), HALF_HOUR, step))
+    if elexon is not None and not elexon.empty:
+        aligned.append(_expand(align_settlement(elexon), HALF_HOUR, step))
+    aligned = [frame for frame in aligned if not frame.empty]
+    if not aligned:
+        return None
+
+    start = min(frame.index[0] for frame in aligned)
+    end = max(frame.index[-1] for frame in aligned)
+    index = pd.date_range(start, end, freq=step, name='startTime')
+    panel = pd.concat([frame.reindex(index) for frame in aligned], axis=1)
+    if tz != 'UTC':
+        panel.index = panel.index.tz_convert(tz)
+    return panel
+
+
+def _read_daily(storage, dataset: str, dates: list[str]) -> pd.DataFrame | None:
+    spec = dataset_spec(dataset)
+    frames = []
+    for date_str in dates:
+        key = f"{spec['directory']}/{spec['filename'].format(date=date_str)}"
+        if storage.exists(key):
+            df = read_csv(storage, key)
+            df['deliveryDate'] = date_str
+            frames.append(df)
+    if frames:
+        return pd.concat(frames, ignore_index=True)
+    return None
+
+
+def load_market_panel(start_date: str, end_date: str,
+                      data_dir: str = "power_research/data",
+                      auction: str = "GB-IDA1",
+                      tz: str = 'UTC',
+                      storage=None) -> pd.DataFrame | None:
+    """Build the market panel from the per-day CSV archives written by save_*_history."""
+    storage = storage or LocalStorage(data_dir)
+    start = datetime.strptime(start_date, '%Y-%m-%d')
+    end = datetime.strptime(end_date, '%Y-%m-%d')
+    dates = [(start + timedelta(days=i)).strftime('%Y-%m-%d') for i in range((end - start).days + 1)]
+
+    prices = _read_daily(storage, 'nordpool/prices', dates)
+    volumes = _read_daily(storage, 'nordpool/volumes', dates)
+    if prices is not None and volumes is not None:
+        nordpool = prices.merge(volumes, on=['deliveryDate', 'period'], how='outer')
+    else:
+        nordpool = prices if prices is not None else volumes
+
+    epex = _read_daily(storage, 'epexspot/GB/product_30', dates)
+    epex_auction = _read_daily(storage, f'epexspot_auction/GB/{auction}/product_30', dates)
+    elexon = _read_daily(storage, 'elexon/demand_outturn', dates)
+    if elexon is not None:
+        elexon = elexon.drop(columns=['deliveryDate'])
+
+    return build_market_panel(nordpool=nordpool, epex=epex, epex_auction=epex_auction,
+                              elexon=elexon, tz=tz)
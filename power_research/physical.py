@@ -0,0 +1,212 @@
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent))
+
+import numpy as np
+import pandas as pd
+
+from scrapers.elexon import (
+    ended_settlement_periods, fetch_settlement_periods, get_balancing_physical_all, settlement_periods,
+)
+
+PHYSICAL_DIR = 'physical'
+PHYSICAL_DATASETS = ('PN', 'MELS')
+BM_UNITS_FILE = Path(__file__).parent / 'bm_units.csv'
+
+
+def to_minutes(times) -> np.ndarray:
+    """ISO strings or datetimes as int64 minutes since the Unix epoch (UTC)."""
+    stamps = pd.to_datetime(pd.Series(times), utc=True, format='ISO8601')
+    return stamps.to_numpy(dtype='datetime64[m]').astype('int64')
+
+
+class LevelStore:
+    """
+    Per-BMU MW time series held as flat arrays, one slice per BMU.
+
+    Segments go from level_from at start to level_to at end, with times in int32 minutes since
+    the epoch and levels in float32. Most PN and MEL segments are flat, so a unit's series is a
+    step function. A day for every GB BMU takes a few MB, where the API frames take hundreds.
+    """
+
+    def __init__(self, units: np.ndarray, offsets: np.ndarray, start: np.ndarray, end: np.ndarray,
+                 level_from: np.ndarray, level_to: np.ndarray):
+        self.units = units
+        self.offsets = offsets
+        self.start = start
+        self.end = end
+        self.level_from = level_from
+        self.level_to = level_to
+        # Each unit's segments shifted onto their own stretch of the number line, so one
+        # searchsorted finds the segment in force for every unit at once
+        self._span = int(end.max()) + 1 if len(end) else 1
+        unit_index = np.repeat(np.arange(len(units), dtype='int64'), np.diff(offsets))
+        self._keys = unit_index * self._span + start
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'LevelStore':
+        """Build from physical rows with bmUnit, timeFrom, timeTo, levelFrom and levelTo."""
+        frame = pd.DataFrame({
+            'bmUnit': df['bmUnit'].astype(str).to_numpy(),
+            'start': to_minutes(df['timeFrom']),
+            'end': to_minutes(df['timeTo']),
+            'level_from': df['levelFrom'].to_numpy(dtype='float32'),
+            'level_to': df['levelTo'].to_numpy(dtype='float32'),
+        })
+        # Later submissions for the same start replace earlier ones
+        frame = frame.drop_duplicates(['bmUnit', 'start'], keep='last').sort_values(['bmUnit', 'start'])
+        units, counts = np.unique(frame['bmUnit'].to_numpy(), return_counts=True)
+        return cls(
+            units,
+            np.concatenate([[0], np.cumsum(counts)]).astype('int64'),
+            frame['start'].to_numpy(dtype='int32'),
+            frame['end'].to_numpy(dtype='int32'),
+            frame['level_from'].to_numpy(dtype='float32'),
+            frame['level_to'].to_numpy(dtype='float32'),
+        )
+
+    @classmethod
+    def concat(cls, stores: list['LevelStore']) -> 'LevelStore':
+        """Merge stores, e.g. one per day, into one."""
+        frames = [store.to_frame() for store in stores if len(store.start)]
+        if not frames:
+            return cls.from_frame(pd.DataFrame(columns=['bmUnit', 'timeFrom', 'timeTo', 'levelFrom', 'levelTo']))
+        return cls.from_frame(pd.concat(frames, ignore_index=True))
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            'bmUnit': np.repeat(self.units, np.diff(self.offsets)),
+            'timeFrom': pd.to_datetime(self.start.astype('int64'), unit='m', utc=True),
+            'timeTo': pd.to_datetime(self.end.astype('int64'), unit='m', utc=True),
+            'levelFrom': self.level_from,
+            'levelTo': self.level_to,
+        })
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(f, units=self.units.astype(str), offsets=self.offsets, start=self.start,
+                                end=self.end, level_from=self.level_from, level_to=self.level_to)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> 'LevelStore':
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['units'], data['offsets'], data['start'], data['end'], data['level_from'], data['level_to'])
+
+    def levels_at(self, when) -> pd.Series:
+        """MW of every unit at one instant, NaN for units with no segment covering it."""
+        minute = pd.Timestamp(when)
+        minute = (minute.tz_localize('UTC') if minute.tzinfo is None else minute.tz_convert('UTC')).value / 60e9
+        whole = int(np.floor(minute))
+        unit_index = np.arange(len(self.units), dtype='int64')
+        position = np.searchsorted(self._keys, unit_index * self._span + whole, side='right') - 1
+
+        valid = (position >= self.offsets[:-1]) & (position < self.offsets[1:])
+        position = np.where(valid, position, 0)
+        start, end = self.start[position].astype('int64'), self.end[position].astype('int64')
+        valid &= end > minute
+        fraction = np.clip((minute - start) / np.maximum(end - start, 1), 0, 1)
+        levels = self.level_from[position] + (self.level_to[position] - self.level_from[position]) * fraction
+        return pd.Series(np.where(valid, levels, np.nan), index=self.units, name='level')
+
+
+def load_bm_units(path: Path = BM_UNITS_FILE) -> pd.DataFrame:
+    return pd.read_csv(path, usecols=['elexonBmUnit', 'fuelType'])
+
+
+def total_by_fuel(store: LevelStore, when, bm_units: pd.DataFrame | None = None) -> pd.Series:
+    """Summed MW per fuel type at one instant, e.g. total PN by fuel type at 17:30."""
+    bm_units = load_bm_units() if bm_units is None else bm_units
+    fuel = bm_units.drop_duplicates('elexonBmUnit').set_index('elexonBmUnit')['fuelType']
+    levels = store.levels_at(when).dropna()
+    fuel_types = fuel.reindex(levels.index).fillna('UNKNOWN').to_numpy()
+    return levels.groupby(fuel_types).sum().sort_values(ascending=False)
+
+
+def physical_path(date_str: str, dataset: str = 'PN', data_dir: str = "power_research/data") -> Path:
+    return Path(data_dir) / PHYSICAL_DIR / dataset / f"{date_str}.npz"
+
+
+def fetch_physical_day(date_str: str, dataset: str = 'PN', max_workers: int = 8,
+                       failed_periods: set[int] | None = None) -> pd.DataFrame | None:
+    """
+    All BMUs' physical data for one day, fetching its settlement periods concurrently.
+
+    Periods that got no response, e.g. after a 429 or 5xx, are added to failed_periods.
+    """
+    df, failed = fetch_settlement_periods(lambda date, period: get_balancing_physical_all(dataset, date, period),
+                                          date_str, settlement_periods(date_str), max_workers)
+    if failed:
+        print(f"  ✗ {dataset} {date_str}: no response for periods {failed}")
+        if failed_periods is not None:
+            failed_periods.update(failed)
+    return df
+
+
+def update_physical(start_date: str, end_date: str, datasets: tuple[str, ...] = PHYSICAL_DATASETS,
+                    data_dir: str = "power_research/data", refresh: bool = False,
+                    max_workers: int = 8) -> list[tuple[str, str]]:
+    """
+    Download and store physical data for every BMU over a date range.
+
+    Uses the all-BMU endpoint, so a day costs one call per settlement period and dataset rather
+    than one per BMU. Days that have not finished, or with any period that got no response, are
+    not stored and are fetched again by the next update.
+
+    Args:
+        start_date: First settlement date in YYYY-MM-DD format
+        end_date: Last settlement date in YYYY-MM-DD format (inclusive)
+        datasets: Physical datasets to store, e.g. PN and MELS
+        data_dir: Data root, stores are written under physical/<dataset>/<date>.npz
+        refresh: Re-download days that are already stored
+        max_workers: Settlement periods fetched concurrently
+
+    Returns:
+        (dataset, date) pairs that were written
+    """
+    dates = [d.strftime('%Y-%m-%d') for d in pd.date_range(start_date, end_date, freq='D')]
+    written = []
+    for dataset in datasets:
+        for date in dates:
+            path = physical_path(date, dataset, data_dir)
+            if path.exists() and not refresh:
+                continue
+            # Stored days are not re-downloaded, so only finished days with every period are saved
+            if len(ended_settlement_periods(date)) < len(settlement_periods(date)):
+                print(f"✗ {dataset} {date}: day not finished")
+                continue
+            failed = set()
+            try:
+                df = fetch_physical_day(date, dataset, max_workers, failed)
+            except Exception as e:
+                print(f"✗ {dataset} {date}: {e}")
+                continue
+            if failed:
+                print(f"✗ {dataset} {date}: no response for periods {sorted(failed)}, not saved")
+                continue
+            if df is None:
+                print(f"✗ {dataset} {date}: no data")
+                continue
+            store = LevelStore.from_frame(df)
+            store.save(path)
+            print(f"✓ {dataset} {date}: {len(store.units)} BMUs, {len(store.start)} segments")
+            written.append((dataset, date))
+    return written
+
+
+def load_physical(start_date: str, end_date: str | None = None, dataset: str = 'PN',
+                  data_dir: str = "power_research/data") -> LevelStore:
+    """One store covering every stored day in a range."""
+    dates = [d.strftime('%Y-%m-%d') for d in pd.date_range(start_date, end_date or start_date, freq='D')]
+    paths = [path for path in (physical_path(date, dataset, data_dir) for date in dates) if path.exists()]
+    stores = [LevelStore.load(path) for path in paths]
+    return stores[0] if len(stores) == 1 else LevelStore.concat(stores)
+
+
+if __name__ == "__main__":
+    update_physical('2025-10-17', '2025-10-17')
+    print(total_by_fuel(load_physical('2025-10-17'), '2025-10-17T17:30Z'))
@@ -1,11 +1,18 @@
 import sys
+from datetime import datetime, timedelta
 from pathlib import Path
+from typing import TYPE_CHECKING
 sys.path.append(str(Path(__file__).parent))
 
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 from scrapers.elexon import get_generation_by_fuel
 
+# pyplot is imported inside the chart functions, so the data preparation helpers
+# can be used without loading matplotlib
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
 # NOTE: The renewables outturn values are underestimated in this report because they exclude embedded generation 
 # and wind farms which do not have Operational Meters. As of 2025, NESO estimates this representation of wind farms 
 # with Operational Meters to be approximately 82%.
@@ -24,26 +31,76 @@ category_colors = {
     'Interconnectors': '#70c1b3'
 }
 
+fuel_mapping = {'BIOMASS': 'Biomass', 'CCGT': 'CCGT', 'COAL': 'Coal', 'NUCLEAR': 'Nuclear', 'NPSHYD': 'Hydro (non-PS)', 'OCGT': 'OCGT', 'OIL': 'Oil', 'OTHER': 'Other', 'PS': 'Pumped Storage', 'WIND': 'Wind'}
+interconnector_mapping = {'INTELEC': 'Eleclink (INTELEC)', 'INTEW': 'Ireland (East-West)', 'INTFR': 'France (IFA)', 'INTGRNL': 'Ireland (Greenlink)', 'INTIFA2': 'France (IFA2)', 'INTIRL': 'Northern Ireland (Moyle)', 'INTNED': 'Netherlands (BritNed)', 'INTNEM': 'Belgium (Nemolink)', 'INTNSL': 'North Sea Link (INTNSL)', 'INTVKL': 'Denmark (Viking link)'}
+fuel_category_lookup = {**fuel_mapping, **{code: 'Interconnectors' for code in interconnector_mapping}}
+
+generation_order = [
+    'Nuclear', 'Hydro (non-PS)', 'Wind', 'Biomass', 'CCGT',
+    'OCGT', 'Coal', 'Oil', 'Other', 'Pumped Storage', 'Interconnectors'
+]
+category_index = pd.Index(generation_order)
+
+def fuel_category_codes(fuel_type: pd.Series) -> np.ndarray:
+    """Position in generation_order for each fuelType, -1 for unmapped fuels."""
+    fuel = pd.Categorical(fuel_type)
+    codes_per_fuel = category_index.get_indexer(fuel.categories.map(fuel_category_lookup))
+    return np.where(fuel.codes >= 0, codes_per_fuel[fuel.codes], -1)
+
+def generation_stack(fuel_generation: pd.DataFrame) -> pd.DataFrame:
+    """Sum FUELHH generation into a (settlementDate, settlementPeriod) x category frame in one pass."""
+    category_codes = fuel_category_codes(fuel_generation['fuelType'])
+    valid = category_codes >= 0
+    keys = pd.MultiIndex.from_arrays(
+        [fuel_generation['settlementDate'].to_numpy()[valid], fuel_generation['settlementPeriod'].to_numpy()[valid]],
+        names=['settlementDate', 'settlementPeriod']
+    )
+    row_codes, rows = keys.factorize(sort=True)
+    n_categories = len(category_index)
+    totals = np.bincount(
+        row_codes * n_categories + category_codes[valid],
+        weights=fuel_generation['generation'].to_numpy(dtype='float64')[valid],
+        minlength=len(rows) * n_categories
+    ).reshape(len(rows), n_categories)
+    present = np.bincount(category_codes[valid], minlength=n_categories) > 0
+    rows = pd.MultiIndex.from_tuples(rows, names=keys.names)
+    return pd.DataFrame(totals[:, present], index=rows, columns=category_index[present])
+
+def prepare_generation_range(start_date: str, end_date: str, chunk_days: int = 28) -> pd.DataFrame | None:
+    """Generation stack for every settlement period between two dates (inclusive).
+
+    FUELHH is fetched in chunk_days windows (each cached by get_generation_by_fuel)
+    and all days are aggregated together rather than one day at a time.
+    """
+    start = datetime.strptime(start_date, '%Y-%m-%d')
+    end = datetime.strptime(end_date, '%Y-%m-%d')
+    chunks = []
+    while start <= end:
+        chunk_end = min(start + timedelta(days=chunk_days - 1), end)
+        fuel_generation = get_generation_by_fuel(start.strftime('%Y-%m-%d'), chunk_end.strftime('%Y-%m-%d'))
+        if fuel_generation is not None and not fuel_generation.empty:
+            chunks.append(fuel_generation[['settlementDate', 'settlementPeriod', 'fuelType', 'generation']])
+        start = chunk_end + timedelta(days=1)
+    if not chunks:
+        return None
+    return generation_stack(pd.concat(chunks, ignore_index=True))
+
 def prepare_generation_data(settlement_date: str) -> pd.DataFrame | None:
-    fuel_generation = get_generation_by_fuel(settlement_date)
-    if fuel_generation is None:
+    stack = prepare_generation_range(settlement_date, settlement_date)
+    if stack is None:
         return None
-    fuel_mapping = {'BIOMASS': 'Biomass', 'CCGT': 'CCGT', 'COAL': 'Coal', 'NUCLEAR': 'Nuclear', 'NPSHYD': 'Hydro (non-PS)', 'OCGT': 'OCGT', 'OIL': 'Oil', 'OTHER': 'Other', 'PS': 'Pumped Storage', 'WIND': 'Wind'}
-    interconnector_mapping = {'INTELEC': 'Eleclink (INTELEC)', 'INTEW': 'Ireland (East-West)', 'INTFR': 'France (IFA)', 'INTGRNL': 'Ireland (Greenlink)', 'INTIFA2': 'France (IFA2)', 'INTIRL': 'Northern Ireland (Moyle)', 'INTNED': 'Netherlands (BritNed)', 'INTNEM': 'Belgium (Nemolink)', 'INTNSL': 'North Sea Link (INTNSL)', 'INTVKL': 'Denmark (Viking link)'}
-    fuel_generation['fuel_category'] = fuel_generation['fuelType'].map(fuel_mapping)
-    fuel_generation.loc[fuel_generation['fuelType'].isin(interconnector_mapping.keys()), 'fuel_category'] = 'Interconnectors'
-    return fuel_generation.groupby(['settlementPeriod', 'fuel_category'])['generation'].sum().unstack(fill_value=0)
-
-def create_generation_stack_chart(settlement_date: str) -> None:
-    pivot_df = prepare_generation_data(settlement_date)
+    return stack.droplevel('settlementDate')
+
+def create_generation_stack_chart(settlement_date: str, pivot_df: pd.DataFrame | None = None,
+                                  show: bool = True) -> 'Figure | None':
+    import matplotlib.pyplot as plt
+
+    if pivot_df is None:
+        pivot_df = prepare_generation_data(settlement_date)
     if pivot_df is None:
         print(f"No data available for {settlement_date}")
-        return
-    generation_order = [
-        'Nuclear', 'Hydro (non-PS)', 'Wind', 'Biomass', 'CCGT',
-        'OCGT', 'Coal', 'Oil', 'Other', 'Pumped Storage', 'Interconnectors'
-    ]
-    plt.figure(figsize=(15, 8))
+        return None
+    fig = plt.figure('generation_stack', figsize=(15, 8), clear=True)
     bottom_pos = pd.Series([0] * len(pivot_df.index), index=pivot_df.index)
     bottom_neg = pd.Series([0] * len(pivot_df.index), index=pivot_df.index)
     label_positions = [5, 10, 15, 20, 25, 30, 35, 40, 45, 12, 27]
@@ -89,22 +146,24 @@ def create_generation_stack_chart(settlement_date: str) -> None:
     plt.grid(True, alpha=0.3)
     plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
     plt.tight_layout()
-    plt.show()
+    if show:
+        plt.show()
+    return fig
+
+def create_percentage_stack_chart(settlement_date: str, pivot_df: pd.DataFrame | None = None,
+                                  show: bool = True) -> 'Figure | None':
+    import matplotlib.pyplot as plt
 
-def create_percentage_stack_chart(settlement_date: str) -> None:
-    pivot_df = prepare_generation_data(settlement_date)
+    if pivot_df is None:
+        pivot_df = prepare_generation_data(settlement_date)
     if pivot_df is None:
         print(f"No data available for {settlement_date}")
-        return
+        return None
     positive_df = pivot_df.clip(lower=0)
     totals = positive_df.sum(axis=1)
     percentage_df = positive_df.div(totals, axis=0) * 100
-    generation_order = [
-        'Nuclear', 'Hydro (non-PS)', 'Wind', 'Biomass', 'CCGT',
-        'OCGT', 'Coal', 'Oil', 'Other', 'Pumped Storage', 'Interconnectors'
-    ]
     available_categories = [cat for cat in generation_order if cat in percentage_df.columns]
-    plt.figure(figsize=(15, 8))
+    fig = plt.figure('percentage_stack', figsize=(15, 8), clear=True)
     plt.bar(percentage_df.index, percentage_df[available_categories[0]],
              color=category_colors.get(available_categories[0], '#888888'),
              label=available_categories[0], alpha=0.85)
@@ -120,15 +179,21 @@ def create_percentage_stack_chart(settlement_date: str) -> None:
     plt.grid(True, alpha=0.3, axis='y')
     plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
     plt.tight_layout()
-    plt.show()
+    if show:
+        plt.show()
+    return fig
 
-def plot_ccgt_vs_price(settlement_date: str, apx_data: pd.DataFrame) -> None:
-    pivot_df = prepare_generation_data(settlement_date)
+def plot_ccgt_vs_price(settlement_date: str, apx_data: pd.DataFrame, pivot_df: pd.DataFrame | None = None,
+                       show: bool = True) -> 'Figure | None':
+    import matplotlib.pyplot as plt
+
+    if pivot_df is None:
+        pivot_df = prepare_generation_data(settlement_date)
     if pivot_df is None:
         print(f"No data available for {settlement_date}")
-        return
+        return None
 
-    fig, ax1 = plt.subplots(figsize=(12, 6))
+    fig, ax1 = plt.subplots(figsize=(12, 6), num='ccgt_vs_price', clear=True)
 
     for category in ['CCGT']:
         values = pivot_df[category]
@@ -145,10 +210,15 @@ def plot_ccgt_vs_price(settlement_date: str, apx_data: pd.DataFrame) -> None:
     ax2.tick_params(axis='y')
     ax1.legend(bbox_to_anchor=(1.05, 1))
     plt.tight_layout()
-    plt.show()
+    if show:
+        plt.show()
+    return fig
+
+def plot_price_volume_comparison(settlement_date: str, nord_pool_df: pd.DataFrame, nord_pool_volumes_df: pd.DataFrame, apx_data: pd.DataFrame,
+                                 show: bool = True) -> 'Figure':
+    import matplotlib.pyplot as plt
 
-def plot_price_volume_comparison(settlement_date: str, nord_pool_df: pd.DataFrame, nord_pool_volumes_df: pd.DataFrame, apx_data: pd.DataFrame) -> None:
-    fig, (ax1, ax3) = plt.subplots(1, 2, figsize=(20, 8))
+    fig, (ax1, ax3) = plt.subplots(1, 2, figsize=(20, 8), num='price_volume_comparison', clear=True)
     color = 'tab:red'
     color_sell = 'tab:green'
     ax1.set_xlabel('Hour')
@@ -188,10 +258,15 @@ def plot_price_volume_comparison(settlement_date: str, nord_pool_df: pd.DataFram
     ax4.legend(loc='upper right')
 
     plt.tight_layout()
-    plt.show()
+    if show:
+        plt.show()
+    return fig
 
-def plot_nordpool_price_volume(settlement_date: str, nord_pool_df: pd.DataFrame, nord_pool_volumes_df: pd.DataFrame) -> None:
-    fig, ax1 = plt.subplots(figsize=(12, 6))
+def plot_nordpool_price_volume(settlement_date: str, nord_pool_df: pd.DataFrame, nord_pool_volumes_df: pd.DataFrame,
+                               show: bool = True) -> 'Figure':
+    import matplotlib.pyplot as plt
+
+    fig, ax1 = plt.subplots(figsize=(12, 6), num='nordpool_price_volume', clear=True)
     color = 'tab:red'
     color_sell = 'tab:green'
 
@@ -213,14 +288,19 @@ def plot_nordpool_price_volume(settlement_date: str, nord_pool_df: pd.DataFrame,
     ax2.legend(loc='upper right')
 
     plt.tight_layout()
-    plt.show()
+    if show:
+        plt.show()
+    return fig
+
+def plot_nordpool_comparison(settlement_dates: list[str], nord_pool_data_dict: dict[str, tuple[pd.DataFrame, pd.DataFrame]],
+                             show: bool = True) -> 'Figure':
+    import matplotlib.pyplot as plt
 
-def plot_nordpool_comparison(settlement_dates: list[str], nord_pool_data_dict: dict[str, tuple[pd.DataFrame, pd.DataFrame]]) -> None:
     num_dates = len(settlement_dates)
     cols = min(3, num_dates)
     rows = (num_dates + cols - 1) // cols
 
-    fig, axes = plt.subplots(rows, cols, figsize=(15, 5 * rows))
+    fig, axes = plt.subplots(rows, cols, figsize=(15, 5 * rows), num='nordpool_comparison', clear=True)
     if num_dates == 1:
         axes = [axes]
     elif rows == 1:
@@ -264,7 +344,9 @@ def plot_nordpool_comparison(settlement_dates: list[str], nord_pool_data_dict: d
             fig.delaxes(axes[col])
 
     plt.tight_layout()
-    plt.show()
+    if show:
+        plt.show()
+    return fig
 
 if __name__ == "__main__":
     # create_generation_stack_chart('2025-10-17')
@@ -0,0 +1,145 @@
+import duckdb
+import pandas as pd
+from pathlib import Path
+
+DATE_PATTERN = r'(\d{4}-\d{2}-\d{2})'
+
+# view name -> (glob relative to data_dir, extra columns derived from the file path)
+ARCHIVE_VIEWS = {
+    'nordpool_prices': ('nordpool/prices/*_prices.csv', {}),
+    'nordpool_volumes': ('nordpool/volumes/*_volumes.csv', {}),
+    'epex_continuous': ('epexspot/*/product_*/*.csv', {
+        'marketArea': r'epexspot/([^/]+)/product_',
+        'product': r'product_(\d+)/',
+    }),
+    'epex_auction': ('epexspot_auction/*/*/product_*/*.csv', {
+        'marketArea': r'epexspot_auction/([^/]+)/',
+        'auction': r'epexspot_auction/[^/]+/([^/]+)/product_',
+        'product': r'product_(\d+)/',
+    }),
+    'elexon_demand_outturn': ('elexon/*_demand_outturn.csv', {}),
+    'elexon_balancing_costs': ('elexon/*_balancing_costs.csv', {}),
+    'elexon_acceptances': ('elexon/*_acceptances.csv', {}),
+}
+
+
+def _sql_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def register_archive_views(con: duckdb.DuckDBPyConnection, data_dir: str = "power_research/data") -> list[str]:
+    """Create one view per history archive over its CSV files, skipping archives with no files."""
+    base_path = Path(data_dir)
+    registered = []
+    for view, (pattern, path_columns) in ARCHIVE_VIEWS.items():
+        if next(base_path.glob(pattern), None) is None:
+            continue
+        source = _sql_literal((base_path / pattern).as_posix())
+        derived = [f"CAST(regexp_extract(filename, '{DATE_PATTERN}[^/]*$', 1) AS DATE) AS deliveryDate"]
+        derived += [f"regexp_extract(filename, {_sql_literal(regex)}, 1) AS {name}"
+                    for name, regex in path_columns.items()]
+        con.execute(
+            f"CREATE OR REPLACE VIEW {view} AS "
+            f"SELECT * EXCLUDE (filename), {', '.join(derived)} "
+            f"FROM read_csv({source}, filename = true, union_by_name = true)"
+        )
+        registered.append(view)
+    return registered
+
+
+def connect(data_dir: str = "power_research/data",
+            database: str = ':memory:',
+            memory_limit: str | None = None,
+            threads: int | None = None,
+            temp_directory: str | None = None) -> duckdb.DuckDBPyConnection:
+    """Open a DuckDB connection with the history archives registered as views.
+
+    Args:
+        data_dir: Root of the power_research data lake
+        database: DuckDB database file, in-memory by default
+        memory_limit: e.g. '2GB'; queries larger than this spill to temp_directory
+        threads: Parallel scan threads, DuckDB uses all cores by default
+        temp_directory: Spill location for out-of-core joins and aggregations
+
+    Returns:
+        Connection with nordpool_*, epex_* and elexon_* views
+    """
+    con = duckdb.connect(database)
+    if memory_limit is not None:
+        con.execute(f"SET memory_limit = {_sql_literal(memory_limit)}")
+    if threads is not None:
+        con.execute(f"SET threads = {int(threads)}")
+    if temp_directory is not None:
+        con.execute(f"SET temp_directory = {_sql_literal(temp_directory)}")
+    register_archive_views(con, data_dir)
+    return con
+
+
+def query(con: duckdb.DuckDBPyConnection, sql: str, params: list | None = None) -> pd.DataFrame:
+    return con.execute(sql, params or []).df()
+
+
+def max_offer_by_fuel_type(con: duckdb.DuckDBPyConnection, start_date: str, end_date: str) -> pd.DataFrame:
+    """Highest accepted offer price per fuel type between two settlement dates (inclusive)."""
+    return query(con, """
+        SELECT fuelType,
+               max(offer) AS max_offer,
+               avg(offer) AS mean_offer,
+               count(*) AS acceptance_count
+        FROM elexon_acceptances
+        WHERE CAST(settlementDate AS DATE) BETWEEN CAST(? AS DATE) AND CAST(? AS DATE)
+          AND offer IS NOT NULL
+        GROUP BY fuelType
+        ORDER BY max_offer DESC
+    """, [start_date, end_date])
+
+
+def nordpool_epex_spread_by_hour(con: duckdb.DuckDBPyConnection, start_date: str, end_date: str,
+                                 market_area: str = 'GB', product: str = '30') -> pd.DataFrame:
+    """Nord Pool day-ahead price against the hourly mean EPEX continuous price, per local hour.
+
+    Nord Pool UK delivery days run 23:00-23:00, so its 23:00 row is shifted to the previous
+    date before joining on local wall-clock hour.
+    """
+    return query(con, """
+        WITH nordpool AS (
+            SELECT deliveryDate
+                       + CAST(substr(period, 1, 2) AS INTEGER) * INTERVAL 1 HOUR
+                       - CASE WHEN substr(period, 1, 2) = '23' THEN INTERVAL 1 DAY ELSE INTERVAL 0 DAY END
+                       AS hourStart,
+                   price AS nordpool_price
+            FROM nordpool_prices
+        ),
+        epex AS (
+            SELECT deliveryDate + CAST(substr(period, 1, 2) AS INTEGER) * INTERVAL 1 HOUR AS hourStart,
+                   avg(weight_avg_price) AS epex_price,
+                   sum(volume) AS epex_volume
+            FROM epex_continuous
+            WHERE marketArea = ? AND product = ?
+            GROUP BY 1
+        )
+        SELECT nordpool.hourStart,
+               nordpool.nordpool_price,
+               epex.epex_price,
+               epex.epex_volume,
+               epex.epex_price - nordpool.nordpool_price AS spread
+        FROM nordpool
+        JOIN epex USING (hourStart)
+        WHERE CAST(nordpool.hourStart AS DATE) BETWEEN CAST(? AS DATE) AND CAST(? AS DATE)
+        ORDER BY nordpool.hourStart
+    """, [market_area, product, start_date, end_date])
+
+
+def daily_balancing_summary(con: duckdb.DuckDBPyConnection, start_date: str, end_date: str) -> pd.DataFrame:
+    """Per-day DISBSAD buy price and volume totals with acceptance counts."""
+    return query(con, """
+        SELECT CAST(settlementDate AS DATE) AS settlementDate,
+               max(buyPriceMaximum) AS max_buy_price,
+               sum(buyVolumeTotal) AS buy_volume,
+               sum(sellVolumeTotal) AS sell_volume,
+               sum(acceptance_count) AS acceptance_count
+        FROM elexon_balancing_costs
+        WHERE CAST(settlementDate AS DATE) BETWEEN CAST(? AS DATE) AND CAST(? AS DATE)
+        GROUP BY 1
+        ORDER BY 1
+    """, [start_date, end_date])
@@ -0,0 +1,228 @@
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+sys.path.append(str(Path(__file__).parent))
+
+import matplotlib
+matplotlib.use('Agg')
+import pandas as pd
+
+from archive import daily_path
+from plot_generation_stack import (
+    create_generation_stack_chart, create_percentage_stack_chart, plot_ccgt_vs_price,
+    plot_nordpool_price_volume, plot_nordpool_comparison, prepare_generation_data
+)
+from market_index import provider_prices, update_market_index
+
+CHART_DIR = Path(__file__).parent.parent / 'assets' / 'images' / 'power'
+RENDER_MANIFEST = '.render_manifest.json'
+
+# Chart name -> (renderer, inputs it needs). Renderers take the date, the inputs and show=False.
+CHARTS = {
+    'generation_stack': (
+        lambda date, inputs: create_generation_stack_chart(date, inputs['generation'], show=False),
+        ['generation']
+    ),
+    'percentage_stack': (
+        lambda date, inputs: create_percentage_stack_chart(date, inputs['generation'], show=False),
+        ['generation']
+    ),
+    'ccgt_vs_price': (
+        lambda date, inputs: plot_ccgt_vs_price(date, inputs['apx'], inputs['generation'], show=False),
+        ['generation', 'apx']
+    ),
+    'nordpool_price_volume': (
+        lambda date, inputs: plot_nordpool_price_volume(date, inputs['nordpool_prices'], inputs['nordpool_volumes'], show=False),
+        ['nordpool_prices', 'nordpool_volumes']
+    ),
+}
+
+
+def frame_hash(*frames: pd.DataFrame) -> str:
+    """Content hash of the frames a chart is drawn from, including column names."""
+    digest = hashlib.sha256()
+    for df in frames:
+        digest.update(json.dumps([str(c) for c in df.columns]).encode())
+        digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def load_render_manifest(output_dir: str | Path) -> dict[str, str]:
+    path = Path(output_dir) / RENDER_MANIFEST
+    if path.exists():
+        return json.loads(path.read_text())
+    return {}
+
+
+def save_render_manifest(output_dir: str | Path, manifest: dict[str, str]) -> None:
+    path = Path(output_dir) / RENDER_MANIFEST
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    os.replace(tmp_path, path)
+
+
+def chart_paths(output_dir: str | Path, chart: str, name: str, formats: tuple[str, ...]) -> list[Path]:
+    return [Path(output_dir) / chart / f"{name}.{fmt}" for fmt in formats]
+
+
+def load_chart_inputs(settlement_date: str, data_dir: str = "power_research/data",
+                      update: bool = True) -> dict[str, pd.DataFrame]:
+    """Data behind the per-day charts. Nord Pool comes from the archive, so no browser is started.
+
+    The market index is read from the stored matrix; update downloads the day if it is missing.
+    """
+    inputs = {}
+
+    generation = prepare_generation_data(settlement_date)
+    if generation is not None:
+        inputs['generation'] = generation
+
+    apx = provider_prices(settlement_date, provider='APXMIDP', data_dir=data_dir, update=update)
+    if apx is not None:
+        inputs['apx'] = apx
+
+    for name in ('nordpool/prices', 'nordpool/volumes'):
+        path = daily_path(data_dir, name, settlement_date)
+        if path.exists():
+            inputs[name.replace('/', '_')] = pd.read_csv(path)
+
+    return inputs
+
+
+def render_date(settlement_date: str, output_dir: str | Path = CHART_DIR,
+                formats: tuple[str, ...] = ('png', 'svg'),
+                data_dir: str = "power_research/data",
+                previous_hashes: Optional[dict[str, str]] = None,
+                inputs: Optional[dict[str, pd.DataFrame]] = None,
+                update: bool = True) -> dict[str, str]:
+    """
+    Render every chart for one date, skipping charts whose input data hash is unchanged.
+
+    Args:
+        settlement_date: Date in YYYY-MM-DD format
+        output_dir: Root directory, charts are written to {output_dir}/{chart}/{date}.{fmt}
+        formats: Image formats to save
+        data_dir: Archive root used for the Nord Pool inputs
+        previous_hashes: Manifest entries from the last run ("chart/date" -> hash)
+        inputs: Preloaded chart inputs, loaded with load_chart_inputs when omitted
+        update: Download market index days missing from the store
+
+    Returns:
+        Manifest entries for the charts that exist after this run
+    """
+    previous_hashes = previous_hashes or {}
+    if inputs is None:
+        inputs = load_chart_inputs(settlement_date, data_dir, update)
+
+    hashes = {}
+    for chart, (render, needs) in CHARTS.items():
+        if not all(name in inputs for name in needs):
+            continue
+        key = f"{chart}/{settlement_date}"
+        digest = frame_hash(*(inputs[name] for name in needs))
+        paths = chart_paths(output_dir, chart, settlement_date, formats)
+        if previous_hashes.get(key) == digest and all(p.exists() for p in paths):
+            hashes[key] = digest
+            continue
+
+        fig = render(settlement_date, inputs)
+        if fig is None:
+            continue
+        for path in paths:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fig.savefig(path, bbox_inches='tight')
+        hashes[key] = digest
+        print(f"✓ {key}")
+
+    return hashes
+
+
+def render_comparison(settlement_dates: list[str], output_dir: str | Path = CHART_DIR,
+                      formats: tuple[str, ...] = ('png', 'svg'),
+                      data_dir: str = "power_research/data",
+                      previous_hashes: Optional[dict[str, str]] = None) -> dict[str, str]:
+    """Render the multi-day Nord Pool comparison for the dates that have archived prices and volumes."""
+    previous_hashes = previous_hashes or {}
+    nord_pool_data = {}
+    for date in settlement_dates:
+        paths = [daily_path(data_dir, name, date) for name in ('nordpool/prices', 'nordpool/volumes')]
+        if all(path.exists() for path in paths):
+            nord_pool_data[date] = tuple(pd.read_csv(path) for path in paths)
+    if not nord_pool_data:
+        return {}
+
+    dates = list(nord_pool_data)
+    name = f"{dates[0]}_{dates[-1]}"
+    key = f"nordpool_comparison/{name}"
+    digest = frame_hash(*(df for pair in nord_pool_data.values() for df in pair))
+    paths = chart_paths(output_dir, 'nordpool_comparison', name, formats)
+    if previous_hashes.get(key) == digest and all(p.exists() for p in paths):
+        return {key: digest}
+
+    fig = plot_nordpool_comparison(dates, nord_pool_data, show=False)
+    for path in paths:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fig.savefig(path, bbox_inches='tight')
+    print(f"✓ {key}")
+    return {key: digest}
+
+
+def render_charts(start_date: str, end_date: str, output_dir: str | Path = CHART_DIR,
+                  formats: tuple[str, ...] = ('png', 'svg'),
+                  data_dir: str = "power_research/data",
+                  max_workers: int = 4, force: bool = False) -> dict[str, str]:
+    """
+    Render the chart set for every date in a range on a pool of headless worker processes.
+
+    Each worker renders one date at a time and reuses its named figures between dates.
+    Charts whose inputs hash the same as in the render manifest are not redrawn.
+
+    Args:
+        start_date: First date in YYYY-MM-DD format
+        end_date: Last date in YYYY-MM-DD format (inclusive)
+        output_dir: Root directory for the images, defaults to the blog assets
+        formats: Image formats to save
+        data_dir: Archive root used for the Nord Pool inputs
+        max_workers: Worker processes, 1 renders in this process
+        force: Redraw every chart regardless of the manifest
+
+    Returns:
+        Updated render manifest
+    """
+    dates = [d.strftime('%Y-%m-%d') for d in pd.date_range(start_date, end_date, freq='D')]
+    manifest = load_render_manifest(output_dir)
+    previous = {} if force else manifest
+
+    # One chunked download for the whole range, so workers only read the stored matrix
+    update_market_index(start_date, end_date, data_dir)
+
+    if max_workers == 1:
+        results = [render_date(date, output_dir, formats, data_dir, previous, update=False) for date in dates]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(render_date, date, output_dir, formats, data_dir, previous, None, False)
+                       for date in dates]
+            results = []
+            for date, future in zip(dates, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    print(f"✗ {date}: {e}")
+
+    for hashes in results:
+        manifest.update(hashes)
+    manifest.update(render_comparison(dates, output_dir, formats, data_dir, previous))
+    save_render_manifest(output_dir, manifest)
+    return manifest
+
+
+if __name__ == "__main__":
+    yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+    week_ago = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
+    render_charts(week_ago, yesterday)
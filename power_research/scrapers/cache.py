@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import pickle
+import re
+import pandas as pd
+import pyarrow as pa
+import requests
+from pathlib import Path
+from requests.structures import CaseInsensitiveDict
+from typing import Optional
+from urllib.parse import urlencode
+from metrics import inc
+
+ATTRS_METADATA_KEY = b'power_research.attrs'
+
+# Repository-level cache the scrape workflow commits, wherever the scrapers are run from
+CACHE_DIR = Path(__file__).resolve().parents[2] / 'cache'
+
+
+def cache_path(cache_dir: str | Path, name: str) -> Path:
+    """Arrow IPC cache file for a cache entry name, creating the cache directory."""
+    os.makedirs(cache_dir, exist_ok=True)
+    return Path(cache_dir) / f"{name}.arrow"
+
+
+def save_cache(df: pd.DataFrame, path: Path) -> None:
+    """Write a frame as an uncompressed Arrow IPC file so it can be memory-mapped on load.
+
+    df.attrs (e.g. auction baseload/peakload prices) are kept in the schema metadata.
+    Frames Arrow cannot represent, such as mixed-type object columns, fall back to pickle.
+    """
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        with open(path.with_suffix('.pkl'), 'wb') as f:
+            pickle.dump(df, f)
+        return
+    if df.attrs:
+        metadata = {**(table.schema.metadata or {}), ATTRS_METADATA_KEY: json.dumps(df.attrs).encode()}
+        table = table.replace_schema_metadata(metadata)
+
+    tmp_path = path.with_name(path.name + '.tmp')
+    with pa.OSFile(str(tmp_path), 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def cache_label(path: Path) -> str:
+    """Cache entry name without its dates, e.g. nordpool_prices or generation_fuel."""
+    return re.split(r'_\d{4}-\d{2}-\d{2}', path.stem, maxsplit=1)[0]
+
+
+def load_cache(path: Path) -> Optional[pd.DataFrame]:
+    """Load a cached frame, or None on a cache miss.
+
+    Arrow files are memory-mapped, so numeric columns are views onto the page cache
+    rather than copies and repeated loads across processes share the same pages.
+    Legacy pickle entries are read once and rewritten as Arrow.
+    """
+    if path.exists():
+        table = pa.ipc.open_file(pa.memory_map(str(path), 'r')).read_all()
+        df = table.to_pandas(split_blocks=True)
+        attrs = (table.schema.metadata or {}).get(ATTRS_METADATA_KEY)
+        if attrs:
+            df.attrs.update(json.loads(attrs))
+        inc('power_research_cache_requests_total', cache=cache_label(path), result='hit')
+        return df
+
+    legacy_path = path.with_suffix('.pkl')
+    if legacy_path.exists():
+        with open(legacy_path, 'rb') as f:
+            df = pickle.load(f)
+        save_cache(df, path)
+        if path.exists():
+            legacy_path.unlink()
+        inc('power_research_cache_requests_total', cache=cache_label(path), result='hit')
+        return df
+
+    inc('power_research_cache_requests_total', cache=cache_label(path), result='miss')
+    return None
+
+
+class ValidatorStore:
+    """ETag/Last-Modified validators and bodies of earlier responses, one file per URL and params.
+
+    http_get sends the stored validators as If-None-Match/If-Modified-Since and, when the server
+    answers 304 Not Modified, returns the stored body as a 200 response, so an unchanged resource
+    costs a round trip with no payload.
+    """
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+
+    def path(self, url: str, params: dict | None = None) -> Path:
+        query = urlencode(sorted((params or {}).items()), doseq=True)
+        return self.directory / f"{hashlib.sha256(f'{url}?{query}'.encode()).hexdigest()}.http"
+
+    def load(self, url: str, params: dict | None = None) -> Optional[tuple[dict, bytes]]:
+        """Stored (validators and headers, body) for a request, or None."""
+        path = self.path(url, params)
+        if not path.exists():
+            return None
+        meta, _, body = path.read_bytes().partition(b'\n')
+        return json.loads(meta), body
+
+    def conditional_headers(self, meta: dict) -> dict[str, str]:
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def save(self, url: str, params: dict | None, response: requests.Response) -> bool:
+        """Keep a 200 response that carries a validator. True if it was stored."""
+        etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+        if response.status_code != 200 or not (etag or last_modified):
+            return False
+        meta = {
+            'etag': etag,
+            'last_modified': last_modified,
+            'content_type': response.headers.get('Content-Type'),
+            'encoding': response.encoding,
+        }
+        path = self.path(url, params)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(json.dumps(meta).encode() + b'\n' + response.content)
+        os.replace(tmp_path, path)
+        return True
+
+    def response(self, meta: dict, body: bytes, not_modified: requests.Response) -> requests.Response:
+        """The stored body as a 200 response, in place of a 304."""
+        response = requests.Response()
+        response.status_code = 200
+        response._content = body
+        response.headers = CaseInsensitiveDict(not_modified.headers)
+        for header in ('Content-Length', 'Content-Encoding'):
+            response.headers.pop(header, None)
+        if meta.get('content_type'):
+            response.headers['Content-Type'] = meta['content_type']
+        response.encoding = meta.get('encoding')
+        response.url = not_modified.url
+        response.request = not_modified.request
+        response.reason = 'OK'
+        return response
@@ -1,49 +1,63 @@
 import pandas as pd
-import requests
 import urllib3
-import os
-import pickle
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from io import StringIO
-from pathlib import Path
 from typing import Optional
+from storage import LocalStorage, read_csv, write_csv
+from arrow_csv import BMRS_CSV_TYPES, read_csv_bytes
+from cache import CACHE_DIR, ValidatorStore, cache_path, load_cache, save_cache
+from intervals import interval_join
+from metrics import http_get, inc
+from profiling import carry_stages, stage
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# Validators for large responses that are often unchanged between runs (reference data, whole
+# datasets and published days), so refetching them costs a 304 instead of the full body. The
+# store holds those bodies, so it is git-ignored and carried between workflow runs by actions/cache
+VALIDATORS = ValidatorStore(CACHE_DIR / 'validators')
 
-def get_actual_demand() -> Optional[pd.DataFrame]:
-    response = requests.get(
-        'https://data.elexon.co.uk/bmrs/api/v1/datasets/INDO',
-        params={'format': 'csv'},
+
+def get_actual_demand(publish_from: Optional[str] = None, publish_to: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """INDO demand, the latest publications or those published in a range (ISO datetimes), parsed from CSV."""
+    params = {'format': 'csv'}
+    if publish_from:
+        params.update({'publishDateTimeFrom': publish_from, 'publishDateTimeTo': publish_to or publish_from})
+    response = http_get(
+        'elexon', 'https://data.elexon.co.uk/bmrs/api/v1/datasets/INDO',
+        params=params,
         headers={'accept': 'text/plain'},
+        validators=VALIDATORS,
         verify=False
     )
-    if response.status_code == 200 and response.text.strip():
-        return pd.read_csv(StringIO(response.text))
+    if response.status_code == 200 and response.content.strip():
+        return read_csv_bytes(response.content, BMRS_CSV_TYPES['INDO'])
     return None
 
 
 def get_generation_mix() -> Optional[pd.DataFrame]:
-    response = requests.get(
-        'https://data.elexon.co.uk/bmrs/api/v1/datasets/FUELHH',
+    response = http_get(
+        'elexon', 'https://data.elexon.co.uk/bmrs/api/v1/datasets/FUELHH',
         params={'format': 'csv'},
         headers={'accept': 'text/plain'},
+        validators=VALIDATORS,
         verify=False
     )
-    if response.status_code == 200 and response.text.strip():
-        return pd.read_csv(StringIO(response.text))
+    if response.status_code == 200 and response.content.strip():
+        return read_csv_bytes(response.content, BMRS_CSV_TYPES['FUELHH'])
     return None
 
 
 def get_demand_outturn_stream(settlement_date_from: str, settlement_date_to: Optional[str] = None) -> Optional[pd.DataFrame]:
     if settlement_date_to is None:
         settlement_date_to = settlement_date_from
-    response = requests.get(
-        'https://data.elexon.co.uk/bmrs/api/v1/demand/outturn/stream',
+    response = http_get(
+        'elexon', 'https://data.elexon.co.uk/bmrs/api/v1/demand/outturn/stream',
         params={
             'settlementDateFrom': settlement_date_from,
             'settlementDateTo': settlement_date_to
         },
+        validators=VALIDATORS,
         verify=False
     )
     if response.status_code == 200 and response.text.strip():
@@ -68,8 +82,8 @@ def aggregate_demand_to_hourly(df: pd.DataFrame) -> pd.DataFrame:
 
 
 def get_actual_total_load(settlement_date: str) -> Optional[pd.DataFrame]:
-    response = requests.get(
-        'https://data.elexon.co.uk/bmrs/api/v1/demand/actual/total',
+    response = http_get(
+        'elexon', 'https://data.elexon.co.uk/bmrs/api/v1/demand/actual/total',
         params={
             'from': settlement_date,
             'to': settlement_date,
@@ -88,8 +102,8 @@ def get_actual_total_load(settlement_date: str) -> Optional[pd.DataFrame]:
 
 
 def get_bid_offer_data(settlement_date: str, settlement_period: int) -> Optional[pd.DataFrame]:
-    response = requests.get(
-        'https://data.elexon.co.uk/bmrs/api/v1/balancing/bid-offer/all',
+    response = http_get(
+        'elexon', 'https://data.elexon.co.uk/bmrs/api/v1/balancing/bid-offer/all',
         params={
             'settlementDate': settlement_date,
             'settlementPeriod': settlement_period
@@ -104,65 +118,54 @@ def get_bid_offer_data(settlement_date: str, settlement_period: int) -> Optional
 
 
 def get_apx_market_index(settlement_date_from: str, settlement_date_to: Optional[str] = None) -> Optional[pd.DataFrame]:
-    if settlement_date_to is None:
-        settlement_date_to = settlement_date_from
-    from_timestamp = f"{settlement_date_from}T00:00Z"
-    to_timestamp = f"{settlement_date_to}T00:00Z"
-    response = requests.get(
-        'https://data.elexon.co.uk/bmrs/api/v1/balancing/pricing/market-index',
-        params={
-            'from': from_timestamp,
-            'to': to_timestamp,
-            'dataProviders': 'APXMIDP'
-        },
-        verify=False
-    )
-    if response.status_code == 200 and response.text.strip():
-        data = response.json()
-        df = pd.DataFrame(data['data'])
-        if 'settlementPeriod' in df.columns:
-            df['hour'] = ((df['settlementPeriod'] - 1) // 2).astype(int)
-        return df
-    return None
+    df = get_market_index_data(settlement_date_from, settlement_date_to, data_providers=['APXMIDP'])
+    if df is not None and 'settlementPeriod' in df.columns:
+        df['hour'] = ((df['settlementPeriod'] - 1) // 2).astype(int)
+    return df
 
 
 def get_generation_by_fuel(settlement_date_from: str, settlement_date_to: Optional[str] = None) -> Optional[pd.DataFrame]:
     if settlement_date_to is None:
         settlement_date_to = settlement_date_from
 
-    cache_dir = '../cache'
-    os.makedirs(cache_dir, exist_ok=True)
-    cache_file = f'{cache_dir}/generation_fuel_{settlement_date_from}_{settlement_date_to}.pkl'
+    cache_file = cache_path(CACHE_DIR, f'generation_fuel_{settlement_date_from}_{settlement_date_to}')
 
-    if os.path.exists(cache_file):
+    cached_df = load_cache(cache_file)
+    if cached_df is not None:
         print(f"Loading from cache: {cache_file}")
-        return pickle.load(open(cache_file, 'rb'))
+        return cached_df
 
     max_retries = 3
     for attempt in range(max_retries):
-        response = requests.get(
-            'https://data.elexon.co.uk/bmrs/api/v1/datasets/FUELHH',
+        response = http_get(
+            'elexon', 'https://data.elexon.co.uk/bmrs/api/v1/datasets/FUELHH',
             params={
                 'settlementDateFrom': settlement_date_from,
-                'settlementDateTo': settlement_date_to
+                'settlementDateTo': settlement_date_to,
+                'format': 'csv'
             },
+            headers={'accept': 'text/plain'},
+            validators=VALIDATORS,
             verify=False,
             timeout=30
         )
-        if response.status_code == 200 and response.text.strip():
-            data = response.json()
-            df = pd.DataFrame(data['data'])
-            pickle.dump(df, open(cache_file, 'wb'))
+        if response.status_code == 200 and response.content.strip():
+            # Month-long ranges are hundreds of thousands of rows, parsed on all cores
+            df = read_csv_bytes(response.content, BMRS_CSV_TYPES['FUELHH'])
+            save_cache(df, cache_file)
             print(f"Cached data: {cache_file}")
             return df
         elif attempt < max_retries - 1:
+            inc('power_research_retries_total', source='elexon', endpoint='datasets/FUELHH')
             print(f"Request failed, retrying... ({attempt + 1}/{max_retries})")
     return None
 
 
 def get_market_index_data(from_date: str, to_date: Optional[str] = None,
                          settlement_period_from: Optional[int] = None,
-                         settlement_period_to: Optional[int] = None) -> Optional[pd.DataFrame]:
+                         settlement_period_to: Optional[int] = None,
+                         data_providers: Optional[list[str]] = None) -> Optional[pd.DataFrame]:
+    """Market index prices and volumes (MID), every provider unless data_providers is given."""
     if to_date is None:
         to_date = from_date
     from_timestamp = f"{from_date}T00:00Z"
@@ -175,14 +178,18 @@ def get_market_index_data(from_date: str, to_date: Optional[str] = None,
         params['settlementPeriodFrom'] = settlement_period_from
     if settlement_period_to is not None:
         params['settlementPeriodTo'] = settlement_period_to
-    response = requests.get(
-        'https://data.elexon.co.uk/bmrs/api/v1/balancing/pricing/market-index',
+    if data_providers is not None:
+        params['dataProviders'] = data_providers
+    response = http_get(
+        'elexon', 'https://data.elexon.co.uk/bmrs/api/v1/balancing/pricing/market-index',
         params=params,
         verify=False
     )
     if response.status_code == 200 and response.text.strip():
-        data = response.json()
-        return pd.DataFrame(data['data'])
+        with stage('json_decode'):
+            data = response.json()
+        with stage('dataframe'):
+            return pd.DataFrame(data['data'])
     return None
 
 
@@ -205,15 +212,17 @@ def get_balancing_acceptances(from_date: str, to_date: str | None = None,
         params['settlementPeriodFrom'] = settlement_period_from
     if settlement_period_to is not None:
         params['settlementPeriodTo'] = settlement_period_to
-    response = requests.get(
-        'https://data.elexon.co.uk/bmrs/api/v1/balancing/acceptances',
+    response = http_get(
+        'elexon', 'https://data.elexon.co.uk/bmrs/api/v1/balancing/acceptances',
         params=params,
         headers={'accept': 'text/plain'},
         verify=False
     )
     if response.status_code == 200 and response.text.strip():
-        data = response.json()
-        return pd.DataFrame(data['data'])
+        with stage('json_decode'):
+            data = response.json()
+        with stage('dataframe'):
+            return pd.DataFrame(data['data'])
     return None
 
 
@@ -239,15 +248,38 @@ def get_balancing_physical(from_date: str, to_date: str | None = None,
         params['settlementPeriodTo'] = settlement_period_to
     if datasets is not None:
         params['dataset'] = datasets
-    response = requests.get(
-        'https://data.elexon.co.uk/bmrs/api/v1/balancing/physical',
+    response = http_get(
+        'elexon', 'https://data.elexon.co.uk/bmrs/api/v1/balancing/physical',
         params=params,
         headers={'accept': 'text/plain'},
         verify=False
     )
     if response.status_code == 200 and response.text.strip():
-        data = response.json()
-        return pd.DataFrame(data['data'])
+        with stage('json_decode'):
+            data = response.json()
+        with stage('dataframe'):
+            return pd.DataFrame(data['data'])
+    return None
+
+
+def get_balancing_physical_all(dataset: str, settlement_date: str, settlement_period: int) -> pd.DataFrame | None:
+    """This endpoint provides physical data (PN, QPN, MILS or MELS) for all BMUs in one settlement period."""
+    params = {
+        'dataset': dataset,
+        'settlementDate': settlement_date,
+        'settlementPeriod': settlement_period
+    }
+    response = http_get(
+        'elexon', 'https://data.elexon.co.uk/bmrs/api/v1/balancing/physical/all',
+        params=params,
+        headers={'accept': 'text/plain'},
+        verify=False
+    )
+    if response.status_code == 200 and response.text.strip():
+        with stage('json_decode'):
+            data = response.json()
+        with stage('dataframe'):
+            return pd.DataFrame(data['data'])
     return None
 
 
@@ -271,15 +303,17 @@ def get_balancing_dynamic(bm_unit: str | None = None,
         params['untilSettlementPeriod'] = until_settlement_period
     if datasets is not None:
         params['dataset'] = datasets
-    response = requests.get(
-        'https://data.elexon.co.uk/bmrs/api/v1/balancing/dynamic',
+    response = http_get(
+        'elexon', 'https://data.elexon.co.uk/bmrs/api/v1/balancing/dynamic',
         params=params,
         headers={'accept': 'text/plain'},
         verify=False
     )
     if response.status_code == 200 and response.text.strip():
-        data = response.json()
-        return pd.DataFrame(data['data'])
+        with stage('json_decode'):
+            data = response.json()
+        with stage('dataframe'):
+            return pd.DataFrame(data['data'])
     return None
 
 
@@ -302,15 +336,17 @@ def get_balancing_bid_offer(from_date: str, to_date: str | None = None,
         params['settlementPeriodFrom'] = settlement_period_from
     if settlement_period_to is not None:
         params['settlementPeriodTo'] = settlement_period_to
-    response = requests.get(
-        'https://data.elexon.co.uk/bmrs/api/v1/balancing/bid-offer',
+    response = http_get(
+        'elexon', 'https://data.elexon.co.uk/bmrs/api/v1/balancing/bid-offer',
         params=params,
         headers={'accept': 'text/plain'},
         verify=False
     )
     if response.status_code == 200 and response.text.strip():
-        data = response.json()
-        return pd.DataFrame(data['data'])
+        with stage('json_decode'):
+            data = response.json()
+        with stage('dataframe'):
+            return pd.DataFrame(data['data'])
     return None
 
 
@@ -320,15 +356,17 @@ def get_balancing_acceptances_all(settlement_date: str, settlement_period: int)
         'settlementDate': settlement_date,
         'settlementPeriod': settlement_period
     }
-    response = requests.get(
-        'https://data.elexon.co.uk/bmrs/api/v1/balancing/acceptances/all',
+    response = http_get(
+        'elexon', 'https://data.elexon.co.uk/bmrs/api/v1/balancing/acceptances/all',
         params=params,
         headers={'accept': 'text/plain'},
         verify=False
     )
     if response.status_code == 200 and response.text.strip():
-        data = response.json()
-        return pd.DataFrame(data['data'])
+        with stage('json_decode'):
+            data = response.json()
+        with stage('dataframe'):
+            return pd.DataFrame(data['data'])
     return None
 
 
@@ -338,15 +376,17 @@ def get_balancing_bid_offer_all(settlement_date: str, settlement_period: int) ->
         'settlementDate': settlement_date,
         'settlementPeriod': settlement_period
     }
-    response = requests.get(
-        'https://data.elexon.co.uk/bmrs/api/v1/balancing/bid-offer/all',
+    response = http_get(
+        'elexon', 'https://data.elexon.co.uk/bmrs/api/v1/balancing/bid-offer/all',
         params=params,
         headers={'accept': 'text/plain'},
         verify=False
     )
     if response.status_code == 200 and response.text.strip():
-        data = response.json()
-        return pd.DataFrame(data['data'])
+        with stage('json_decode'):
+            data = response.json()
+        with stage('dataframe'):
+            return pd.DataFrame(data['data'])
     return None
 
 
@@ -366,15 +406,17 @@ def get_balancing_nonbm_volumes(from_date: str, to_date: str | None = None,
         params['settlementPeriodFrom'] = settlement_period_from
     if settlement_period_to is not None:
         params['settlementPeriodTo'] = settlement_period_to
-    response = requests.get(
-        'https://data.elexon.co.uk/bmrs/api/v1/balancing/nonbm/volumes',
+    response = http_get(
+        'elexon', 'https://data.elexon.co.uk/bmrs/api/v1/balancing/nonbm/volumes',
         params=params,
         headers={'accept': 'text/plain'},
         verify=False
     )
     if response.status_code == 200 and response.text.strip():
-        data = response.json()
-        return pd.DataFrame(data['data'])
+        with stage('json_decode'):
+            data = response.json()
+        with stage('dataframe'):
+            return pd.DataFrame(data['data'])
     return None
 
 
@@ -384,18 +426,48 @@ def get_balancing_nonbm_disbsad_details(settlement_date: str, settlement_period:
         'settlementDate': settlement_date,
         'settlementPeriod': settlement_period
     }
-    response = requests.get(
-        'https://data.elexon.co.uk/bmrs/api/v1/balancing/nonbm/disbsad/details',
+    response = http_get(
+        'elexon', 'https://data.elexon.co.uk/bmrs/api/v1/balancing/nonbm/disbsad/details',
         params=params,
         headers={'accept': 'text/plain'},
         verify=False
     )
     if response.status_code == 200 and response.text.strip():
-        data = response.json()
-        return pd.DataFrame(data['data'])
+        with stage('json_decode'):
+            data = response.json()
+        with stage('dataframe'):
+            return pd.DataFrame(data['data'])
     return None
 
 
+def get_balancing_nonbm_disbsad_details_day(settlement_date: str, max_workers: int = 8, use_cache: bool = True,
+                                            failed_periods: set[int] | None = None) -> pd.DataFrame | None:
+    """
+    Disaggregated balancing services adjustment actions for a whole day, periods fetched concurrently.
+
+    Periods with no response are added to failed_periods, and the partial day is not cached.
+    """
+    cache_file = cache_path(CACHE_DIR, f"disbsad_details_{settlement_date}")
+    if use_cache:
+        cached_df = load_cache(cache_file)
+        if cached_df is not None:
+            return cached_df
+
+    df, failed = fetch_settlement_periods(get_balancing_nonbm_disbsad_details, settlement_date,
+                                          settlement_periods(settlement_date), max_workers)
+    if failed:
+        print(f"  ✗ DISBSAD details {settlement_date}: no response for periods {failed}")
+        if failed_periods is not None:
+            failed_periods.update(failed)
+    if df is None:
+        return None
+
+    # Only complete, finished days are cached, today's actions are still arriving
+    if use_cache and not failed and settlement_date < datetime.now().strftime('%Y-%m-%d'):
+        save_cache(df, cache_file)
+    return df
+
+
 def get_balancing_nonbm_disbsad_summary(from_date: str, to_date: str | None = None) -> pd.DataFrame | None:
     """This endpoint provides disaggregated balancing services adjustment data batched by settlement period."""
     if to_date is None:
@@ -406,71 +478,142 @@ def get_balancing_nonbm_disbsad_summary(from_date: str, to_date: str | None = No
         'from': from_timestamp,
         'to': to_timestamp
     }
-    response = requests.get(
-        'https://data.elexon.co.uk/bmrs/api/v1/balancing/nonbm/disbsad/summary',
+    response = http_get(
+        'elexon', 'https://data.elexon.co.uk/bmrs/api/v1/balancing/nonbm/disbsad/summary',
         params=params,
         headers={'accept': 'text/plain'},
         verify=False
     )
     if response.status_code == 200 and response.text.strip():
-        data = response.json()
-        return pd.DataFrame(data['data'])
+        with stage('json_decode'):
+            data = response.json()
+        with stage('dataframe'):
+            return pd.DataFrame(data['data'])
     return None
 
 
-def get_balancing_acceptances_all_day(settlement_date: str) -> pd.DataFrame | None:
-    """Get acceptances for all BMUs across all settlement periods (1-48) for a single day."""
-    all_data = []
-    for period in range(1, 49):
-        df = get_balancing_acceptances_all(settlement_date, period)
-        if df is not None and not df.empty:
-            all_data.append(df)
+def settlement_periods(settlement_date: str) -> list[int]:
+    """Settlement periods of a day: 1-46 in spring, 1-50 in autumn, 1-48 otherwise."""
+    start = pd.Timestamp(settlement_date).tz_localize('Europe/London')
+    end = (pd.Timestamp(settlement_date) + timedelta(days=1)).tz_localize('Europe/London')
+    return list(range(1, int((end - start) / timedelta(minutes=30)) + 1))
 
-    if all_data:
-        return pd.concat(all_data, ignore_index=True)
-    return None
 
+def ended_settlement_periods(settlement_date: str, now: pd.Timestamp | None = None) -> list[int]:
+    """Settlement periods of a day that have finished by now, all of them for a past day."""
+    start = pd.Timestamp(settlement_date).tz_localize('Europe/London').tz_convert('UTC')
+    now = now or pd.Timestamp.now(tz='UTC')
+    return [p for p in settlement_periods(settlement_date) if start + timedelta(minutes=30 * p) <= now]
 
-def get_acceptances_with_prices(settlement_date: str) -> pd.DataFrame | None:
-    """Join acceptances with bid-offer data to get actual prices paid."""
-    acceptances_df = get_balancing_acceptances_all_day(settlement_date)
-    if acceptances_df is None:
-        return None
 
-    all_bid_offers = []
-    settlement_periods = acceptances_df['settlementPeriodFrom'].unique()
+def settlement_period_start_times(settlement_date: str, periods) -> list[str]:
+    """UTC start of each settlement period as BMRS formats startTime, e.g. '2025-06-01T23:00:00Z'."""
+    start = pd.Timestamp(settlement_date).tz_localize('Europe/London').tz_convert('UTC')
+    return [(start + timedelta(minutes=30 * (int(p) - 1))).strftime('%Y-%m-%dT%H:%M:%SZ') for p in periods]
 
-    for period in sorted(settlement_periods):
-        bid_offer_df = get_balancing_bid_offer_all(settlement_date, period)
-        if bid_offer_df is not None:
-            all_bid_offers.append(bid_offer_df)
 
-    if not all_bid_offers:
-        return None
+def fetch_settlement_periods(fetch, settlement_date: str, periods, max_workers: int = 8) -> tuple[pd.DataFrame | None, list[int]]:
+    """
+    Call a per-period endpoint for several settlement periods concurrently.
 
-    bid_offers_df = pd.concat(all_bid_offers, ignore_index=True)
+    A period fails when its request raises or gets no usable response (the getter returns None).
+    An empty frame is an answer, the period just had no rows.
 
-    merged_df = pd.merge(
-        acceptances_df,
-        bid_offers_df,
-        on=['bmUnit', 'settlementDate'],
-        how='inner',
-        suffixes=('_acceptance', '_bid_offer')
-    )
+    Returns:
+        Rows of every answered period (None when there are none) and the failed periods
+    """
+    def fetch_period(period: int) -> pd.DataFrame | None:
+        try:
+            return fetch(settlement_date, period)
+        except Exception as e:
+            print(f"  ✗ {settlement_date} period {period}: {e}")
+            return None
+
+    periods = list(periods)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(carry_stages(fetch_period), periods))
+    failed = [period for period, df in zip(periods, results) if df is None]
+    frames = [df for df in results if df is not None and not df.empty]
+    return (pd.concat(frames, ignore_index=True) if frames else None), failed
+
+
+def get_balancing_acceptances_all_day(settlement_date: str, periods: list[int] | None = None,
+                                      failed_periods: set[int] | None = None) -> pd.DataFrame | None:
+    """Get acceptances for all BMUs across every settlement period of a single day.
+
+    Pass periods to fetch only some of them. Periods whose request failed are added to
+    failed_periods, so callers can tell a quiet period from a missing one.
+    """
+    periods = settlement_periods(settlement_date) if periods is None else periods
+    df, failed = fetch_settlement_periods(get_balancing_acceptances_all, settlement_date, periods)
+    if failed:
+        print(f"  ✗ Acceptances {settlement_date}: no response for periods {failed}")
+        if failed_periods is not None:
+            failed_periods.update(failed)
+    return df
+
+
+def join_acceptances_bid_offers(acceptances_df: pd.DataFrame, bid_offers_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Match each acceptance to the bid-offer pairs of the same BMU whose validity window overlaps
+    the acceptance's timeFrom-timeTo window.
+
+    Works on any number of days at once. Acceptances spanning several settlement periods get a
+    row per overlapping pair, with overlapStart/overlapEnd bounding the time each pair applied.
+    """
+    bid_offers_df = bid_offers_df.drop(columns=['settlementDate'], errors='ignore')
+    return interval_join(acceptances_df, bid_offers_df, by='bmUnit', suffixes=('_acceptance', '_bid_offer'))
+
+
+def get_acceptances_with_prices(settlement_date: str, periods: list[int] | None = None,
+                                failed_periods: set[int] | None = None) -> pd.DataFrame | None:
+    """Join acceptances with bid-offer data to get actual prices paid.
+
+    Acceptances touching a period whose bid-offer request failed are left out rather than
+    priced from partial data, and their settlementPeriodFrom is added to failed_periods.
+    """
+    failed = set()
+    with stage('acceptances'):
+        acceptances_df = get_balancing_acceptances_all_day(settlement_date, periods, failed)
+    if acceptances_df is None:
+        if failed_periods is not None:
+            failed_periods.update(failed)
+        return None
 
-    merged_df = merged_df[
-        (merged_df['settlementPeriodFrom'] >= merged_df['settlementPeriod']) &
-        (merged_df['settlementPeriodTo'] <= merged_df['settlementPeriod'])
+    # Every period an acceptance touches, not just the one it starts in
+    touched = [
+        set(range(int(start), int(end) + 1))
+        for start, end in zip(acceptances_df['settlementPeriodFrom'], acceptances_df['settlementPeriodTo'])
     ]
 
+    with stage('bid_offers'):
+        bid_offers_df, failed_bid_offers = fetch_settlement_periods(
+            get_balancing_bid_offer_all, settlement_date, sorted(set().union(*touched))
+        )
+
+    if failed_bid_offers:
+        print(f"  ✗ Bid-offers {settlement_date}: no response for periods {failed_bid_offers}")
+        unpriced = [bool(periods_touched & set(failed_bid_offers)) for periods_touched in touched]
+        failed.update(int(p) for p in acceptances_df.loc[unpriced, 'settlementPeriodFrom'])
+        acceptances_df = acceptances_df[[not u for u in unpriced]]
+    if failed_periods is not None:
+        failed_periods.update(failed)
+
+    if bid_offers_df is None or acceptances_df.empty:
+        return None
+
+    with stage('merge'):
+        merged_df = join_acceptances_bid_offers(acceptances_df, bid_offers_df)
+
     return merged_df
 
 
 def get_bm_units_reference() -> pd.DataFrame | None:
     """Get BMU reference data including fuel types and other metadata."""
-    response = requests.get(
-        'https://data.elexon.co.uk/bmrs/api/v1/reference/bmunits/all',
+    response = http_get(
+        'elexon', 'https://data.elexon.co.uk/bmrs/api/v1/reference/bmunits/all',
         headers={'accept': 'text/plain'},
+        validators=VALIDATORS,
         verify=False
     )
     if response.status_code == 200 and response.text.strip():
@@ -484,10 +627,11 @@ def get_bm_units_reference() -> pd.DataFrame | None:
     return None
 
 
-def get_acceptances_with_fuel_types(settlement_date: str) -> pd.DataFrame | None:
+def get_acceptances_with_fuel_types(settlement_date: str, periods: list[int] | None = None,
+                                    failed_periods: set[int] | None = None) -> pd.DataFrame | None:
     """Get acceptances with prices and fuel types for comprehensive analysis."""
     # Get acceptances with prices
-    df_balancing = get_acceptances_with_prices(settlement_date)
+    df_balancing = get_acceptances_with_prices(settlement_date, periods, failed_periods)
     if df_balancing is None:
         return None
 
@@ -507,47 +651,89 @@ def get_acceptances_with_fuel_types(settlement_date: str) -> pd.DataFrame | None
     return merged_df
 
 
-def analyze_balancing_costs_simple(settlement_date: str, period_start: int = 1, period_end: int = 48, use_cache: bool = True) -> pd.DataFrame | None:
-    """Create summary DataFrame of balancing costs with DISBSAD, acceptances, and bid-offers."""
+def analyze_balancing_costs_simple(settlement_date: str, period_start: int = 1, period_end: int = 48, use_cache: bool = True,
+                                   include_disbsad_costs: bool = False, periods: list[int] | None = None,
+                                   failed_periods: set[int] | None = None) -> pd.DataFrame | None:
+    """Create summary DataFrame of balancing costs with DISBSAD, acceptances, and bid-offers.
+
+    With include_disbsad_costs, per-period DISBSAD cost and net volume totals from the action
+    details are added as disbsad_cost and disbsad_volume.
+
+    periods, when given, replaces period_start-period_end, e.g. to repair a few missing periods.
+    Every requested period that has ended gets a row, with zeros where it had no DISBSAD actions or
+    acceptances, so today's summary stops at the last finished period and is not cached.
+    Periods whose acceptances request failed are dropped from the summary instead of showing zero
+    acceptances, added to failed_periods, and the result is not cached.
+    """
+    if periods is None:
+        periods = [p for p in settlement_periods(settlement_date) if period_start <= p <= period_end]
+    else:
+        period_end = settlement_periods(settlement_date)[-1]
+        use_cache = False
+
+    # Periods still to come answer with no rows, which would read as quiet periods. A day
+    # that has not finished is never cached.
+    ended = ended_settlement_periods(settlement_date)
+    if len(ended) < len(settlement_periods(settlement_date)):
+        use_cache = False
+    periods = [p for p in periods if p in ended]
+    if not periods:
+        return None
 
     # Check cache first
     if use_cache:
-        cache_dir = 'data/cache'
-        os.makedirs(cache_dir, exist_ok=True)
-        cache_file = f"{cache_dir}/balancing_costs_simple_{settlement_date}_{period_start}_{period_end}.pkl"
-
-        if os.path.exists(cache_file):
-            try:
-                with open(cache_file, 'rb') as f:
-                    return pickle.load(f)
-            except Exception as e:
-                print(f"Cache read error for {settlement_date}: {e}")
-
-    disbsad_df = get_balancing_nonbm_disbsad_summary(settlement_date, settlement_date)
-    if disbsad_df is None or len(disbsad_df) == 0 or 'settlementPeriod' not in disbsad_df.columns:
+        suffix = '_disbsad_costs' if include_disbsad_costs else ''
+        cache_file = cache_path(CACHE_DIR, f"balancing_costs_simple_{settlement_date}_{period_start}_{period_end}{suffix}")
+
+        try:
+            cached_df = load_cache(cache_file)
+            if cached_df is not None:
+                return cached_df
+        except Exception as e:
+            print(f"Cache read error for {settlement_date}: {e}")
+
+    with stage('disbsad'):
+        disbsad_df = get_balancing_nonbm_disbsad_summary(settlement_date, settlement_date)
+    if disbsad_df is None:
         return None
 
-    target_periods = disbsad_df[
-        (disbsad_df['settlementPeriod'] >= period_start) &
-        (disbsad_df['settlementPeriod'] <= period_end)
-    ].copy()
+    failed = set()
+    with stage('acceptances'):
+        acceptances_df = get_balancing_acceptances_all_day(settlement_date, periods, failed)
+    if failed_periods is not None:
+        failed_periods.update(failed)
 
-    acceptances_df = get_balancing_acceptances_all_day(settlement_date)
-    if acceptances_df is None:
-        return target_periods
+    # One row per requested period: DISBSAD only has rows for periods with actions, and a
+    # period with no acceptances is quiet, not missing
+    answered = [p for p in periods if p not in failed]
+    summary_df = pd.DataFrame({
+        'settlementDate': settlement_date,
+        'settlementPeriod': answered,
+        'startTime': settlement_period_start_times(settlement_date, answered),
+    })
+    if 'settlementPeriod' in disbsad_df.columns:
+        summary_df = summary_df.merge(
+            disbsad_df.drop(columns=['settlementDate', 'startTime'], errors='ignore'),
+            on='settlementPeriod',
+            how='left'
+        )
 
+    if acceptances_df is None:
+        acceptances_df = pd.DataFrame(columns=['settlementPeriodFrom', 'settlementPeriodTo', 'acceptanceNumber',
+                                               'bmUnit', 'levelFrom', 'levelTo'])
     target_acceptances = acceptances_df[
-        (acceptances_df['settlementPeriodFrom'] >= period_start) &
+        acceptances_df['settlementPeriodFrom'].isin(periods) &
         (acceptances_df['settlementPeriodTo'] <= period_end)
     ].copy()
 
     # Group acceptances by settlement period for summary
-    period_summary = target_acceptances.groupby('settlementPeriodFrom').agg({
-        'acceptanceNumber': 'count',
-        'bmUnit': 'nunique',
-        'levelFrom': ['sum', 'mean'],
-        'levelTo': ['sum', 'mean']
-    }).reset_index()
+    with stage('groupby'):
+        period_summary = target_acceptances.groupby('settlementPeriodFrom').agg({
+            'acceptanceNumber': 'count',
+            'bmUnit': 'nunique',
+            'levelFrom': ['sum', 'mean'],
+            'levelTo': ['sum', 'mean']
+        }).reset_index()
 
     period_summary.columns = [
         'settlementPeriod', 'acceptance_count', 'unique_bmus_called',
@@ -555,31 +741,56 @@ def analyze_balancing_costs_simple(settlement_date: str, period_start: int = 1,
     ]
 
     # Merge with DISBSAD data
-    summary_df = target_periods.merge(
-        period_summary,
-        on='settlementPeriod',
-        how='left'
-    )
+    with stage('merge'):
+        summary_df = summary_df.merge(
+            period_summary.astype({'settlementPeriod': 'int64'}),
+            on='settlementPeriod',
+            how='left'
+        )
 
-    # Fill NaN values for periods with no acceptances
+    if include_disbsad_costs:
+        with stage('disbsad_details'):
+            failed_details = set()
+            details_df = get_balancing_nonbm_disbsad_details_day(settlement_date, use_cache=use_cache,
+                                                                 failed_periods=failed_details)
+        # Periods without their action details would show zero cost, so they count as failed
+        failed.update(p for p in failed_details if p in periods)
+        summary_df = summary_df[~summary_df['settlementPeriod'].isin(failed)]
+        if failed_periods is not None:
+            failed_periods.update(failed)
+        if details_df is not None:
+            period_costs = details_df.groupby('settlementPeriod').agg(
+                disbsad_cost=('cost', 'sum'),
+                disbsad_volume=('volume', 'sum')
+            ).reset_index()
+            summary_df = summary_df.merge(period_costs, on='settlementPeriod', how='left')
+
+    # Fill NaN values for periods with no DISBSAD actions or acceptances
     summary_df = summary_df.fillna(0)
+    if summary_df.empty:
+        return None
 
-    # Save to cache
-    if use_cache:
+    # Save to cache, unless some periods are missing
+    if use_cache and not failed:
         try:
-            with open(cache_file, 'wb') as f:
-                pickle.dump(summary_df, f)
+            save_cache(summary_df, cache_file)
         except Exception as e:
             print(f"Cache write error for {settlement_date}: {e}")
 
     return summary_df
 
 
-def get_top_called_bmus_with_prices(settlement_date: str, period_start: int = 1, period_end: int = 48, top_n: int = 10) -> pd.DataFrame | None:
-    """Get the top called BMUs with their offer price statistics."""
+def get_top_called_bmus_with_prices(settlement_date: str, period_start: int = 1, period_end: int = 48, top_n: int = 10,
+                                    failed_periods: set[int] | None = None) -> pd.DataFrame | None:
+    """Get the top called BMUs with their offer price statistics.
+
+    Periods whose acceptance or bid-offer request failed are added to failed_periods.
+    """
+    periods = [p for p in settlement_periods(settlement_date) if period_start <= p <= period_end]
+    failed = set() if failed_periods is None else failed_periods
 
-    # Get all acceptances for the day
-    acceptances_df = get_balancing_acceptances_all_day(settlement_date)
+    # Get all acceptances for the target periods
+    acceptances_df = get_balancing_acceptances_all_day(settlement_date, periods, failed)
     if acceptances_df is None:
         return None
 
@@ -604,17 +815,14 @@ def get_top_called_bmus_with_prices(settlement_date: str, period_start: int = 1,
     bmu_calls = bmu_calls.sort_values('call_count', ascending=False).head(top_n)
 
     # Get bid-offer data for target periods
-    all_bid_offers = []
-    for period in range(period_start, period_end + 1):
-        bid_offer_df = get_balancing_bid_offer_all(settlement_date, period)
-        if bid_offer_df is not None:
-            all_bid_offers.append(bid_offer_df)
+    bid_offers_df, failed_bid_offers = fetch_settlement_periods(get_balancing_bid_offer_all, settlement_date, periods)
+    if failed_bid_offers:
+        print(f"  ✗ Bid-offers {settlement_date}: no response for periods {failed_bid_offers}")
+        failed.update(failed_bid_offers)
 
-    if not all_bid_offers:
+    if bid_offers_df is None:
         return bmu_calls
 
-    bid_offers_df = pd.concat(all_bid_offers, ignore_index=True)
-
     # Get bid-offer data for the top called BMUs
     top_bmus = bmu_calls['bmUnit'].tolist()
     top_bmu_offers = bid_offers_df[bid_offers_df['bmUnit'].isin(top_bmus)].copy()
@@ -629,9 +837,137 @@ def get_top_called_bmus_with_prices(settlement_date: str, period_start: int = 1,
     return result_df
 
 
-def save_elexon_history(days_back: int = 3, data_dir: str = "power_research/data/elexon") -> int:
-    base_path = Path(data_dir)
-    base_path.mkdir(parents=True, exist_ok=True)
+def save_elexon_day(date_str: str, storage) -> bool:
+    """Fetch and store whichever of a day's Elexon files are missing. True once acceptances are saved."""
+    print(f"Processing {date_str}")
+
+    demand_key = f"{date_str}_demand_outturn.csv"
+    if not storage.exists(demand_key):
+        demand_df = get_demand_outturn_stream(date_str)
+        if demand_df is not None and not demand_df.empty:
+            write_csv(storage, demand_key, demand_df)
+            inc('power_research_rows_total', len(demand_df), source='elexon', dataset='demand_outturn')
+            print(f"  ✓ Saved demand outturn data: {len(demand_df)} rows")
+        else:
+            print(f"  ✗ No demand outturn data available")
+    else:
+        print(f"  Skipping demand outturn - already exists")
+
+    # Acceptances go first: their file has no rows for quiet periods, so periods whose request
+    # failed are also left out of balancing costs, where the coverage index sees them as missing
+    failed = set()
+    acceptances_saved = False
+    acceptances_key = f"{date_str}_acceptances.csv"
+    if not storage.exists(acceptances_key):
+        acceptances_df = get_acceptances_with_fuel_types(date_str, failed_periods=failed)
+        if acceptances_df is not None and not acceptances_df.empty:
+            write_csv(storage, acceptances_key, acceptances_df)
+            inc('power_research_rows_total', len(acceptances_df), source='elexon', dataset='acceptances')
+            print(f"  ✓ Saved acceptances data: {len(acceptances_df)} rows")
+            acceptances_saved = True
+        else:
+            print(f"  ✗ No acceptances data available")
+    else:
+        print(f"  Skipping acceptances - already exists")
+
+    balancing_key = f"{date_str}_balancing_costs.csv"
+    if not storage.exists(balancing_key):
+        balancing_df = analyze_balancing_costs_simple(date_str, period_end=settlement_periods(date_str)[-1],
+                                                      failed_periods=failed)
+        if balancing_df is not None:
+            balancing_df = balancing_df[~balancing_df['settlementPeriod'].isin(failed)]
+        if balancing_df is not None and not balancing_df.empty:
+            write_csv(storage, balancing_key, balancing_df)
+            inc('power_research_rows_total', len(balancing_df), source='elexon', dataset='balancing_costs')
+            print(f"  ✓ Saved balancing costs data: {len(balancing_df)} rows")
+        else:
+            print(f"  ✗ No balancing costs data available")
+    else:
+        print(f"  Skipping balancing costs - already exists")
+    return acceptances_saved
+
+
+# Per-day Elexon files: column naming each row's settlement period, a fetcher taking
+# (date, periods, failed_periods) that returns rows for just those periods, and whether the file
+# only has rows for active periods. Acceptances are repaired before balancing costs, which
+# carry the acceptances' missing periods (see save_elexon_day).
+ELEXON_DAY_FILES = {
+    'demand_outturn': ('settlementPeriod', lambda date, periods, failed: get_demand_outturn_stream(date), False),
+    'acceptances': ('settlementPeriodFrom', get_acceptances_with_fuel_types, True),
+    'balancing_costs': ('settlementPeriod', lambda date, periods, failed: analyze_balancing_costs_simple(
+        date, periods=periods, failed_periods=failed), False),
+}
+
+
+def repair_elexon_day(date_str: str, storage, missing: dict[str, list[int]]) -> dict[str, list[int]]:
+    """
+    Re-request only the missing settlement periods of stored Elexon files and merge them in.
+
+    Rows already stored for other periods are kept, and rows for the repaired periods are
+    replaced, so a day missing one period costs a couple of calls instead of a full refetch.
+    Periods missing from balancing costs are re-requested for the acceptances file too.
+
+    Args:
+        date_str: Settlement date in YYYY-MM-DD format
+        storage: Storage rooted at the Elexon directory, as for save_elexon_day
+        missing: File key -> missing settlement periods, e.g. from the coverage gap plan
+
+    Returns:
+        File key -> periods still missing after the repair
+    """
+    print(f"Repairing {date_str}")
+    missing = {key: sorted(int(p) for p in periods) for key, periods in missing.items()}
+    balancing_key = f"{date_str}_balancing_costs.csv"
+    acceptances_key = f"{date_str}_acceptances.csv"
+    if balancing_key in missing and storage.exists(acceptances_key):
+        missing[acceptances_key] = missing[balancing_key]
+
+    still_missing = {}
+    failed = set()
+    names = {key: key[len(f"{date_str}_"):-len('.csv')] for key in missing}
+    order = list(ELEXON_DAY_FILES)
+    for key in sorted(missing, key=lambda key: order.index(names[key]) if names[key] in order else len(order)):
+        name, periods = names[key], missing[key]
+        if name not in ELEXON_DAY_FILES or not storage.exists(key):
+            print(f"  ✗ {key}: not a stored Elexon day file")
+            still_missing[key] = periods
+            continue
+        column, fetch, sparse = ELEXON_DAY_FILES[name]
+        try:
+            fresh = fetch(date_str, periods, failed)
+        except Exception as e:
+            print(f"  ✗ {key}: {e}")
+            fresh = None
+            failed.update(periods)
+        if fresh is not None and column in fresh.columns:
+            fresh = fresh[fresh[column].isin(periods) & ~fresh[column].isin(failed)]
+        if fresh is None or fresh.empty:
+            if sparse and not failed & set(periods):
+                print(f"  ✓ {key}: no rows for periods {periods}")
+                continue
+            print(f"  ✗ {key}: no data for periods {periods}")
+            still_missing[key] = periods
+            continue
+
+        # Stored rows are only replaced for periods that answered
+        answered = [p for p in periods if p not in failed]
+        stored = read_csv(storage, key)
+        merged = pd.concat([stored[~stored[column].isin(answered)], fresh], ignore_index=True)
+        write_csv(storage, key, merged.sort_values(column, kind='stable', ignore_index=True))
+        inc('power_research_rows_total', len(fresh), source='elexon', dataset=name)
+        if sparse:
+            remaining = sorted(set(periods) & failed)
+        else:
+            remaining = sorted(set(periods) - set(fresh[column].astype(int)))
+        print(f"  ✓ Repaired {name}: {len(periods) - len(remaining)} of {len(periods)} periods, {len(fresh)} rows")
+        if remaining:
+            still_missing[key] = remaining
+    return still_missing
+
+
+def save_elexon_history(days_back: int = 3, data_dir: str = "power_research/data/elexon",
+                        storage=None) -> int:
+    storage = storage or LocalStorage(data_dir)
 
     end_date = datetime.now()
     start_date = end_date - timedelta(days=days_back)
@@ -641,43 +977,8 @@ def save_elexon_history(days_back: int = 3, data_dir: str = "power_research/data
     print(f"Saving Elexon data from {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
 
     while current_date <= end_date:
-        date_str = current_date.strftime('%Y-%m-%d')
-        print(f"Processing {date_str}")
-
-        demand_file = base_path / f"{date_str}_demand_outturn.csv"
-        if not demand_file.exists():
-            demand_df = get_demand_outturn_stream(date_str)
-            if demand_df is not None and not demand_df.empty:
-                demand_df.to_csv(demand_file, index=False)
-                print(f"  ✓ Saved demand outturn data: {len(demand_df)} rows")
-            else:
-                print(f"  ✗ No demand outturn data available")
-        else:
-            print(f"  Skipping demand outturn - already exists")
-
-        balancing_file = base_path / f"{date_str}_balancing_costs.csv"
-        if not balancing_file.exists():
-            balancing_df = analyze_balancing_costs_simple(date_str)
-            if balancing_df is not None and not balancing_df.empty:
-                balancing_df.to_csv(balancing_file, index=False)
-                print(f"  ✓ Saved balancing costs data: {len(balancing_df)} rows")
-            else:
-                print(f"  ✗ No balancing costs data available")
-        else:
-            print(f"  Skipping balancing costs - already exists")
-
-        acceptances_file = base_path / f"{date_str}_acceptances.csv"
-        if not acceptances_file.exists():
-            acceptances_df = get_acceptances_with_fuel_types(date_str)
-            if acceptances_df is not None and not acceptances_df.empty:
-                acceptances_df.to_csv(acceptances_file, index=False)
-                print(f"  ✓ Saved acceptances data: {len(acceptances_df)} rows")
-                success_count += 1
-            else:
-                print(f"  ✗ No acceptances data available")
-        else:
-            print(f"  Skipping acceptances - already exists")
-
+        if save_elexon_day(current_date.strftime('%Y-%m-%d'), storage):
+            success_count += 1
         current_date += timedelta(days=1)
 
     print(f"Completed: {success_count} days processed")
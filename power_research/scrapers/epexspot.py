@@ -1,18 +1,23 @@
 import pandas as pd
 import os
-import pickle
 from datetime import datetime, timedelta
-from typing import Optional
-from pathlib import Path
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
+from typing import TYPE_CHECKING, Optional
 import time
 import re
+from storage import LocalStorage, write_csv
+from cache import CACHE_DIR, cache_path, load_cache, save_cache
+from metrics import inc, timed
 
+# Selenium is only loaded once a page is actually scraped
+if TYPE_CHECKING:
+    from selenium import webdriver
 
-def setup_driver() -> webdriver.Chrome:
+
+def setup_driver() -> 'webdriver.Chrome':
     """Setup Chrome driver with anti-detection settings."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
     options = Options()
 
     import os
@@ -40,13 +45,16 @@ def setup_driver() -> webdriver.Chrome:
     return webdriver.Chrome(options=options)
 
 
-def extract_table_data(driver: webdriver.Chrome) -> list[dict[str, str | float | None]]:
+def extract_table_data(driver: 'webdriver.Chrome') -> list[dict[str, str | float | None]]:
     """Extract 30-minute period data from the EPEX SPOT table."""
+    from selenium.webdriver.common.by import By
+
     data = []
 
     try:
         # Wait for table to be present
-        time.sleep(15)  # Allow time for dynamic content to load
+        with timed('power_research_selenium_duration_seconds', source='epexspot', stage='wait'):
+            time.sleep(15)  # Allow time for dynamic content to load
 
         # Extract time periods from page text
         page_text = driver.find_element(By.TAG_NAME, "body").text
@@ -146,7 +154,7 @@ def extract_table_data(driver: webdriver.Chrome) -> list[dict[str, str | float |
     return data
 
 
-def extract_auction_data(driver: webdriver.Chrome) -> tuple[dict[str, float], list[dict[str, str | float]], Optional[str]]:
+def extract_auction_data(driver: 'webdriver.Chrome') -> tuple[dict[str, float], list[dict[str, str | float]], Optional[str]]:
     """Extract intraday auction data from the EPEX SPOT table.
 
     Returns:
@@ -155,12 +163,15 @@ def extract_auction_data(driver: webdriver.Chrome) -> tuple[dict[str, float], li
         - period_data is a list of dicts with period, buy_volume, sell_volume, volume, price
         - actual_date is the delivery date shown on the page in YYYY-MM-DD format (or None if not found)
     """
+    from selenium.webdriver.common.by import By
+
     summary_data = {}
     period_data = []
     actual_date = None
 
     try:
-        time.sleep(15)  # Allow time for dynamic content to load
+        with timed('power_research_selenium_duration_seconds', source='epexspot', stage='wait'):
+            time.sleep(15)  # Allow time for dynamic content to load
 
         # Extract time periods from page text
         page_text = driver.find_element(By.TAG_NAME, "body").text
@@ -279,13 +290,12 @@ def scrape_epexspot(delivery_date: Optional[str] = None,
         delivery_date = datetime.now().strftime('%Y-%m-%d')
 
     # Setup cache
-    cache_dir = 'cache'
-    os.makedirs(cache_dir, exist_ok=True)
-    cache_file = f'{cache_dir}/epexspot_{market_area}_{delivery_date}_p{product}.pkl'
+    cache_file = cache_path(CACHE_DIR, f'epexspot_{market_area}_{delivery_date}_p{product}')
 
-    if os.path.exists(cache_file):
+    cached_df = load_cache(cache_file)
+    if cached_df is not None:
         print(f"Loading EPEX SPOT data from cache: {delivery_date}")
-        return pickle.load(open(cache_file, 'rb'))
+        return cached_df
 
     # Validate date
     request_date = datetime.strptime(delivery_date, '%Y-%m-%d')
@@ -317,10 +327,12 @@ def scrape_epexspot(delivery_date: Optional[str] = None,
            f"&production_period="
            f"&product={product}")
 
-    driver = setup_driver()
+    with timed('power_research_selenium_duration_seconds', source='epexspot', stage='driver_start'):
+        driver = setup_driver()
 
     try:
-        driver.get(url)
+        with timed('power_research_selenium_duration_seconds', source='epexspot', stage='page_load'):
+            driver.get(url)
 
         # Extract table data
         data = extract_table_data(driver)
@@ -337,7 +349,7 @@ def scrape_epexspot(delivery_date: Optional[str] = None,
             print(f"Warning: Expected {expected_periods} periods, but found {len(df)} rows")
 
         # Cache the data
-        pickle.dump(df, open(cache_file, 'wb'))
+        save_cache(df, cache_file)
         print(f"Cached EPEX SPOT data: {cache_file}")
 
         return df
@@ -370,13 +382,12 @@ def scrape_epexspot_auction(delivery_date: Optional[str] = None,
         delivery_date = datetime.now().strftime('%Y-%m-%d')
 
     # Setup cache
-    cache_dir = 'cache'
-    os.makedirs(cache_dir, exist_ok=True)
-    cache_file = f'{cache_dir}/epexspot_auction_{auction}_{delivery_date}_p{product}.pkl'
+    cache_file = cache_path(CACHE_DIR, f'epexspot_auction_{auction}_{delivery_date}_p{product}')
 
-    if os.path.exists(cache_file):
+    cached_df = load_cache(cache_file)
+    if cached_df is not None:
         print(f"Loading EPEX SPOT auction data from cache: {delivery_date}")
-        return pickle.load(open(cache_file, 'rb'))
+        return cached_df
 
     # Validate date
     request_date = datetime.strptime(delivery_date, '%Y-%m-%d')
@@ -408,10 +419,12 @@ def scrape_epexspot_auction(delivery_date: Optional[str] = None,
            f"&production_period="
            f"&product={product}")
 
-    driver = setup_driver()
+    with timed('power_research_selenium_duration_seconds', source='epexspot', stage='driver_start'):
+        driver = setup_driver()
 
     try:
-        driver.get(url)
+        with timed('power_research_selenium_duration_seconds', source='epexspot', stage='page_load'):
+            driver.get(url)
 
         # Extract auction data
         summary_data, period_data, actual_date = extract_auction_data(driver)
@@ -450,7 +463,7 @@ def scrape_epexspot_auction(delivery_date: Optional[str] = None,
             print(f"Warning: Expected {expected_periods} periods for {auction}, but found {len(df)} rows")
 
         # Cache the data
-        pickle.dump(df, open(cache_file, 'wb'))
+        save_cache(df, cache_file)
         print(f"Cached EPEX SPOT auction data: {cache_file}")
 
         return df
@@ -463,10 +476,34 @@ def scrape_epexspot_auction(delivery_date: Optional[str] = None,
         driver.quit()
 
 
+def save_epexspot_day(date_str: str, storage,
+                      market_area: str = "GB",
+                      product: str = "30") -> bool:
+    """Scrape and store one day of continuous data unless it is already archived. True when saved."""
+    file_key = f"{market_area}/product_{product}/{date_str}.csv"
+
+    if storage.exists(file_key):
+        print(f"Skipping {date_str} - already exists")
+        return False
+
+    print(f"\nProcessing {date_str}")
+
+    df = scrape_epexspot(date_str, market_area=market_area, product=product)
+
+    if df is not None and len(df) > 0:
+        write_csv(storage, file_key, df)
+        inc('power_research_rows_total', len(df), source='epexspot', dataset='continuous')
+        print(f"✓ Saved data for {date_str}: {len(df)} rows")
+        return True
+    print(f"✗ No data available for {date_str}")
+    return False
+
+
 def save_epexspot_history(days_back: int = 90,
                           data_dir: str = "power_research/data/epexspot",
                           market_area: str = "GB",
-                          product: str = "30") -> int:
+                          product: str = "30",
+                          storage=None) -> int:
     """
     Download historical EPEX SPOT data and save to CSV files.
 
@@ -475,13 +512,12 @@ def save_epexspot_history(days_back: int = 90,
         data_dir: Directory to save the data
         market_area: Market area code (default: 'GB')
         product: Product type - '30' for 30-minute (default: '30')
+        storage: Archive storage to write to (default: local files under data_dir)
 
     Returns:
         Number of days successfully processed
     """
-    base_path = Path(data_dir)
-    data_path = base_path / market_area / f"product_{product}"
-    data_path.mkdir(parents=True, exist_ok=True)
+    storage = storage or LocalStorage(data_dir)
 
     end_date = datetime.now()
     start_date = end_date - timedelta(days=days_back)
@@ -492,39 +528,63 @@ def save_epexspot_history(days_back: int = 90,
 
     while current_date <= end_date:
         date_str = current_date.strftime('%Y-%m-%d')
-        file_path = data_path / f"{date_str}.csv"
-
-        if file_path.exists():
-            print(f"Skipping {date_str} - already exists")
-            current_date += timedelta(days=1)
-            continue
-
-        print(f"\nProcessing {date_str}")
-
-        df = scrape_epexspot(date_str, market_area=market_area, product=product)
-
-        if df is not None and len(df) > 0:
-            df.to_csv(file_path, index=False)
-            print(f"✓ Saved data for {date_str}: {len(df)} rows")
+        fetched = not storage.exists(f"{market_area}/product_{product}/{date_str}.csv")
+        if save_epexspot_day(date_str, storage, market_area, product):
             success_count += 1
-        else:
-            print(f"✗ No data available for {date_str}")
 
         current_date += timedelta(days=1)
 
         # Be respectful - add a delay between requests
-        time.sleep(3)
+        if fetched:
+            time.sleep(3)
 
     print(f"\n{'='*60}")
     print(f"Completed: {success_count}/{days_back + 1} days processed successfully")
     return success_count
 
 
+def save_epexspot_auction_day(date_str: str, storage,
+                              market_area: str = "GB",
+                              auction: str = "GB-IDA1",
+                              product: str = "30") -> bool:
+    """Scrape and store one day of auction results and their summary prices. True when saved."""
+    data_prefix = f"{market_area}/{auction}/product_{product}"
+    file_key = f"{data_prefix}/{date_str}.csv"
+
+    if storage.exists(file_key):
+        print(f"Skipping {date_str} - already exists")
+        return False
+
+    print(f"\nProcessing {date_str}")
+
+    df = scrape_epexspot_auction(date_str, market_area=market_area, auction=auction, product=product)
+
+    if df is not None and len(df) > 0:
+        # Save the period data
+        write_csv(storage, file_key, df)
+        inc('power_research_rows_total', len(df), source='epexspot', dataset=auction)
+
+        # Also save summary data in a separate file
+        if hasattr(df, 'attrs') and ('baseload_price' in df.attrs or 'peakload_price' in df.attrs):
+            summary = ""
+            if 'baseload_price' in df.attrs:
+                summary += f"Baseload: {df.attrs['baseload_price']}\n"
+            if 'peakload_price' in df.attrs:
+                summary += f"Peakload: {df.attrs['peakload_price']}\n"
+            storage.write_bytes(f"{data_prefix}/{date_str}_summary.txt", summary.encode())
+
+        print(f"✓ Saved data for {date_str}: {len(df)} rows")
+        return True
+    print(f"✗ No data available for {date_str}")
+    return False
+
+
 def save_epexspot_auction_history(days_back: int = 90,
                                    data_dir: str = "power_research/data/epexspot_auction",
                                    market_area: str = "GB",
                                    auction: str = "GB-IDA1",
-                                   product: str = "30") -> int:
+                                   product: str = "30",
+                                   storage=None) -> int:
     """
     Download historical EPEX SPOT auction data and save to CSV files.
 
@@ -534,13 +594,12 @@ def save_epexspot_auction_history(days_back: int = 90,
         market_area: Market area code (default: 'GB')
         auction: Auction type (default: 'GB-IDA1')
         product: Product type - '30' for 30-minute (default: '30')
+        storage: Archive storage to write to (default: local files under data_dir)
 
     Returns:
         Number of days successfully processed
     """
-    base_path = Path(data_dir)
-    data_path = base_path / market_area / auction / f"product_{product}"
-    data_path.mkdir(parents=True, exist_ok=True)
+    storage = storage or LocalStorage(data_dir)
 
     end_date = datetime.now()
     start_date = end_date - timedelta(days=days_back)
@@ -551,39 +610,15 @@ def save_epexspot_auction_history(days_back: int = 90,
 
     while current_date <= end_date:
         date_str = current_date.strftime('%Y-%m-%d')
-        file_path = data_path / f"{date_str}.csv"
-
-        if file_path.exists():
-            print(f"Skipping {date_str} - already exists")
-            current_date += timedelta(days=1)
-            continue
-
-        print(f"\nProcessing {date_str}")
-
-        df = scrape_epexspot_auction(date_str, market_area=market_area, auction=auction, product=product)
-
-        if df is not None and len(df) > 0:
-            # Save the period data
-            df.to_csv(file_path, index=False)
-
-            # Also save summary data in a separate file
-            if hasattr(df, 'attrs') and ('baseload_price' in df.attrs or 'peakload_price' in df.attrs):
-                summary_file = data_path / f"{date_str}_summary.txt"
-                with open(summary_file, 'w') as f:
-                    if 'baseload_price' in df.attrs:
-                        f.write(f"Baseload: {df.attrs['baseload_price']}\n")
-                    if 'peakload_price' in df.attrs:
-                        f.write(f"Peakload: {df.attrs['peakload_price']}\n")
-
-            print(f"✓ Saved data for {date_str}: {len(df)} rows")
+        fetched = not storage.exists(f"{market_area}/{auction}/product_{product}/{date_str}.csv")
+        if save_epexspot_auction_day(date_str, storage, market_area, auction, product):
             success_count += 1
-        else:
-            print(f"✗ No data available for {date_str}")
 
         current_date += timedelta(days=1)
 
         # Be respectful - add a delay between requests
-        time.sleep(3)
+        if fetched:
+            time.sleep(3)
 
     print(f"\n{'='*60}")
     print(f"Completed: {success_count}/{days_back + 1} days processed successfully")
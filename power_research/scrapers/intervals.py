@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+
+def _milliseconds(values: pd.Series) -> np.ndarray:
+    """ISO strings or datetimes as int64 UTC milliseconds."""
+    times = pd.to_datetime(values, utc=True, format='ISO8601')
+    return times.to_numpy(dtype='datetime64[ms]').astype('int64')
+
+
+def overlapping_pairs(left_group: np.ndarray, left_start: np.ndarray, left_end: np.ndarray,
+                      right_group: np.ndarray, right_start: np.ndarray, right_end: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Index pairs (i, j) where left interval i and right interval j share a group and overlap.
+
+    Intervals are half-open [start, end). Right intervals are sorted by (group, start) and each
+    left interval binary-searches the candidates that start before it ends and are not already
+    finished by a running maximum of end times, so the cost is O((n + m) log m) plus the output.
+
+    Args:
+        left_group, right_group: Non-negative integer group codes, e.g. factorized BMU names
+        left_start, left_end, right_start, right_end: int64 times in a common unit
+
+    Returns:
+        Left and right positional indices of every overlapping pair
+    """
+    if len(left_start) == 0 or len(right_start) == 0:
+        return np.empty(0, dtype='int64'), np.empty(0, dtype='int64')
+
+    # Shift each group onto its own stretch of the number line so one sorted array holds them all
+    origin = min(left_start.min(), right_start.min())
+    span = max(left_end.max(), right_end.max()) - origin + 1
+    r_start = right_group * span + (right_start - origin)
+    r_end = right_group * span + (right_end - origin)
+    l_start = left_group * span + (left_start - origin)
+    l_end = left_group * span + (left_end - origin)
+
+    order = np.argsort(r_start, kind='stable')
+    r_start, r_end = r_start[order], r_end[order]
+    reach = np.maximum.accumulate(r_end)
+
+    lo = np.searchsorted(reach, l_start, side='right')
+    hi = np.searchsorted(r_start, l_end, side='left')
+    counts = np.maximum(hi - lo, 0)
+
+    left_idx = np.repeat(np.arange(len(l_start)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    sorted_idx = np.repeat(lo, counts) + offsets
+
+    # Candidates between lo and hi can still have ended before the left interval started
+    keep = r_end[sorted_idx] > l_start[left_idx]
+    return left_idx[keep], order[sorted_idx[keep]]
+
+
+def interval_join(left: pd.DataFrame, right: pd.DataFrame, by: str | list[str],
+                  left_on: tuple[str, str] = ('timeFrom', 'timeTo'),
+                  right_on: tuple[str, str] = ('timeFrom', 'timeTo'),
+                  suffixes: tuple[str, str] = ('_x', '_y')) -> pd.DataFrame:
+    """
+    Inner join of rows whose [start, end) windows overlap within the same `by` key.
+
+    The result has the joined columns of both frames plus overlapStart and overlapEnd,
+    the UTC bounds of the shared window.
+
+    Args:
+        left, right: Frames with start and end time columns (ISO strings or datetimes)
+        by: Column(s) that must match, e.g. 'bmUnit'
+        left_on, right_on: (start, end) column names in each frame
+        suffixes: Added to non-key columns present in both frames
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    keys = pd.concat([left[by], right[by]], ignore_index=True)
+    codes = keys.groupby(by, sort=False, dropna=False).ngroup().to_numpy(dtype='int64')
+
+    l_start, l_end = _milliseconds(left[left_on[0]]), _milliseconds(left[left_on[1]])
+    r_start, r_end = _milliseconds(right[right_on[0]]), _milliseconds(right[right_on[1]])
+    left_idx, right_idx = overlapping_pairs(codes[:len(left)], l_start, l_end, codes[len(left):], r_start, r_end)
+
+    shared = (set(left.columns) & set(right.columns)) - set(by)
+    left_part = left.iloc[left_idx].reset_index(drop=True)
+    right_part = right.drop(columns=by).iloc[right_idx].reset_index(drop=True)
+    left_part = left_part.rename(columns={c: c + suffixes[0] for c in shared})
+    right_part = right_part.rename(columns={c: c + suffixes[1] for c in shared})
+
+    joined = pd.concat([left_part, right_part], axis=1)
+    joined['overlapStart'] = pd.to_datetime(np.maximum(l_start[left_idx], r_start[right_idx]), unit='ms', utc=True)
+    joined['overlapEnd'] = pd.to_datetime(np.minimum(l_end[left_idx], r_end[right_idx]), unit='ms', utc=True)
+    return joined
@@ -0,0 +1,188 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.request import ACCEPT_ENCODING
+from profiling import stage
+
+# Upper bounds in seconds, shared by every histogram. Selenium waits run to tens of seconds
+# and NESO yearly downloads to a couple of minutes, so the top buckets are wide.
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+METRIC_HELP = {
+    'power_research_http_request_duration_seconds': ('histogram', 'HTTP request latency by source and endpoint'),
+    'power_research_http_response_bytes_total': ('counter', 'Response body bytes received'),
+    'power_research_http_requests_total': ('counter', 'HTTP requests by response status'),
+    'power_research_retries_total': ('counter', 'Requests retried after a failed attempt'),
+    'power_research_rows_total': ('counter', 'Rows parsed from a source or written to the archive'),
+    'power_research_cache_requests_total': ('counter', 'Scraper cache lookups by result'),
+    'power_research_selenium_duration_seconds': ('histogram', 'Selenium driver start, page load and wait times'),
+    'power_research_stage_duration_seconds': ('histogram', 'Wall time of pipeline stages such as one fetch task'),
+}
+
+_lock = threading.Lock()
+_counters: dict[tuple[str, tuple], float] = {}
+_histograms: dict[tuple[str, tuple], list] = {}
+
+
+def _key(name: str, labels: dict) -> tuple[str, tuple]:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def inc(name: str, amount: float = 1, **labels) -> None:
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def observe(name: str, value: float, **labels) -> None:
+    """Add one observation to a histogram: per-bucket counts, then sum and count."""
+    key = _key(name, labels)
+    with _lock:
+        state = _histograms.setdefault(key, [[0] * len(DEFAULT_BUCKETS), 0.0, 0])
+        for i, bound in enumerate(DEFAULT_BUCKETS):
+            if value <= bound:
+                state[0][i] += 1
+        state[1] += value
+        state[2] += 1
+
+
+@contextmanager
+def timed(name: str, **labels):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - started, **labels)
+
+
+def reset() -> None:
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def endpoint_label(url: str) -> str:
+    """Short, low-cardinality endpoint name, e.g. balancing/acceptances/all or datasets/FUELHH."""
+    path = urlparse(url).path
+    for prefix in ('/bmrs/api/v1/', '/api/3/action/'):
+        if path.startswith(prefix):
+            return path[len(prefix):]
+    return path.rsplit('/', 1)[-1] or urlparse(url).netloc
+
+
+def wire_bytes(response: requests.Response) -> int:
+    """Body bytes as received, before any Content-Encoding is decoded."""
+    body = response.content
+    try:
+        return int(response.raw.tell())
+    except (AttributeError, TypeError, ValueError):
+        return int(response.headers.get('Content-Length', len(body or b'')))
+
+
+def http_get(source: str, url: str, validators=None, **kwargs) -> requests.Response:
+    """
+    requests.get that records latency, status and response size on the wire for the metrics export.
+
+    Every request advertises the compressed encodings urllib3 can decode (gzip and deflate, plus
+    br and zstd when brotli or zstandard are installed). With a ValidatorStore, the request is
+    made conditional on the stored ETag/Last-Modified and a 304 is answered from the store.
+    """
+    endpoint = endpoint_label(url)
+    headers = CaseInsensitiveDict({'Accept-Encoding': ACCEPT_ENCODING})
+    headers.update(kwargs.pop('headers', None) or {})
+    stored = validators.load(url, kwargs.get('params')) if validators is not None else None
+    if stored:
+        headers.update(validators.conditional_headers(stored[0]))
+
+    started = time.perf_counter()
+    try:
+        with stage('http'):
+            response = requests.get(url, headers=headers, **kwargs)
+    except requests.RequestException:
+        inc('power_research_http_requests_total', source=source, endpoint=endpoint, status='error')
+        raise
+    finally:
+        observe('power_research_http_request_duration_seconds', time.perf_counter() - started,
+                source=source, endpoint=endpoint)
+    inc('power_research_http_requests_total', source=source, endpoint=endpoint, status=response.status_code)
+    inc('power_research_http_response_bytes_total', wire_bytes(response), source=source, endpoint=endpoint)
+
+    if validators is not None:
+        if response.status_code == 304 and stored:
+            return validators.response(*stored, response)
+        validators.save(url, kwargs.get('params'), response)
+    return response
+
+
+def _format_labels(labels: tuple, extra: tuple = ()) -> str:
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ''
+    escaped = (k + '="' + v.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"' for k, v in pairs)
+    return '{' + ','.join(escaped) + '}'
+
+
+def render_prometheus() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    with _lock:
+        counters = dict(_counters)
+        histograms = {k: (list(v[0]), v[1], v[2]) for k, v in _histograms.items()}
+
+    lines = []
+    names = sorted({name for name, _ in counters} | {name for name, _ in histograms})
+    for name in names:
+        default_kind = 'histogram' if any(metric == name for metric, _ in histograms) else 'counter'
+        kind, help_text = METRIC_HELP.get(name, (default_kind, name))
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for (metric, labels), value in sorted(counters.items()):
+            if metric == name:
+                lines.append(f"{name}{_format_labels(labels)} {value:g}")
+        for (metric, labels), (buckets, total, count) in sorted(histograms.items()):
+            if metric != name:
+                continue
+            for bound, bucket_count in zip(DEFAULT_BUCKETS, buckets):
+                lines.append(f"{name}_bucket{_format_labels(labels, (('le', f'{bound:g}'),))} {bucket_count}")
+            lines.append(f"{name}_bucket{_format_labels(labels, (('le', '+Inf'),))} {count}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {total:.6f}")
+            lines.append(f"{name}_count{_format_labels(labels)} {count}")
+    return '\n'.join(lines) + '\n'
+
+
+def write_prometheus(path: str | Path) -> Path:
+    """Write the metrics for node_exporter's textfile collector, atomically."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_text(render_prometheus())
+    os.replace(tmp_path, path)
+    return path
+
+
+def serve_metrics(port: int, host: str = '0.0.0.0') -> ThreadingHTTPServer:
+    """Serve /metrics from a background thread for the lifetime of the process."""
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = render_prometheus().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
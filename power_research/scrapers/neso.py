@@ -0,0 +1,167 @@
+import pandas as pd
+import pyarrow.parquet as pq
+import requests
+import urllib3
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from io import BytesIO
+from pathlib import Path
+from typing import Optional
+from metrics import http_get, inc
+
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+DEMAND_DATASET_ID = '8f2fe0af-871c-488d-8bad-960426f24601'
+
+DEMAND_RESOURCES = {
+    2009: 'ed8a37cb-65ac-4581-8dbc-a3130780da3a',
+    2010: 'b3eae4a5-8c3c-4df1-b9de-7db243ac3a09',
+    2011: '01522076-2691-4140-bfb8-c62284752efd',
+    2012: '4bf713a2-ea0c-44d3-a09a-63fc6a634b00',
+    2013: '2ff7aaff-8b42-4c1b-b234-9446573a1e27',
+    2014: 'b9005225-49d3-40d1-921c-03ee2d83a2ff',
+    2015: 'cc505e45-65ae-4819-9b90-1fbb06880293',
+    2016: '3bb75a28-ab44-4a0b-9b1c-9be9715d3c44',
+    2017: '2f0f75b8-39c5-46ff-a914-ae38088ed022',
+    2018: 'fcb12133-0db0-4f27-a4a5-1669fd9f6d33',
+    2019: 'dd9de980-d724-415a-b344-d8ae11321432',
+    2020: '33ba6857-2a55-479f-9308-e5c4c53d4381',
+    2021: '18c69c42-f20d-46f0-84e9-e279045befc6',
+    2022: 'bb44a1b5-75b1-4db2-8491-257f23385006',
+    2023: 'bf5ab335-9b40-4ea4-b93a-ab4af7bce003',
+    2024: 'f6d02c0f-957b-48cb-82ee-09003f2ba759',
+    2025: 'b2bde559-3455-4021-b179-dfe60c0337b0',
+}
+
+
+def demand_resource_url(year: int, resource_id: str) -> str:
+    return (f"https://api.neso.energy/dataset/{DEMAND_DATASET_ID}"
+            f"/resource/{resource_id}/download/demanddata_{year}.csv")
+
+
+def discover_demand_resources() -> dict[int, str]:
+    """Year -> download URL for the NESO historic demand dataset.
+
+    Resources published after the static table (e.g. the current year) are picked up
+    from the CKAN package listing; the static table is used if the listing fails.
+    """
+    urls = {year: demand_resource_url(year, resource_id) for year, resource_id in DEMAND_RESOURCES.items()}
+    try:
+        response = http_get(
+            'neso', 'https://api.neso.energy/api/3/action/package_show',
+            params={'id': DEMAND_DATASET_ID},
+            verify=False,
+            timeout=30
+        )
+    except requests.RequestException as e:
+        print(f"NESO resource listing failed, using known resources: {e}")
+        return urls
+    if response.status_code == 200 and response.text.strip():
+        for resource in response.json().get('result', {}).get('resources', []):
+            match = re.search(r'demanddata_(\d{4})\.csv$', resource.get('url', ''))
+            if match:
+                urls[int(match.group(1))] = resource['url']
+    return urls
+
+
+def parse_demand_csv(content: bytes) -> pd.DataFrame:
+    """Parse one year of NESO demand data into typed columns.
+
+    SETTLEMENT_DATE is written as 01-JAN-2009 in early years and 2025-01-01 later,
+    so it is parsed once here rather than on every load.
+    """
+    df = pd.read_csv(BytesIO(content))
+    df['SETTLEMENT_DATE'] = pd.to_datetime(df['SETTLEMENT_DATE'], format='mixed')
+    df['SETTLEMENT_PERIOD'] = df['SETTLEMENT_PERIOD'].astype('int8')
+    value_columns = [c for c in df.columns if c not in ('SETTLEMENT_DATE', 'SETTLEMENT_PERIOD')]
+    df[value_columns] = df[value_columns].apply(pd.to_numeric, errors='coerce').astype('float32')
+    return df
+
+
+def get_neso_demand(year: int, url: str) -> Optional[pd.DataFrame]:
+    response = http_get('neso', url, verify=False, timeout=120)
+    if response.status_code == 200 and response.content.strip():
+        return parse_demand_csv(response.content)
+    return None
+
+
+def save_neso_demand_history(start_year: int = 2009,
+                             data_dir: str = "power_research/data/neso/demand",
+                             max_workers: int = 8,
+                             refresh_current_year: bool = True) -> int:
+    """
+    Download NESO historic demand data into one Parquet file per year.
+
+    Closed years are only fetched when their file is missing; the current year is
+    re-downloaded on every run because NESO keeps appending to it.
+
+    Args:
+        start_year: First year to download (default: 2009)
+        data_dir: Directory to save the yearly Parquet files
+        max_workers: Number of years downloaded concurrently
+        refresh_current_year: Re-download the current year even if it exists
+
+    Returns:
+        Number of years written
+    """
+    base_path = Path(data_dir)
+    base_path.mkdir(parents=True, exist_ok=True)
+    current_year = datetime.now().year
+
+    urls = discover_demand_resources()
+    pending = {}
+    for year, url in sorted(urls.items()):
+        if year < start_year:
+            continue
+        year_file = base_path / f"demanddata_{year}.parquet"
+        if year_file.exists() and not (refresh_current_year and year == current_year):
+            print(f"Skipping {year} - already exists")
+            continue
+        pending[year] = url
+
+    def fetch(year: int) -> tuple[int, Optional[pd.DataFrame]]:
+        try:
+            return year, get_neso_demand(year, pending[year])
+        except requests.RequestException as e:
+            print(f"  ✗ {year}: {e}")
+            return year, None
+
+    success_count = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for year, df in executor.map(fetch, pending):
+            if df is not None and not df.empty:
+                df.to_parquet(base_path / f"demanddata_{year}.parquet", index=False, compression='zstd')
+                inc('power_research_rows_total', len(df), source='neso', dataset='demand')
+                print(f"  ✓ Saved NESO demand {year}: {len(df)} rows")
+                success_count += 1
+            else:
+                print(f"  ✗ No NESO demand data for {year}")
+
+    print(f"Completed: {success_count} years processed")
+    return success_count
+
+
+def load_neso_demand(start_year: Optional[int] = None, end_year: Optional[int] = None,
+                     columns: Optional[list[str]] = None,
+                     data_dir: str = "power_research/data/neso/demand") -> Optional[pd.DataFrame]:
+    """Load saved NESO demand years as one frame, reading only the requested columns."""
+    files = []
+    for path in sorted(Path(data_dir).glob("demanddata_*.parquet")):
+        year = int(path.stem.split('_')[1])
+        if (start_year is None or year >= start_year) and (end_year is None or year <= end_year):
+            files.append(path)
+    if not files:
+        return None
+    if columns is not None:
+        columns = list(dict.fromkeys(['SETTLEMENT_DATE', 'SETTLEMENT_PERIOD', *columns]))
+    frames = []
+    for path in files:
+        # Interconnector columns only exist from the year each link opened
+        year_columns = None if columns is None else [c for c in columns if c in pq.read_schema(path).names]
+        frames.append(pd.read_parquet(path, columns=year_columns))
+    return pd.concat(frames, ignore_index=True)
+
+
+if __name__ == "__main__":
+    save_neso_demand_history()
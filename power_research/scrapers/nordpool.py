@@ -1,19 +1,22 @@
 import pandas as pd
 import re
 import os
-import pickle
 from datetime import datetime, timedelta
-from typing import Optional
-from pathlib import Path
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from typing import TYPE_CHECKING, Optional
+from storage import LocalStorage, write_csv
+from cache import CACHE_DIR, cache_path, load_cache, save_cache
+from metrics import inc, timed
 
+# Selenium is imported inside the scraping functions so that reading archives or
+# importing this module from a cron job does not pay for loading the browser driver.
+if TYPE_CHECKING:
+    from selenium import webdriver
+
+
+def setup_driver() -> 'webdriver.Chrome':
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
 
-def setup_driver() -> webdriver.Chrome:
     options = Options()
     options.add_argument('--headless')
     options.add_argument('--no-sandbox')
@@ -102,13 +105,12 @@ def scrape_nordpool(delivery_date: Optional[str] = None, currency: str = 'GBP',
     if delivery_date is None:
         delivery_date = datetime.now().strftime('%Y-%m-%d')
 
-    cache_dir = 'cache'
-    os.makedirs(cache_dir, exist_ok=True)
-    cache_file = f'{cache_dir}/nordpool_prices_{delivery_date}_{currency}_{area}.pkl'
+    cache_file = cache_path(CACHE_DIR, f'nordpool_prices_{delivery_date}_{currency}_{area}')
 
-    if os.path.exists(cache_file):
+    cached_df = load_cache(cache_file)
+    if cached_df is not None:
         print(f"Loading prices from cache: {delivery_date}")
-        return pickle.load(open(cache_file, 'rb'))
+        return cached_df
 
     request_date = datetime.strptime(delivery_date, '%Y-%m-%d')
     today = datetime.now()
@@ -120,17 +122,24 @@ def scrape_nordpool(delivery_date: Optional[str] = None, currency: str = 'GBP',
         print(f"Error: Date {delivery_date} too old - Nord Pool only keeps ~2 months of data")
         return None
 
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+
     print(f"Fetching fresh data for {delivery_date}")
     url = f"https://data.nordpoolgroup.com/auction/n2ex/prices?deliveryDate={delivery_date}&currency={currency}&aggregation=DeliveryPeriod&deliveryAreas={area}"
-    driver = setup_driver()
-    driver.get(url)
+    with timed('power_research_selenium_duration_seconds', source='nordpool', stage='driver_start'):
+        driver = setup_driver()
+    with timed('power_research_selenium_duration_seconds', source='nordpool', stage='page_load'):
+        driver.get(url)
     wait = WebDriverWait(driver, 10)
     try:
         def data_grid_loaded(driver):
             body_text = driver.find_element(By.TAG_NAME, "body").text
             return ("00:00 - 01:00" in body_text and "23:00 - 00:00" in body_text and
                     "Data grid with 24 rows" in body_text)
-        wait.until(data_grid_loaded)
+        with timed('power_research_selenium_duration_seconds', source='nordpool', stage='wait'):
+            wait.until(data_grid_loaded)
     except TimeoutException:
         print("Warning: Data grid did not load within timeout, proceeding anyway")
     page_text = driver.find_element(By.TAG_NAME, "body").text
@@ -145,7 +154,7 @@ def scrape_nordpool(delivery_date: Optional[str] = None, currency: str = 'GBP',
         print(f"Data should contain 24 hours from 23:00-00:00 through 22:00-23:00")
         return None
 
-    pickle.dump(df, open(cache_file, 'wb'))
+    save_cache(df, cache_file)
     print(f"Cached prices: {cache_file}")
     return df
 
@@ -154,13 +163,12 @@ def scrape_nordpool_volumes(delivery_date: Optional[str] = None, area: str = 'UK
     if delivery_date is None:
         delivery_date = datetime.now().strftime('%Y-%m-%d')
 
-    cache_dir = 'cache'
-    os.makedirs(cache_dir, exist_ok=True)
-    cache_file = f'{cache_dir}/nordpool_volumes_{delivery_date}_{area}.pkl'
+    cache_file = cache_path(CACHE_DIR, f'nordpool_volumes_{delivery_date}_{area}')
 
-    if os.path.exists(cache_file):
+    cached_df = load_cache(cache_file)
+    if cached_df is not None:
         print(f"Loading volumes from cache: {delivery_date}")
-        return pickle.load(open(cache_file, 'rb'))
+        return cached_df
 
     request_date = datetime.strptime(delivery_date, '%Y-%m-%d')
     today = datetime.now()
@@ -172,17 +180,24 @@ def scrape_nordpool_volumes(delivery_date: Optional[str] = None, area: str = 'UK
         print(f"Error: Date {delivery_date} too old - Nord Pool only keeps ~2 months of data")
         return None
 
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+
     print(f"Fetching volume data for {delivery_date}")
     url = f"https://data.nordpoolgroup.com/auction/n2ex/volumes?deliveryDate={delivery_date}&deliveryAreas={area}"
-    driver = setup_driver()
-    driver.get(url)
+    with timed('power_research_selenium_duration_seconds', source='nordpool', stage='driver_start'):
+        driver = setup_driver()
+    with timed('power_research_selenium_duration_seconds', source='nordpool', stage='page_load'):
+        driver.get(url)
     wait = WebDriverWait(driver, 10)
     try:
         def data_grid_loaded(driver):
             body_text = driver.find_element(By.TAG_NAME, "body").text
             return ("00:00 - 01:00" in body_text and "23:00 - 00:00" in body_text and
                     "Data grid with 24 rows" in body_text)
-        wait.until(data_grid_loaded)
+        with timed('power_research_selenium_duration_seconds', source='nordpool', stage='wait'):
+            wait.until(data_grid_loaded)
     except TimeoutException:
         print("Warning: Data grid did not load within timeout, proceeding anyway")
     page_text = driver.find_element(By.TAG_NAME, "body").text
@@ -197,7 +212,7 @@ def scrape_nordpool_volumes(delivery_date: Optional[str] = None, area: str = 'UK
         print(f"Data should contain 24 hours from 23:00-00:00 through 22:00-23:00")
         return None
 
-    pickle.dump(df, open(cache_file, 'wb'))
+    save_cache(df, cache_file)
     print(f"Cached volumes: {cache_file}")
     return df
 
@@ -209,12 +224,39 @@ def save_data(df: pd.DataFrame, delivery_date: str) -> str:
     return filename
 
 
-def save_nordpool_history(days_back: int = 90, data_dir: str = "power_research/data/nordpool") -> int:
-    base_path = Path(data_dir)
-    prices_dir = base_path / "prices"
-    volumes_dir = base_path / "volumes"
-    prices_dir.mkdir(parents=True, exist_ok=True)
-    volumes_dir.mkdir(parents=True, exist_ok=True)
+def save_nordpool_day(date_str: str, storage) -> bool:
+    """Scrape and store whichever of a day's prices and volumes are missing. True once volumes are saved."""
+    prices_key = f"prices/{date_str}_prices.csv"
+    volumes_key = f"volumes/{date_str}_volumes.csv"
+    prices_exist = storage.exists(prices_key)
+    volumes_exist = storage.exists(volumes_key)
+
+    if prices_exist and volumes_exist:
+        print(f"Skipping {date_str}")
+        return False
+
+    print(f"Processing {date_str}")
+
+    if not prices_exist:
+        prices_df = scrape_nordpool(date_str)
+        if prices_df is not None and len(prices_df) == 24:
+            write_csv(storage, prices_key, prices_df)
+            inc('power_research_rows_total', len(prices_df), source='nordpool', dataset='prices')
+            print(f"Saved prices for {date_str}")
+
+    if not volumes_exist:
+        volumes_df = scrape_nordpool_volumes(date_str)
+        if volumes_df is not None and len(volumes_df) == 24:
+            write_csv(storage, volumes_key, volumes_df)
+            inc('power_research_rows_total', len(volumes_df), source='nordpool', dataset='volumes')
+            print(f"Saved volumes for {date_str}")
+            return True
+    return False
+
+
+def save_nordpool_history(days_back: int = 90, data_dir: str = "power_research/data/nordpool",
+                          storage=None) -> int:
+    storage = storage or LocalStorage(data_dir)
 
     end_date = datetime.now()
     start_date = end_date - timedelta(days=days_back)
@@ -224,30 +266,8 @@ def save_nordpool_history(days_back: int = 90, data_dir: str = "power_research/d
     print(f"Saving Nord Pool data from {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
 
     while current_date <= end_date:
-        date_str = current_date.strftime('%Y-%m-%d')
-        prices_file = prices_dir / f"{date_str}_prices.csv"
-        volumes_file = volumes_dir / f"{date_str}_volumes.csv"
-
-        if prices_file.exists() and volumes_file.exists():
-            print(f"Skipping {date_str}")
-            current_date += timedelta(days=1)
-            continue
-
-        print(f"Processing {date_str}")
-
-        if not prices_file.exists():
-            prices_df = scrape_nordpool(date_str)
-            if prices_df is not None and len(prices_df) == 24:
-                prices_df.to_csv(prices_file, index=False)
-                print(f"Saved prices for {date_str}")
-
-        if not volumes_file.exists():
-            volumes_df = scrape_nordpool_volumes(date_str)
-            if volumes_df is not None and len(volumes_df) == 24:
-                volumes_df.to_csv(volumes_file, index=False)
-                print(f"Saved volumes for {date_str}")
-                success_count += 1
-
+        if save_nordpool_day(current_date.strftime('%Y-%m-%d'), storage):
+            success_count += 1
         current_date += timedelta(days=1)
 
     print(f"Completed: {success_count} days processed")
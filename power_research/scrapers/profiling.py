@@ -0,0 +1,213 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+PROFILE_ENV = 'POWER_RESEARCH_PROFILE'
+PROFILE_DIR_ENV = 'POWER_RESEARCH_PROFILE_DIR'
+PROFILE_MODES = ('timers', 'cprofile', 'pyinstrument')
+DEFAULT_PROFILE_DIR = 'power_research/profiles'
+
+_lock = threading.Lock()
+_local = threading.local()
+_active = False
+_stages: dict[str, list] = {}
+
+
+@contextmanager
+def stage(name: str):
+    """Time a pipeline stage while a profile run is active. Nested stages are reported as parent/child."""
+    if not _active:
+        yield
+        return
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    stack.append(name)
+    path = '/'.join(stack)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        stack.pop()
+        with _lock:
+            totals = _stages.setdefault(path, [0, 0.0])
+            totals[0] += 1
+            totals[1] += elapsed
+
+
+def carry_stages(fn):
+    """
+    Wrap fn to run under the calling thread's open stages, for work handed to a thread pool.
+
+    The stage stack is per thread, so without this a worker's stages would be reported as top
+    level stages. Stages opened by fn nest under the stage that submitted it.
+    """
+    if not _active:
+        return fn
+    parent = list(getattr(_local, 'stack', None) or [])
+
+    def run(*args, **kwargs):
+        saved = getattr(_local, 'stack', None)
+        _local.stack = list(parent)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _local.stack = saved
+    return run
+
+
+def stage_breakdown() -> list[dict]:
+    """
+    Per-stage calls, total seconds and seconds excluding child stages, slowest first.
+
+    Child seconds are summed over threads, so concurrent children can add up to more than their
+    parent's wall time. Its self_seconds is then 0.
+    """
+    with _lock:
+        stages = {path: tuple(v) for path, v in _stages.items()}
+    rows = []
+    for path, (calls, seconds) in stages.items():
+        children = sum(s for p, (_, s) in stages.items() if p.startswith(path + '/') and p.count('/') == path.count('/') + 1)
+        rows.append({'stage': path, 'calls': calls, 'seconds': round(seconds, 6), 'self_seconds': round(max(seconds - children, 0.0), 6)})
+    return sorted(rows, key=lambda r: r['seconds'], reverse=True)
+
+
+class StackSampler:
+    """Samples every thread's Python stack on a timer and counts folded stacks for a flamegraph."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                frames = []
+                while frame is not None:
+                    code = frame.f_code
+                    frames.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                self.samples[';'.join(reversed(frames))] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def write_folded(self, path: Path) -> None:
+        """Brendan Gregg's folded format, readable by flamegraph.pl and speedscope."""
+        lines = [f"{stack} {count}" for stack, count in self.samples.most_common()]
+        path.write_text('\n'.join(lines) + '\n')
+
+
+def profile_mode(mode: Optional[str] = None) -> Optional[str]:
+    """The requested mode, falling back to POWER_RESEARCH_PROFILE (1 or true mean timers)."""
+    mode = mode or os.environ.get(PROFILE_ENV, '').strip().lower()
+    if mode in ('', '0', 'false', 'off'):
+        return None
+    if mode in ('1', 'true', 'on'):
+        return 'timers'
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode {mode!r}, expected one of {PROFILE_MODES}")
+    return mode
+
+
+@contextmanager
+def profile_run(name: str, mode: Optional[str] = None, output_dir: Optional[str] = None):
+    """
+    Profile a pipeline run when a mode is given or POWER_RESEARCH_PROFILE is set; otherwise do nothing.
+
+    Every run writes stages.json and stages.txt. cprofile adds profile.pstats, a cumulative-time
+    report and flamegraph.folded from a stack sampler; pyinstrument adds flamegraph.html and a
+    speedscope.json profile.
+
+    Args:
+        name: Run name used in the output directory
+        mode: 'timers', 'cprofile' or 'pyinstrument' (default: from POWER_RESEARCH_PROFILE)
+        output_dir: Parent directory for runs (default: POWER_RESEARCH_PROFILE_DIR or power_research/profiles)
+
+    Yields:
+        The run's output directory, or None when profiling is off
+    """
+    global _active
+    mode = profile_mode(mode)
+    if mode is None:
+        yield None
+        return
+
+    run_dir = Path(output_dir or os.environ.get(PROFILE_DIR_ENV, DEFAULT_PROFILE_DIR)) / f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    run_dir.mkdir(parents=True, exist_ok=True)
+
+    profiler = sampler = None
+    if mode == 'pyinstrument':
+        try:
+            from pyinstrument import Profiler
+            profiler = Profiler(async_mode='disabled')
+        except ImportError:
+            print("pyinstrument is not installed, falling back to cProfile")
+            mode = 'cprofile'
+    if mode == 'cprofile':
+        import cProfile
+        profiler = cProfile.Profile()
+        sampler = StackSampler()
+        sampler.start()
+
+    with _lock:
+        _stages.clear()
+    _active = True
+    started = time.perf_counter()
+    if mode == 'cprofile':
+        profiler.enable()
+    elif mode == 'pyinstrument':
+        profiler.start()
+    try:
+        yield run_dir
+    finally:
+        if mode == 'cprofile':
+            profiler.disable()
+        elif mode == 'pyinstrument':
+            profiler.stop()
+        if sampler is not None:
+            sampler.stop()
+        _active = False
+        write_run(run_dir, name, mode, time.perf_counter() - started, profiler, sampler)
+
+
+def write_run(run_dir: Path, name: str, mode: str, wall_seconds: float, profiler, sampler: Optional[StackSampler]) -> None:
+    breakdown = stage_breakdown()
+    (run_dir / 'stages.json').write_text(json.dumps(
+        {'run': name, 'mode': mode, 'wall_seconds': round(wall_seconds, 6), 'stages': breakdown}, indent=2
+    ))
+    lines = [f"{name}: {wall_seconds:.3f}s wall ({mode})", f"{'stage':<50} {'calls':>7} {'seconds':>10} {'self':>10}"]
+    lines += [f"{r['stage']:<50} {r['calls']:>7} {r['seconds']:>10.3f} {r['self_seconds']:>10.3f}" for r in breakdown]
+    (run_dir / 'stages.txt').write_text('\n'.join(lines) + '\n')
+
+    if mode == 'cprofile':
+        import io
+        import pstats
+        profiler.dump_stats(run_dir / 'profile.pstats')
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats('cumulative').print_stats(40)
+        (run_dir / 'profile.txt').write_text(report.getvalue())
+        sampler.write_folded(run_dir / 'flamegraph.folded')
+    elif mode == 'pyinstrument':
+        from pyinstrument.renderers import SpeedscopeRenderer
+        (run_dir / 'flamegraph.html').write_text(profiler.output_html())
+        (run_dir / 'speedscope.json').write_text(profiler.output(SpeedscopeRenderer()))
+
+    print(f"Profile written to {run_dir}")
@@ -0,0 +1,205 @@
+import hashlib
+import json
+import os
+import shutil
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from typing import Optional
+
+SYNC_MANIFEST = '_manifest.json'
+COVERAGE_INDEX = '_coverage.parquet'
+INTERNAL_KEYS = (SYNC_MANIFEST, COVERAGE_INDEX)
+
+
+class LocalStorage:
+    """Archive storage on the local filesystem, keys are paths relative to root."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def __repr__(self) -> str:
+        return f"LocalStorage({str(self.root)!r})"
+
+    def path(self, key: str) -> Path:
+        return self.root / key
+
+    def exists(self, key: str) -> bool:
+        return self.path(key).exists()
+
+    def read_bytes(self, key: str) -> bytes:
+        return self.path(key).read_bytes()
+
+    def write_bytes(self, key: str, data: bytes) -> None:
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+    def upload_file(self, local_path: str | Path, key: str) -> None:
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(local_path, path)
+
+    def download_file(self, key: str, local_path: str | Path) -> None:
+        Path(local_path).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(self.path(key), local_path)
+
+    def list_keys(self, prefix: str = '') -> list[str]:
+        # Only walk the prefix's directory when the prefix names one
+        base = self.root / prefix if prefix.endswith('/') else self.root
+        if not base.exists():
+            return []
+        keys = (p.relative_to(self.root).as_posix() for p in base.rglob('*') if p.is_file())
+        return sorted(k for k in keys if k.startswith(prefix) and k not in INTERNAL_KEYS)
+
+
+class S3Storage:
+    """Archive storage in an S3-compatible bucket (AWS, MinIO or a moto server).
+
+    Large objects are sent as parallel multipart uploads once they pass
+    multipart_threshold bytes.
+    """
+
+    def __init__(self, bucket: str, prefix: str = '',
+                 endpoint_url: Optional[str] = None,
+                 client=None,
+                 multipart_threshold: int = 8 * 1024 * 1024,
+                 max_concurrency: int = 8):
+        import boto3
+        from boto3.s3.transfer import TransferConfig
+
+        self.bucket = bucket
+        self.prefix = prefix.strip('/')
+        self.client = client or boto3.client('s3', endpoint_url=endpoint_url or os.environ.get('AWS_ENDPOINT_URL'))
+        self.transfer_config = TransferConfig(
+            multipart_threshold=multipart_threshold,
+            multipart_chunksize=multipart_threshold,
+            max_concurrency=max_concurrency
+        )
+
+    def __repr__(self) -> str:
+        return f"S3Storage('s3://{self.bucket}/{self.prefix}')"
+
+    def object_key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.object_key(key))
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] in ('404', 'NoSuchKey', 'NotFound'):
+                return False
+            raise
+
+    def read_bytes(self, key: str) -> bytes:
+        response = self.client.get_object(Bucket=self.bucket, Key=self.object_key(key))
+        return response['Body'].read()
+
+    def write_bytes(self, key: str, data: bytes) -> None:
+        self.client.upload_fileobj(BytesIO(data), self.bucket, self.object_key(key), Config=self.transfer_config)
+
+    def upload_file(self, local_path: str | Path, key: str) -> None:
+        self.client.upload_file(str(local_path), self.bucket, self.object_key(key), Config=self.transfer_config)
+
+    def download_file(self, key: str, local_path: str | Path) -> None:
+        Path(local_path).parent.mkdir(parents=True, exist_ok=True)
+        self.client.download_file(self.bucket, self.object_key(key), str(local_path), Config=self.transfer_config)
+
+    def list_keys(self, prefix: str = '') -> list[str]:
+        keys = []
+        paginator = self.client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.object_key(prefix)):
+            for obj in page.get('Contents', []):
+                key = obj['Key'][len(self.prefix) + 1:] if self.prefix else obj['Key']
+                if key not in INTERNAL_KEYS:
+                    keys.append(key)
+        return sorted(keys)
+
+
+def get_storage(location: str | Path) -> LocalStorage | S3Storage:
+    """Storage for a local directory or an s3://bucket/prefix URL.
+
+    S3-compatible stand-ins such as MinIO are selected with AWS_ENDPOINT_URL.
+    """
+    location = str(location)
+    if location.startswith('s3://'):
+        bucket, _, prefix = location[len('s3://'):].partition('/')
+        return S3Storage(bucket, prefix)
+    return LocalStorage(location)
+
+
+def read_csv(storage, key: str, **kwargs) -> pd.DataFrame:
+    if isinstance(storage, LocalStorage):
+        return pd.read_csv(storage.path(key), **kwargs)
+    return pd.read_csv(BytesIO(storage.read_bytes(key)), **kwargs)
+
+
+def write_csv(storage, key: str, df: pd.DataFrame) -> None:
+    storage.write_bytes(key, df.to_csv(index=False).encode())
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.md5(data).hexdigest()
+
+
+def build_manifest(storage, prefix: str = '', max_workers: int = 8) -> dict[str, str]:
+    """Key -> content hash for every object under prefix."""
+    keys = storage.list_keys(prefix)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        hashes = executor.map(lambda key: content_hash(storage.read_bytes(key)), keys)
+        return dict(zip(keys, hashes))
+
+
+def load_sync_manifest(storage) -> dict[str, str]:
+    if storage.exists(SYNC_MANIFEST):
+        return json.loads(storage.read_bytes(SYNC_MANIFEST))
+    return {}
+
+
+def sync_storage(source, target, prefix: str = '', max_workers: int = 8, dry_run: bool = False) -> list[str]:
+    """
+    Copy new and changed objects from source to target.
+
+    The target keeps a manifest of content hashes, so deciding what to move costs one
+    read on the target instead of listing or hashing remote objects.
+
+    Args:
+        source: Storage to copy from, usually the local data directory
+        target: Storage to copy to, e.g. an S3Storage
+        prefix: Only sync keys starting with this prefix
+        max_workers: Objects transferred concurrently
+        dry_run: Report what would move without copying
+
+    Returns:
+        Keys that were (or would be) transferred
+    """
+    local_manifest = build_manifest(source, prefix, max_workers)
+    remote_manifest = load_sync_manifest(target)
+    changed = [key for key, digest in local_manifest.items() if remote_manifest.get(key) != digest]
+
+    print(f"Sync {source} -> {target}: {len(changed)} of {len(local_manifest)} objects changed")
+    if dry_run or not changed:
+        return changed
+
+    def transfer(key: str) -> None:
+        if isinstance(source, LocalStorage):
+            target.upload_file(source.path(key), key)
+        else:
+            target.write_bytes(key, source.read_bytes(key))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(transfer, changed))
+
+    remote_manifest.update({key: local_manifest[key] for key in changed})
+    target.write_bytes(SYNC_MANIFEST, json.dumps(remote_manifest, indent=2, sort_keys=True).encode())
+    return changed
+
+
+if __name__ == "__main__":
+    if os.environ.get('AWS_S3_BUCKET'):
+        sync_storage(LocalStorage("power_research/data"), S3Storage(os.environ['AWS_S3_BUCKET'], 'raw'))
@@ -0,0 +1,36 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from io import StringIO
+
+import pandas as pd
+from arrow_csv import BMRS_CSV_TYPES, read_csv_bytes
+
+
+def fuelhh_csv(rows: int) -> bytes:
+    lines = ['Dataset,PublishTime,StartTime,SettlementDate,SettlementPeriod,FuelType,Generation']
+    for i in range(rows):
+        lines.append(f'FUELHH,2025-10-17T00:05:00Z,2025-10-16T23:00:00Z,2025-10-17,{i % 48 + 1},CCGT,{5000 + i}')
+    return ('\n'.join(lines) + '\n').encode()
+
+
+def test_read_csv_bytes_matches_pandas_with_json_names():
+    """The Arrow path gives the JSON column names, declared types and pandas' values"""
+    data = fuelhh_csv(5000)
+    df = read_csv_bytes(data, BMRS_CSV_TYPES['FUELHH'])
+    expected = pd.read_csv(StringIO(data.decode()))
+
+    assert list(df.columns) == ['dataset', 'publishTime', 'startTime', 'settlementDate', 'settlementPeriod',
+                                'fuelType', 'generation']
+    assert df['settlementPeriod'].dtype == 'int64' and df['generation'].dtype == 'float64'
+    assert df['settlementDate'].iloc[0] == '2025-10-17'
+    assert (df['generation'].to_numpy() == expected['Generation'].to_numpy()).all()
+
+
+def test_read_csv_bytes_infers_undeclared_columns():
+    """Columns without a declared type are inferred and empty bodies give an empty frame"""
+    df = read_csv_bytes(b'\xef\xbb\xbfSettlementPeriod,Demand\r\n1,25000\r\n2,\r\n')
+    assert list(df.columns) == ['settlementPeriod', 'demand']
+    assert df['demand'].isna().tolist() == [False, True]
+    assert read_csv_bytes(b'SettlementPeriod,Demand\n').empty
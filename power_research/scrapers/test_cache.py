@@ -0,0 +1,35 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pickle
+import pandas as pd
+from cache import cache_path, load_cache, save_cache
+
+
+def test_arrow_cache_round_trip(tmp_path):
+    """Cached frames come back equal, with attrs, as read-only memory-mapped columns"""
+    df = pd.DataFrame({'period': ['00:00 - 00:30', '00:30 - 01:00'], 'price': [64.4, 59.27]})
+    df.attrs['baseload_price'] = 67.13
+    path = cache_path(str(tmp_path), 'epexspot_auction_GB-IDA1_2025-12-18_p30')
+
+    assert load_cache(path) is None
+    save_cache(df, path)
+    cached = load_cache(path)
+
+    assert path.suffix == '.arrow'
+    pd.testing.assert_frame_equal(cached, df)
+    assert cached.attrs['baseload_price'] == 67.13
+    assert not cached['price'].to_numpy().flags.writeable
+
+
+def test_legacy_pickle_is_migrated(tmp_path):
+    """Existing pickle cache entries are served once and replaced by Arrow files"""
+    df = pd.DataFrame({'period': ['23:00 - 00:00'], 'price': [78.2]})
+    path = cache_path(str(tmp_path), 'nordpool_prices_2025-10-17_GBP_UK')
+    with open(path.with_suffix('.pkl'), 'wb') as f:
+        pickle.dump(df, f)
+
+    pd.testing.assert_frame_equal(load_cache(path), df)
+    assert path.exists()
+    assert not path.with_suffix('.pkl').exists()
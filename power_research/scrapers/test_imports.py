@@ -0,0 +1,48 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import subprocess
+import pytest
+
+POWER_RESEARCH_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ('selenium', 'matplotlib')
+IMPORT_BUDGET_SECONDS = 0.5
+# Wall-clock timing depends on the machine, so the budget check only runs when asked for
+IMPORT_BUDGET_ENV = 'POWER_RESEARCH_IMPORT_BUDGET'
+
+
+def import_profile(statement: str) -> tuple[dict[str, int], set[str]]:
+    """Cumulative import time in microseconds per top-level module, and every module loaded."""
+    code = f"import sys; {statement}; print(','.join(sorted(sys.modules)))"
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=POWER_RESEARCH_DIR, capture_output=True, text=True, check=True
+    )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        if not cumulative_us.strip().isdigit():
+            continue
+        if not name.startswith('  '):
+            cumulative[name.strip()] = int(cumulative_us)
+    return cumulative, set(result.stdout.strip().split(','))
+
+
+def test_scrapers_do_not_load_heavy_dependencies():
+    """Importing a scraper or the chart data helpers leaves selenium and matplotlib unloaded"""
+    for statement in ('import scrapers.elexon', 'import scrapers.nordpool', 'import scrapers.epexspot',
+                      'import plot_generation_stack'):
+        _, modules = import_profile(statement)
+        loaded = sorted(m for m in modules if m.split('.')[0] in HEAVY_MODULES)
+        assert loaded == [], f"{statement} loaded {loaded[:5]}"
+
+
+@pytest.mark.skipif(not os.environ.get(IMPORT_BUDGET_ENV), reason=f"set {IMPORT_BUDGET_ENV}=1 to time imports")
+def test_scraper_import_time_budget():
+    """The scrapers add little import time on top of pandas and requests"""
+    cumulative, _ = import_profile('import pandas, requests; import scrapers.elexon, scrapers.nordpool, scrapers.epexspot')
+    own_us = sum(us for name, us in cumulative.items() if name not in ('pandas', 'requests'))
+    assert own_us / 1e6 < IMPORT_BUDGET_SECONDS, f"scraper import time {own_us / 1e6:.3f}s"
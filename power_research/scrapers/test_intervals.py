@@ -0,0 +1,48 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+from intervals import interval_join, overlapping_pairs
+
+
+def brute_force_pairs(lg, ls, le, rg, rs, re):
+    return sorted((i, j) for i in range(len(ls)) for j in range(len(rs))
+                  if lg[i] == rg[j] and ls[i] < re[j] and rs[j] < le[i])
+
+
+def test_overlapping_pairs_matches_brute_force():
+    """Sorted sweep finds exactly the overlapping same-group pairs, including long and nested windows"""
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        n, m = rng.integers(0, 40), rng.integers(0, 40)
+        lg, rg = rng.integers(0, 4, n), rng.integers(0, 4, m)
+        ls, rs = rng.integers(0, 200, n), rng.integers(0, 200, m)
+        le, re = ls + rng.integers(1, 60, n), rs + rng.integers(1, 60, m)
+        left_idx, right_idx = overlapping_pairs(lg, ls, le, rg, rs, re)
+        assert sorted(zip(left_idx.tolist(), right_idx.tolist())) == brute_force_pairs(lg, ls, le, rg, rs, re)
+
+
+def test_interval_join_acceptance_spanning_periods():
+    """An acceptance crossing a period boundary picks up the pairs of both periods with overlap bounds"""
+    acceptances = pd.DataFrame({
+        'bmUnit': ['T_ROCK-1', 'T_OTHER'],
+        'timeFrom': ['2025-11-21T00:29:00Z', '2025-11-21T00:10:00Z'],
+        'timeTo': ['2025-11-21T00:34:00Z', '2025-11-21T00:20:00Z'],
+        'levelFrom': [776, 10],
+    })
+    bid_offers = pd.DataFrame({
+        'bmUnit': ['T_ROCK-1', 'T_ROCK-1', 'T_ROCK-1', 'T_OTHER'],
+        'settlementPeriod': [1, 2, 3, 2],
+        'timeFrom': ['2025-11-21T00:00:00Z', '2025-11-21T00:30:00Z', '2025-11-21T01:00:00Z', '2025-11-21T00:30:00Z'],
+        'timeTo': ['2025-11-21T00:30:00Z', '2025-11-21T01:00:00Z', '2025-11-21T01:30:00Z', '2025-11-21T01:00:00Z'],
+        'offer': [90.0, 95.0, 99.0, 50.0],
+    })
+    joined = interval_join(acceptances, bid_offers, by='bmUnit', suffixes=('_acceptance', '_bid_offer'))
+
+    assert joined['settlementPeriod'].tolist() == [1, 2]
+    assert joined['offer'].tolist() == [90.0, 95.0]
+    assert joined['timeFrom_acceptance'].tolist() == ['2025-11-21T00:29:00Z'] * 2
+    minutes = (joined['overlapEnd'] - joined['overlapStart']).dt.total_seconds() / 60
+    assert minutes.tolist() == [1.0, 4.0]
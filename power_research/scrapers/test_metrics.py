@@ -0,0 +1,91 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import gzip
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import metrics
+from cache import ValidatorStore, cache_path, load_cache, save_cache
+
+
+def test_prometheus_text_export(tmp_path):
+    """Counters and histograms render in the Prometheus text format"""
+    metrics.reset()
+    metrics.inc('power_research_rows_total', 48, source='elexon', dataset='demand_outturn')
+    metrics.observe('power_research_http_request_duration_seconds', 0.3, source='elexon', endpoint='datasets/FUELHH')
+    metrics.observe('power_research_http_request_duration_seconds', 7.0, source='elexon', endpoint='datasets/FUELHH')
+
+    text = metrics.write_prometheus(tmp_path / 'power_research.prom').read_text()
+
+    assert '# TYPE power_research_rows_total counter' in text
+    assert 'power_research_rows_total{dataset="demand_outturn",source="elexon"} 48' in text
+    labels = 'endpoint="datasets/FUELHH",source="elexon"'
+    assert f'power_research_http_request_duration_seconds_bucket{{{labels},le="0.5"}} 1' in text
+    assert f'power_research_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f'power_research_http_request_duration_seconds_count{{{labels}}} 2' in text
+
+
+def test_cache_hits_and_misses_are_counted(tmp_path):
+    """Cache lookups are counted per cache name, without the dates"""
+    metrics.reset()
+    path = cache_path(str(tmp_path), 'nordpool_prices_2025-10-17_GBP_UK')
+    load_cache(path)
+    save_cache(pd.DataFrame({'price': [75.98]}), path)
+    load_cache(path)
+
+    text = metrics.render_prometheus()
+    assert 'power_research_cache_requests_total{cache="nordpool_prices",result="miss"} 1' in text
+    assert 'power_research_cache_requests_total{cache="nordpool_prices",result="hit"} 1' in text
+
+
+def test_endpoint_label():
+    assert metrics.endpoint_label('https://data.elexon.co.uk/bmrs/api/v1/balancing/acceptances/all') == 'balancing/acceptances/all'
+
+
+def test_conditional_requests_answer_304_from_the_validator_store(tmp_path):
+    """A revalidated unchanged resource comes back as the stored body after a 304 with no payload"""
+    body = b'settlementPeriod,demand\n' + b'1,25000\n' * 2000
+    seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            seen.append(dict(self.headers))
+            if self.headers.get('If-None-Match') == '"v1"':
+                self.send_response(304)
+                self.send_header('ETag', '"v1"')
+                self.end_headers()
+                return
+            payload = gzip.compress(body)
+            self.send_response(200)
+            self.send_header('ETag', '"v1"')
+            self.send_header('Content-Type', 'text/csv')
+            self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/bmrs/api/v1/datasets/INDO"
+    store = ValidatorStore(tmp_path)
+    metrics.reset()
+    try:
+        first = metrics.http_get('elexon', url, validators=store, params={'format': 'csv'}, headers={'accept': 'text/plain'})
+        second = metrics.http_get('elexon', url, validators=store, params={'format': 'csv'})
+    finally:
+        server.shutdown()
+
+    assert 'gzip' in seen[0]['Accept-Encoding'] and seen[0]['accept'] == 'text/plain'
+    assert 'If-None-Match' not in seen[0] and seen[1]['If-None-Match'] == '"v1"'
+    assert first.content == second.content == body
+    assert second.status_code == 200 and second.text.startswith('settlementPeriod')
+    text = metrics.render_prometheus()
+    assert 'power_research_http_requests_total{endpoint="datasets/INDO",source="elexon",status="304"} 1' in text
+    # The gzip payload once, nothing for the 304, not the decompressed body
+    assert f'power_research_http_response_bytes_total{{endpoint="datasets/INDO",source="elexon"}} {len(gzip.compress(body))}' in text
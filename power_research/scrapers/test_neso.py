@@ -0,0 +1,34 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+from neso import parse_demand_csv, load_neso_demand
+
+
+def test_parse_demand_csv_mixed_date_formats():
+    """Early years use 01-JAN-2009 dates, later years ISO dates"""
+    old = parse_demand_csv(b"SETTLEMENT_DATE,SETTLEMENT_PERIOD,ND,TSD\n01-JAN-2009,1,37910,38704\n")
+    new = parse_demand_csv(b"SETTLEMENT_DATE,SETTLEMENT_PERIOD,ND,TSD\n2025-01-02,48,24000,26000\n")
+
+    assert old['SETTLEMENT_DATE'].iloc[0] == pd.Timestamp('2009-01-01')
+    assert new['SETTLEMENT_DATE'].iloc[0] == pd.Timestamp('2025-01-02')
+    assert old['SETTLEMENT_PERIOD'].dtype == 'int8'
+    assert old['ND'].dtype == 'float32'
+
+
+def test_load_neso_demand_year_partitions(tmp_path):
+    """Years are filtered by file name and missing columns are tolerated"""
+    parse_demand_csv(b"SETTLEMENT_DATE,SETTLEMENT_PERIOD,ND\n01-JAN-2009,1,37910\n").to_parquet(
+        tmp_path / 'demanddata_2009.parquet', index=False)
+    parse_demand_csv(b"SETTLEMENT_DATE,SETTLEMENT_PERIOD,ND,VIKING_FLOW\n2024-01-01,1,24000,-500\n").to_parquet(
+        tmp_path / 'demanddata_2024.parquet', index=False)
+
+    df = load_neso_demand(columns=['ND', 'VIKING_FLOW'], data_dir=str(tmp_path))
+    assert len(df) == 2
+    assert df['VIKING_FLOW'].isna().iloc[0]
+
+    recent = load_neso_demand(start_year=2020, data_dir=str(tmp_path))
+    assert recent['SETTLEMENT_DATE'].dt.year.tolist() == [2024]
+
+    assert load_neso_demand(start_year=2030, data_dir=str(tmp_path)) is None
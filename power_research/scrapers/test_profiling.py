@@ -0,0 +1,71 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from profiling import carry_stages, profile_run, stage, stage_breakdown
+
+
+def pipeline():
+    with stage('fetch'):
+        with stage('http'):
+            time.sleep(0.02)
+        with stage('json_decode'):
+            time.sleep(0.01)
+    with stage('merge'):
+        time.sleep(0.01)
+
+
+def test_profiling_is_off_by_default(tmp_path, monkeypatch):
+    """Without a mode or POWER_RESEARCH_PROFILE nothing is recorded or written"""
+    monkeypatch.delenv('POWER_RESEARCH_PROFILE', raising=False)
+    with profile_run('pipeline', output_dir=str(tmp_path)) as run_dir:
+        pipeline()
+    assert run_dir is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_stage_breakdown_from_environment(tmp_path, monkeypatch):
+    """POWER_RESEARCH_PROFILE=1 records nested stage timings"""
+    monkeypatch.setenv('POWER_RESEARCH_PROFILE', '1')
+    with profile_run('pipeline', output_dir=str(tmp_path)) as run_dir:
+        pipeline()
+
+    report = json.loads((run_dir / 'stages.json').read_text())
+    stages = {row['stage']: row for row in report['stages']}
+    assert report['mode'] == 'timers'
+    assert set(stages) == {'fetch', 'fetch/http', 'fetch/json_decode', 'merge'}
+    assert stages['fetch']['seconds'] >= stages['fetch/http']['seconds'] + stages['fetch/json_decode']['seconds']
+    assert stages['fetch']['self_seconds'] < stages['fetch/http']['seconds']
+
+
+def test_thread_pool_stages_nest_under_their_parent(tmp_path, monkeypatch):
+    """Stages run in pool workers are reported under the stage that submitted them"""
+    monkeypatch.setenv('POWER_RESEARCH_PROFILE', '1')
+
+    def request(_):
+        with stage('http'):
+            time.sleep(0.01)
+
+    with profile_run('pipeline', output_dir=str(tmp_path)) as run_dir:
+        with stage('acceptances'):
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(carry_stages(request), range(8)))
+
+    stages = {row['stage']: row for row in json.loads((run_dir / 'stages.json').read_text())['stages']}
+    assert set(stages) == {'acceptances', 'acceptances/http'}
+    assert stages['acceptances/http']['calls'] == 8
+
+
+def test_cprofile_mode_writes_flamegraph(tmp_path):
+    """cprofile runs also leave a pstats file and folded stacks for a flamegraph"""
+    with profile_run('pipeline', mode='cprofile', output_dir=str(tmp_path)) as run_dir:
+        pipeline()
+
+    assert (run_dir / 'profile.pstats').exists()
+    assert 'pipeline' in (run_dir / 'profile.txt').read_text()
+    folded = (run_dir / 'flamegraph.folded').read_text().splitlines()
+    assert any('pipeline (test_profiling.py' in line for line in folded)
+    assert stage_breakdown()
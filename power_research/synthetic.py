@@ -0,0 +1,474 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent))
+
+import numpy as np
+import pandas as pd
+
+from archive import archive_key
+from panel import LONDON_TZ, HALF_HOUR, HOUR, local_midnight_utc
+from scrapers.storage import LocalStorage, write_csv
+
+# Synthetic stand-ins for the frames the scrapers return, for offline load testing.
+# Every generator takes a seed and draws each day from its own stream, so a date range
+# produces the same rows as generating its days one at a time.
+
+# fuelType -> (share of BMUs, mean capacity MW, typical bid £/MWh, typical offer £/MWh)
+BMU_FUELS = {
+    'CCGT': (0.12, 450.0, 45.0, 110.0),
+    'OCGT': (0.04, 60.0, 40.0, 180.0),
+    'WIND': (0.30, 150.0, -40.0, 90.0),
+    'PS': (0.02, 300.0, 30.0, 140.0),
+    'NPSHYD': (0.04, 40.0, 20.0, 95.0),
+    'BIOMASS': (0.03, 400.0, 60.0, 130.0),
+    'NUCLEAR': (0.03, 1100.0, -60.0, 250.0),
+    'OTHER': (0.42, 25.0, 10.0, 150.0),
+}
+# Dispatchable units are accepted far more often than their share of BMUs
+ACCEPTANCE_WEIGHT = {'CCGT': 8.0, 'OCGT': 4.0, 'WIND': 3.0, 'PS': 10.0, 'NPSHYD': 1.0, 'BIOMASS': 3.0, 'NUCLEAR': 0.1, 'OTHER': 0.5}
+
+# FUELHH fuelType -> mean half-hourly output MW
+FUELHH_MEAN = {
+    'BIOMASS': 1800.0, 'CCGT': 9000.0, 'COAL': 0.0, 'NUCLEAR': 4200.0, 'NPSHYD': 350.0, 'OCGT': 20.0,
+    'OIL': 0.0, 'OTHER': 500.0, 'PS': 200.0, 'WIND': 9000.0,
+    'INTELEC': 600.0, 'INTEW': 150.0, 'INTFR': 1200.0, 'INTGRNL': 100.0, 'INTIFA2': 600.0,
+    'INTIRL': 100.0, 'INTNED': 600.0, 'INTNEM': 600.0, 'INTNSL': 1000.0, 'INTVKL': 600.0,
+}
+
+ISO_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+
+def _dates(start_date: str, end_date: str | None) -> list[str]:
+    return [d.strftime('%Y-%m-%d') for d in pd.date_range(start_date, end_date or start_date, freq='D')]
+
+
+def _day_rng(seed: int, date_str: str, stream: str) -> np.random.Generator:
+    """Independent generator per (seed, day, dataset)."""
+    return np.random.default_rng([seed, pd.Timestamp(date_str).toordinal(), sum(map(ord, stream))])
+
+
+def _iso(times: pd.DatetimeIndex) -> np.ndarray:
+    return times.strftime(ISO_FORMAT).to_numpy()
+
+
+def settlement_grid(date_str: str) -> pd.DataFrame:
+    """settlementPeriod and UTC start time for each of the day's 46, 48 or 50 periods."""
+    start = local_midnight_utc(date_str)[0]
+    end = local_midnight_utc(pd.Timestamp(date_str) + pd.Timedelta(days=1))[0]
+    starts = pd.date_range(start, end, freq=HALF_HOUR, inclusive='left')
+    return pd.DataFrame({'settlementPeriod': np.arange(1, len(starts) + 1), 'startTime': starts})
+
+
+def local_period_labels(starts: pd.DatetimeIndex, length: pd.Timedelta) -> np.ndarray:
+    """"HH:MM - HH:MM" labels in London wall time, as shown on the Nord Pool and EPEX pages."""
+    local_start = starts.tz_convert(LONDON_TZ).strftime('%H:%M')
+    local_end = (starts + length).tz_convert(LONDON_TZ).strftime('%H:%M')
+    return (local_start + ' - ' + local_end).to_numpy()
+
+
+def daily_shape(starts: pd.DatetimeIndex) -> np.ndarray:
+    """Load shape around 1.0 with a morning ramp and an evening peak in local time."""
+    local = starts.tz_convert(LONDON_TZ)
+    hour = local.hour.to_numpy() + local.minute.to_numpy() / 60
+    morning = 0.18 * np.exp(-((hour - 8.5) ** 2) / 6)
+    evening = 0.30 * np.exp(-((hour - 17.5) ** 2) / 4)
+    night = -0.22 * np.exp(-((hour - 3.5) ** 2) / 8)
+    return 1.0 + morning + evening + night
+
+
+def price_curve(starts: pd.DatetimeIndex, rng: np.random.Generator, level: float = 85.0) -> np.ndarray:
+    """Day-ahead style prices: the load shape, a day-level shock and occasional negative hours."""
+    day_level = level * rng.lognormal(0.0, 0.25)
+    prices = day_level * (daily_shape(starts) ** 2.2) + rng.normal(0, 6, len(starts))
+    windy = rng.random() < 0.1
+    if windy:
+        prices -= rng.uniform(40, 120) * (daily_shape(starts) < 1.0)
+    return np.round(prices, 2)
+
+
+def synthetic_bm_units(n_bmus: int = 300, seed: int = 0) -> pd.DataFrame:
+    """BMU reference rows with the columns the acceptance joins use from /reference/bmunits/all."""
+    rng = np.random.default_rng([seed, n_bmus])
+    fuels = list(BMU_FUELS)
+    shares = np.array([BMU_FUELS[f][0] for f in fuels])
+    fuel = rng.choice(fuels, size=n_bmus, p=shares / shares.sum())
+    capacity = np.array([BMU_FUELS[f][1] for f in fuel]) * rng.lognormal(0, 0.4, n_bmus)
+    ng_unit = np.array([f"SYN{f[:3]}-{i:04d}" for i, f in enumerate(fuel)])
+    prefix = np.where(rng.random(n_bmus) < 0.8, 'T_', 'E_')
+    return pd.DataFrame({
+        'bmUnitName': [f"Synthetic {f.title()} {i}" for i, f in enumerate(fuel)],
+        'bmUnitType': np.where(prefix == 'T_', 'T', 'E'),
+        'elexonBmUnit': np.char.add(prefix, ng_unit),
+        'nationalGridBmUnit': ng_unit,
+        'fuelType': fuel,
+        'generationCapacity': np.round(capacity, 1),
+        'demandCapacity': np.where(fuel == 'PS', -np.round(capacity, 1), 0.0),
+        'leadPartyName': [f"Synthetic Party {i % 40}" for i in range(n_bmus)],
+    })
+
+
+def synthetic_fuelhh(start_date: str, end_date: str | None = None, seed: int = 0) -> pd.DataFrame:
+    """FUELHH rows (one per settlement period and fuel type) as returned by get_generation_by_fuel."""
+    frames = []
+    for date_str in _dates(start_date, end_date):
+        rng = _day_rng(seed, date_str, 'FUELHH')
+        grid = settlement_grid(date_str)
+        shape = daily_shape(pd.DatetimeIndex(grid['startTime']))
+        n = len(grid)
+        wind = FUELHH_MEAN['WIND'] * rng.lognormal(0, 0.5) * np.clip(1 + np.cumsum(rng.normal(0, 0.03, n)), 0.2, 2.0)
+        output = {}
+        for fuel, mean in FUELHH_MEAN.items():
+            if fuel == 'WIND':
+                output[fuel] = wind
+            elif fuel == 'CCGT':
+                output[fuel] = np.clip(mean * shape * 1.3 - 0.5 * (wind - FUELHH_MEAN['WIND']), 1500, None)
+            elif fuel == 'NUCLEAR':
+                output[fuel] = np.full(n, mean * rng.uniform(0.85, 1.0))
+            elif fuel == 'PS':
+                output[fuel] = mean * (shape - 1.0) * 8 + rng.normal(0, 50, n)
+            elif fuel.startswith('INT'):
+                output[fuel] = mean * rng.uniform(-0.6, 1.0) + rng.normal(0, mean * 0.05, n)
+            else:
+                output[fuel] = np.clip(mean * shape * rng.uniform(0.8, 1.1) + rng.normal(0, mean * 0.03 + 1, n), 0, None)
+
+        fuels = list(output)
+        starts = pd.DatetimeIndex(grid['startTime'])
+        frames.append(pd.DataFrame({
+            'dataset': 'FUELHH',
+            'publishTime': np.tile(_iso(starts + HALF_HOUR), len(fuels)),
+            'startTime': np.tile(_iso(starts), len(fuels)),
+            'settlementDate': date_str,
+            'settlementPeriod': np.tile(grid['settlementPeriod'].to_numpy(), len(fuels)),
+            'fuelType': np.repeat(fuels, n),
+            'generation': np.concatenate([output[f] for f in fuels]).round().astype('int64'),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def synthetic_demand_outturn(start_date: str, end_date: str | None = None, seed: int = 0) -> pd.DataFrame:
+    """Demand outturn stream rows as saved by save_elexon_history."""
+    frames = []
+    for date_str in _dates(start_date, end_date):
+        rng = _day_rng(seed, date_str, 'INDO')
+        grid = settlement_grid(date_str)
+        starts = pd.DatetimeIndex(grid['startTime'])
+        demand = 26000 * rng.uniform(0.9, 1.1) * daily_shape(starts) + rng.normal(0, 300, len(grid))
+        frames.append(pd.DataFrame({
+            'publishTime': _iso(starts + HALF_HOUR),
+            'startTime': _iso(starts),
+            'settlementDate': date_str,
+            'settlementPeriod': grid['settlementPeriod'],
+            'initialDemandOutturn': demand.round().astype('int64'),
+            'initialTransmissionSystemDemandOutturn': (demand * 1.08).round().astype('int64'),
+            'hour': (grid['settlementPeriod'] - 1) // 2,
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def _bod_prices(bm_units: pd.DataFrame, seed: int) -> tuple[np.ndarray, np.ndarray]:
+    """Per-BMU typical bid and offer, fixed across days like real submitted price ladders."""
+    rng = np.random.default_rng([seed, len(bm_units), 7])
+    bid = np.array([BMU_FUELS[f][2] for f in bm_units['fuelType']]) + rng.normal(0, 15, len(bm_units))
+    offer = np.array([BMU_FUELS[f][3] for f in bm_units['fuelType']]) * rng.lognormal(0, 0.3, len(bm_units))
+    return bid, np.maximum(offer, bid + 5)
+
+
+def synthetic_bod(start_date: str, end_date: str | None = None, bm_units: pd.DataFrame | None = None,
+                  seed: int = 0) -> pd.DataFrame:
+    """
+    Bid-offer pairs (BOD) for every BMU and settlement period, as returned by /balancing/bid-offer/all.
+
+    Each BMU submits pairs -2, -1, 1 and 2 per period, valid for the whole period. Higher pairs
+    cover further MW bands at steeper prices.
+    """
+    bm_units = synthetic_bm_units(seed=seed) if bm_units is None else bm_units
+    base_bid, base_offer = _bod_prices(bm_units, seed)
+    capacity = bm_units['generationCapacity'].to_numpy()
+    pair_ids = np.array([-2, -1, 1, 2])
+
+    frames = []
+    for date_str in _dates(start_date, end_date):
+        rng = _day_rng(seed, date_str, 'BOD')
+        grid = settlement_grid(date_str)
+        starts = pd.DatetimeIndex(grid['startTime'])
+        n_periods, n_units, n_pairs = len(grid), len(bm_units), len(pair_ids)
+
+        # Layout: period-major, then BMU, then pair
+        period_idx = np.repeat(np.arange(n_periods), n_units * n_pairs)
+        unit_idx = np.tile(np.repeat(np.arange(n_units), n_pairs), n_periods)
+        pair = np.tile(pair_ids, n_periods * n_units)
+        day_shift = rng.normal(0, 5, n_units)[unit_idx]
+        step = np.abs(pair)
+        offer = base_offer[unit_idx] * (1 + 0.35 * (step - 1)) + day_shift
+        bid = base_bid[unit_idx] - 10 * (step - 1) + day_shift
+        level = np.round(capacity[unit_idx] * 0.5 * np.sign(pair), 1)
+
+        frames.append(pd.DataFrame({
+            'settlementDate': date_str,
+            'settlementPeriod': grid['settlementPeriod'].to_numpy()[period_idx],
+            'timeFrom': _iso(starts)[period_idx],
+            'timeTo': _iso(starts + HALF_HOUR)[period_idx],
+            'levelFrom': level,
+            'levelTo': level,
+            'nationalGridBmUnit': bm_units['nationalGridBmUnit'].to_numpy()[unit_idx],
+            'bmUnit': bm_units['elexonBmUnit'].to_numpy()[unit_idx],
+            'pairId': pair,
+            'offer': np.round(offer, 2),
+            'bid': np.round(np.minimum(bid, offer - 1), 2),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def synthetic_boalf(start_date: str, end_date: str | None = None, bm_units: pd.DataFrame | None = None,
+                    seed: int = 0, acceptances_per_period: float | None = None) -> pd.DataFrame:
+    """
+    Bid-offer acceptances (BOALF) in the schema of /balancing/acceptances/all.
+
+    Acceptances start on whole minutes, last 1-120 minutes (so some span several settlement
+    periods) and move the unit between two MW levels within its capacity.
+    """
+    bm_units = synthetic_bm_units(seed=seed) if bm_units is None else bm_units
+    n_units = len(bm_units)
+    # Roughly 140 acceptances per period across the ~1,000 active GB BMUs
+    rate = acceptances_per_period if acceptances_per_period is not None else 0.14 * n_units
+    weights = np.array([ACCEPTANCE_WEIGHT[f] for f in bm_units['fuelType']])
+    weights = weights / weights.sum()
+    capacity = bm_units['generationCapacity'].to_numpy()
+
+    frames = []
+    next_number = 100000
+    for date_str in _dates(start_date, end_date):
+        rng = _day_rng(seed, date_str, 'BOALF')
+        day_start = local_midnight_utc(date_str)[0]
+        day_end = local_midnight_utc(pd.Timestamp(date_str) + pd.Timedelta(days=1))[0]
+        day_minutes = int((day_end - day_start) / pd.Timedelta(minutes=1))
+        n = rng.poisson(rate * day_minutes / 30)
+
+        unit_idx = rng.choice(n_units, size=n, p=weights)
+        start_minute = np.sort(rng.integers(0, day_minutes - 1, n))
+        duration = np.clip(np.round(rng.gamma(1.5, 12, n)), 1, 120).astype('int64')
+        end_minute = np.minimum(start_minute + duration, day_minutes)
+        level_from = np.round(capacity[unit_idx] * rng.uniform(0, 1, n))
+        level_to = np.clip(level_from + np.round(capacity[unit_idx] * rng.normal(0, 0.3, n)), 0, np.ceil(capacity[unit_idx]))
+
+        time_from = day_start + pd.to_timedelta(start_minute, unit='min')
+        time_to = day_start + pd.to_timedelta(end_minute, unit='min')
+        acceptance_time = time_from - pd.to_timedelta(rng.integers(1, 15, n), unit='min')
+
+        frames.append(pd.DataFrame({
+            'settlementDate': date_str,
+            'settlementPeriodFrom': start_minute // 30 + 1,
+            'settlementPeriodTo': (end_minute - 1) // 30 + 1,
+            'timeFrom': _iso(time_from),
+            'timeTo': _iso(time_to),
+            'levelFrom': level_from.astype('int64'),
+            'levelTo': level_to.astype('int64'),
+            'nationalGridBmUnit': bm_units['nationalGridBmUnit'].to_numpy()[unit_idx],
+            'bmUnit': bm_units['elexonBmUnit'].to_numpy()[unit_idx],
+            'acceptanceNumber': np.arange(next_number, next_number + n),
+            'acceptanceTime': _iso(acceptance_time),
+            'deemedBoFlag': rng.random(n) < 0.02,
+            'soFlag': rng.random(n) < 0.3,
+            'storFlag': rng.random(n) < 0.01,
+            'rrFlag': False,
+        }))
+        next_number += n
+    return pd.concat(frames, ignore_index=True)
+
+
+def synthetic_disbsad_details(start_date: str, end_date: str | None = None, seed: int = 0) -> pd.DataFrame:
+    """Balancing services adjustment actions in the schema of /balancing/nonbm/disbsad/details."""
+    frames = []
+    next_id = 1
+    for date_str in _dates(start_date, end_date):
+        rng = _day_rng(seed, date_str, 'DISBSAD')
+        grid = settlement_grid(date_str)
+        counts = rng.poisson(1.5 * daily_shape(pd.DatetimeIndex(grid['startTime'])))
+        period_idx = np.repeat(np.arange(len(grid)), counts)
+        n = len(period_idx)
+        volume = np.round(rng.choice([-1, 1], n, p=[0.35, 0.65]) * rng.gamma(2.0, 15, n), 3)
+        price = np.where(volume > 0, rng.lognormal(np.log(110), 0.4, n), rng.normal(40, 25, n))
+        frames.append(pd.DataFrame({
+            'settlementDate': date_str,
+            'settlementPeriod': grid['settlementPeriod'].to_numpy()[period_idx],
+            'startTime': _iso(pd.DatetimeIndex(grid['startTime']))[period_idx],
+            'id': np.arange(next_id, next_id + n),
+            'cost': np.round(volume * price, 2),
+            'volume': volume,
+            'soFlag': True,
+            'storFlag': rng.random(n) < 0.05,
+            'partyId': rng.choice(['SYNPARTY1', 'SYNPARTY2', 'SYNPARTY3'], n),
+            'assetId': [f"SYNASSET{i}" for i in rng.integers(1, 50, n)],
+            'isTendered': rng.random(n) < 0.2,
+            'service': rng.choice(['Energy', 'System'], n, p=[0.8, 0.2]),
+        }))
+        next_id += n
+    return pd.concat(frames, ignore_index=True)
+
+
+def disbsad_summary(details: pd.DataFrame) -> pd.DataFrame:
+    """Per-period DISBSAD summary in the /balancing/nonbm/disbsad/summary schema, zeros when idle."""
+    periods = pd.concat([
+        settlement_grid(date_str).assign(settlementDate=date_str)
+        for date_str in sorted(details['settlementDate'].unique())
+    ], ignore_index=True)
+    periods['startTime'] = _iso(pd.DatetimeIndex(periods['startTime']))
+
+    df = details.assign(price=details['cost'] / details['volume'])
+    key = ['settlementDate', 'settlementPeriod']
+    summary = periods[key + ['startTime']]
+    for side, mask in (('buy', df['volume'] > 0), ('sell', df['volume'] < 0)):
+        stats = df[mask].groupby(key).agg(**{
+            f'{side}ActionCount': ('id', 'count'),
+            f'{side}PriceMinimum': ('price', 'min'),
+            f'{side}PriceMaximum': ('price', 'max'),
+            f'{side}PriceAverage': ('price', 'mean'),
+            f'{side}VolumeTotal': ('volume', 'sum'),
+        }).round(2).reset_index()
+        summary = summary.merge(stats, on=key, how='left')
+    summary = summary.fillna(0)
+    summary['netVolume'] = (summary['buyVolumeTotal'] + summary['sellVolumeTotal']).round(3)
+    columns = ['settlementDate', 'settlementPeriod', 'startTime', 'buyActionCount', 'sellActionCount',
+               'buyPriceMinimum', 'buyPriceMaximum', 'buyPriceAverage', 'sellPriceMinimum', 'sellPriceMaximum',
+               'sellPriceAverage', 'buyVolumeTotal', 'sellVolumeTotal', 'netVolume']
+    return summary[columns].astype({'buyActionCount': 'int64', 'sellActionCount': 'int64'})
+
+
+def _nordpool_starts(date_str: str) -> pd.DatetimeIndex:
+    """Hourly UTC starts of a Nord Pool UK delivery day, which runs 23:00-23:00 London time."""
+    start = local_midnight_utc(date_str)[0] - HOUR
+    end = local_midnight_utc(pd.Timestamp(date_str) + pd.Timedelta(days=1))[0] - HOUR
+    return pd.date_range(start, end, freq=HOUR, inclusive='left')
+
+
+def synthetic_nordpool_prices(date_str: str, seed: int = 0) -> pd.DataFrame:
+    """Hourly N2EX prices as returned by scrape_nordpool; 23 or 25 rows on clock-change days."""
+    starts = _nordpool_starts(date_str)
+    return pd.DataFrame({
+        'period': local_period_labels(starts, HOUR),
+        'price': price_curve(starts, _day_rng(seed, date_str, 'nordpool')),
+    })
+
+
+def synthetic_nordpool_volumes(date_str: str, seed: int = 0) -> pd.DataFrame:
+    """Hourly N2EX volumes as returned by scrape_nordpool_volumes."""
+    rng = _day_rng(seed, date_str, 'nordpool_volumes')
+    starts = _nordpool_starts(date_str)
+    buy = 9500 * daily_shape(starts) * rng.uniform(0.9, 1.1) + rng.normal(0, 250, len(starts))
+    return pd.DataFrame({
+        'period': local_period_labels(starts, HOUR),
+        'buy_volume': np.round(buy, 1),
+        'sell_volume': np.round(buy + rng.normal(0, 200, len(starts)), 1),
+    })
+
+
+def synthetic_epexspot(date_str: str, seed: int = 0) -> pd.DataFrame:
+    """30-minute continuous market statistics as returned by scrape_epexspot."""
+    rng = _day_rng(seed, date_str, 'epexspot')
+    starts = pd.DatetimeIndex(settlement_grid(date_str)['startTime'])
+    wap = price_curve(starts, rng, level=80.0)
+    spread = rng.gamma(2.0, 8.0, len(starts))
+    volume = np.round(rng.gamma(4.0, 350.0, len(starts)), 1)
+    return pd.DataFrame({
+        'period': local_period_labels(starts, HALF_HOUR),
+        'low_price': np.round(wap - spread, 2),
+        'high_price': np.round(wap + spread * rng.uniform(0.8, 1.5, len(starts)), 2),
+        'last_price': np.round(wap + rng.normal(0, spread / 2), 2),
+        'weight_avg_price': wap,
+        'buy_volume': volume,
+        'sell_volume': volume,
+        'volume': volume,
+    })
+
+
+def synthetic_epexspot_auction(date_str: str, auction: str = 'GB-IDA1', seed: int = 0) -> pd.DataFrame:
+    """30-minute intraday auction results as returned by scrape_epexspot_auction, with summary attrs."""
+    rng = _day_rng(seed, date_str, f'epexspot_auction_{auction}')
+    starts = pd.DatetimeIndex(settlement_grid(date_str)['startTime'])
+    price = price_curve(starts, rng, level=80.0)
+    sell = np.round(rng.gamma(3.0, 150.0, len(starts)), 1)
+    df = pd.DataFrame({
+        'period': local_period_labels(starts, HALF_HOUR),
+        'buy_volume': np.round(sell * rng.uniform(0.3, 1.0, len(starts)), 1),
+        'sell_volume': sell,
+        'volume': sell,
+        'price': price,
+    })
+    local_hour = starts.tz_convert(LONDON_TZ).hour
+    df.attrs['baseload_price'] = round(float(price.mean()), 2)
+    df.attrs['peakload_price'] = round(float(price[(local_hour >= 7) & (local_hour < 19)].mean()), 2)
+    return df
+
+
+def generate_market_data(start_date: str, end_date: str | None = None, n_bmus: int = 300,
+                         seed: int = 0) -> dict[str, pd.DataFrame]:
+    """
+    Every synthetic dataset for a date span, keyed by dataset name.
+
+    Args:
+        start_date: First date in YYYY-MM-DD format
+        end_date: Last date (inclusive), defaults to start_date
+        n_bmus: Size of the synthetic BMU universe; BOD grows linearly with it
+        seed: Seed for reproducible output
+
+    Returns:
+        Dict of bm_units, fuelhh, demand_outturn, bod, boalf, disbsad_details, disbsad_summary,
+        nordpool_prices, nordpool_volumes, epexspot and epexspot_auction frames. The Nord Pool and
+        EPEX frames carry a deliveryDate column since the scrapers return one day at a time.
+    """
+    bm_units = synthetic_bm_units(n_bmus, seed)
+    details = synthetic_disbsad_details(start_date, end_date, seed)
+    dates = _dates(start_date, end_date)
+
+    def per_day(generate) -> pd.DataFrame:
+        return pd.concat([generate(d).assign(deliveryDate=d) for d in dates], ignore_index=True)
+
+    return {
+        'bm_units': bm_units,
+        'fuelhh': synthetic_fuelhh(start_date, end_date, seed),
+        'demand_outturn': synthetic_demand_outturn(start_date, end_date, seed),
+        'bod': synthetic_bod(start_date, end_date, bm_units, seed),
+        'boalf': synthetic_boalf(start_date, end_date, bm_units, seed),
+        'disbsad_details': details,
+        'disbsad_summary': disbsad_summary(details),
+        'nordpool_prices': per_day(lambda d: synthetic_nordpool_prices(d, seed)),
+        'nordpool_volumes': per_day(lambda d: synthetic_nordpool_volumes(d, seed)),
+        'epexspot': per_day(lambda d: synthetic_epexspot(d, seed)),
+        'epexspot_auction': per_day(lambda d: synthetic_epexspot_auction(d, seed=seed)),
+    }
+
+
+def write_synthetic_archive(start_date: str, end_date: str | None = None, data_dir: str = "power_research/data/synthetic",
+                            seed: int = 0, storage=None) -> int:
+    """
+    Write synthetic per-day files in the archive layout, so compaction, queries, panels and the
+    storage backends can be exercised at any scale.
+
+    Returns:
+        Number of files written
+    """
+    storage = storage or LocalStorage(data_dir)
+
+    written = 0
+    for date_str in _dates(start_date, end_date):
+        files = {
+            'nordpool/prices': synthetic_nordpool_prices(date_str, seed),
+            'nordpool/volumes': synthetic_nordpool_volumes(date_str, seed),
+            'epexspot/GB/product_30': synthetic_epexspot(date_str, seed),
+            'elexon/demand_outturn': synthetic_demand_outturn(date_str, seed=seed),
+            **{
+                f'epexspot_auction/GB/{auction}/product_30': synthetic_epexspot_auction(date_str, auction, seed)
+                for auction in ('GB-IDA1', 'GB-IDA2', 'GB-IDA3')
+            },
+        }
+        for dataset, df in files.items():
+            write_csv(storage, archive_key(dataset, date_str), df)
+            written += 1
+    print(f"Wrote {written} synthetic files to {storage}")
+    return written
+
+
+if __name__ == "__main__":
+    data = generate_market_data('2025-10-26', '2025-10-26', n_bmus=1000)
+    for name, df in data.items():
+        print(f"{name}: {len(df)} rows")
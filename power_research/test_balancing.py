@@ -0,0 +1,123 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from balancing import DisbsadCube, acceptance_costs, balancing_costs, band_energy
+from scrapers.elexon import join_acceptances_bid_offers
+from synthetic import synthetic_bm_units, synthetic_boalf, synthetic_bod, synthetic_disbsad_details
+
+
+def bid_offer_pairs(period, time_from, time_to, pairs):
+    return pd.DataFrame([
+        {'settlementDate': '2025-06-01', 'settlementPeriod': period, 'timeFrom': time_from, 'timeTo': time_to,
+         'levelFrom': level, 'levelTo': level, 'bmUnit': 'T_UNIT-1', 'pairId': pair_id, 'offer': offer, 'bid': bid}
+        for pair_id, level, offer, bid in pairs
+    ])
+
+
+def test_band_energy_ramp_crossing_band():
+    """A 0 to 100 MW ramp over an hour puts 12.5 MWh below 50 MW and 37.5 MWh above it"""
+    d0, d1, hours = np.array([0.0, 0.0]), np.array([100.0, 100.0]), np.array([1.0, 1.0])
+    energy = band_energy(d0, d1, hours, np.array([0.0, 50.0]), np.array([50.0, np.inf]))
+    np.testing.assert_allclose(energy, [37.5, 12.5])
+
+
+def test_offer_bands_and_period_split():
+    """An increase spanning two periods is split by period and priced band by band"""
+    acceptances = pd.DataFrame([
+        # A one-second ramp from 200 to 300 MW at 00:15 BST, then 300 MW until 00:45
+        {'settlementDate': '2025-06-01', 'settlementPeriodFrom': 1, 'settlementPeriodTo': 2, 'timeFrom': '2025-05-31T23:15:00Z',
+         'timeTo': '2025-05-31T23:15:01Z', 'levelFrom': 200, 'levelTo': 200, 'bmUnit': 'T_UNIT-1', 'acceptanceNumber': 1},
+        {'settlementDate': '2025-06-01', 'settlementPeriodFrom': 1, 'settlementPeriodTo': 2, 'timeFrom': '2025-05-31T23:15:01Z',
+         'timeTo': '2025-05-31T23:45:00Z', 'levelFrom': 300, 'levelTo': 300, 'bmUnit': 'T_UNIT-1', 'acceptanceNumber': 1},
+    ])
+    pairs = [(1, 40, 80.0, 30.0), (2, 1000, 120.0, 20.0), (-1, -200, 80.0, 30.0)]
+    bid_offers = pd.concat([
+        bid_offer_pairs(1, '2025-05-31T23:00:00Z', '2025-05-31T23:30:00Z', pairs),
+        bid_offer_pairs(2, '2025-05-31T23:30:00Z', '2025-06-01T00:00:00Z', pairs),
+    ], ignore_index=True)
+
+    summary = balancing_costs(acceptances, bid_offers, by=['settlementPeriod'])
+    # Period 1: ~15 minutes at +100 MW = 25 MWh: 10 MWh at £80 and 15 MWh at £120
+    # Period 2: 15 minutes = 25 MWh, priced the same way
+    np.testing.assert_allclose(summary['offer_volume_mwh'], [25.0, 25.0], atol=0.05)
+    np.testing.assert_allclose(summary['cost'], [2600.0, 2600.0], atol=5)
+    assert (summary['bid_volume_mwh'] == 0).all()
+
+
+def test_bid_decrease_has_negative_volume():
+    """Turning a unit down is priced at its bid with negative volume"""
+    acceptances = pd.DataFrame([{
+        'settlementDate': '2025-06-01', 'settlementPeriodFrom': 1, 'settlementPeriodTo': 1,
+        'timeFrom': '2025-05-31T23:00:00Z', 'timeTo': '2025-05-31T23:30:00Z', 'levelFrom': 100, 'levelTo': 0,
+        'bmUnit': 'T_UNIT-1', 'acceptanceNumber': 7,
+    }])
+    bid_offers = bid_offer_pairs(1, '2025-05-31T23:00:00Z', '2025-05-31T23:30:00Z', [(1, 100, 90.0, 40.0), (-1, -100, 90.0, 40.0)])
+    costs = acceptance_costs(join_acceptances_bid_offers(acceptances, bid_offers))
+    assert costs['pairId'].tolist() == [-1]
+    np.testing.assert_allclose(costs['volume_mwh'], [-25.0])
+    np.testing.assert_allclose(costs['cost'], [-1000.0])
+
+
+def test_costs_by_fuel_type_on_synthetic_days():
+    """Synthetic BOALF/BOD for several days price every BMU and roll up by fuel type"""
+    units = synthetic_bm_units(30, seed=5)
+    acceptances = synthetic_boalf('2025-03-29', '2025-03-31', bm_units=units, seed=5)
+    bid_offers = synthetic_bod('2025-03-29', '2025-03-31', bm_units=units, seed=5)
+    by_fuel = balancing_costs(acceptances, bid_offers, units, by=['fuelType'])
+    by_unit = balancing_costs(acceptances, bid_offers, units)
+    assert set(by_fuel['fuelType']) <= set(units['fuelType'])
+    assert np.isclose(by_fuel['cost'].sum(), by_unit['cost'].sum())
+    assert by_unit['settlementPeriod'].max() <= 48
+
+
+def test_disbsad_cube_totals_and_slices():
+    """The cube keeps every detail's cost and volume, with 46/48/50 periods per day"""
+    details = synthetic_disbsad_details('2025-10-25', '2025-10-27', seed=2)
+    cube = DisbsadCube.from_details(details, 'service')
+
+    assert cube.cost.shape == (3, 50, len(details['service'].unique()))
+    assert np.isclose(cube.cost.sum(), details['cost'].sum())
+
+    by_period = cube.by_period()
+    assert by_period.groupby('settlementDate').size().tolist() == [48, 50, 48]
+    expected = details.groupby(['settlementDate', 'settlementPeriod'])['volume'].sum()
+    actual = by_period.set_index(['settlementDate', 'settlementPeriod'])['volume']
+    np.testing.assert_allclose(actual.reindex(expected.index), expected)
+
+    autumn = cube.slice('2025-10-26')
+    assert autumn.dates == ['2025-10-26']
+    assert np.isclose(autumn.by_category()['cost'].sum(), details.loc[details['settlementDate'] == '2025-10-26', 'cost'].sum())
+    assert len(cube.to_frame()) == len(details.groupby(['settlementDate', 'settlementPeriod', 'service']))
+
+
+def test_disbsad_details_day_skips_the_cache_when_a_period_fails(tmp_path, monkeypatch):
+    """Every settlement period of the day is requested, and a day with a failed period is fetched again"""
+    import scrapers.elexon as elexon
+
+    details = synthetic_disbsad_details('2025-10-26', seed=1)
+    requested, failing = [], {7}
+
+    def fetch(settlement_date, period):
+        requested.append(period)
+        if period in failing:
+            raise ConnectionError('connection reset')
+        return details[details['settlementPeriod'] == period]
+
+    monkeypatch.setattr(elexon, 'get_balancing_nonbm_disbsad_details', fetch)
+    monkeypatch.setattr(elexon, 'CACHE_DIR', tmp_path)
+    failed = set()
+    df = elexon.get_balancing_nonbm_disbsad_details_day('2025-10-26', failed_periods=failed)
+    assert sorted(requested) == list(range(1, 51)) and failed == {7}
+    assert 7 not in set(df['settlementPeriod'])
+
+    failing.clear()
+    requested.clear()
+    assert len(elexon.get_balancing_nonbm_disbsad_details_day('2025-10-26')) == len(details)
+    assert len(requested) == 50
+    requested.clear()
+    assert len(elexon.get_balancing_nonbm_disbsad_details_day('2025-10-26')) == len(details)
+    assert requested == []
@@ -0,0 +1,157 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import json
+import pandas as pd
+from datetime import datetime
+from cli import main
+
+
+def write_prices(data_dir, date_str):
+    path = data_dir / 'nordpool' / 'prices' / f'{date_str}_prices.csv'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame({'period': ['00:00 - 01:00'], 'price': [70.0]}).to_csv(path, index=False)
+
+
+def json_events(capsys):
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def test_backfill_dry_run_plans_missing_days(tmp_path, capsys):
+    """Days with every file archived are left out of the plan"""
+    write_prices(tmp_path, '2025-11-01')
+    volumes = tmp_path / 'nordpool' / 'volumes' / '2025-11-01_volumes.csv'
+    volumes.parent.mkdir(parents=True)
+    volumes.write_text('period,sell_volume\n')
+    write_prices(tmp_path, '2025-11-02')
+
+    code = main(['--data-dir', str(tmp_path), '--log-format', 'json', 'backfill', '--start', '2025-11-01',
+                 '--end', '2025-11-03', '--sources', 'nordpool', '--dry-run'])
+
+    assert code == 0
+    planned = [(e['source'], e['date']) for e in json_events(capsys) if e['event'] == 'planned']
+    assert planned == [('nordpool', '2025-11-02'), ('nordpool', '2025-11-03')]
+
+
+def test_compact_then_verify(tmp_path, capsys):
+    """compact builds the planned partitions and verify finds nothing wrong"""
+    write_prices(tmp_path, '2025-11-01')
+
+    assert main(['--data-dir', str(tmp_path), '--log-format', 'json', 'compact',
+                 '--datasets', 'nordpool/prices', '--before', '2025-12-15']) == 0
+    events = json_events(capsys)
+    assert [e['month'] for e in events if e['event'] == 'planned'] == ['2025-11']
+    assert events[-1]['partitions'] == 1
+
+    assert main(['--data-dir', str(tmp_path), '--log-format', 'json', 'verify']) == 0
+    done = json_events(capsys)[-1]
+    assert (done['command'], done['problems']) == ('verify', 0)
+
+
+def patch_elexon(monkeypatch, tmp_path, data, calls, failing, disbsad_summary=None):
+    """Serve synthetic Elexon data, recording per-period calls and failing the periods in `failing`"""
+    import scrapers.elexon as elexon
+
+    def acceptances(settlement_date, period):
+        calls.append(('acceptances', period))
+        boalf = data['boalf']
+        return None if period in failing else boalf[boalf['settlementPeriodFrom'] == period]
+
+    def bid_offers(settlement_date, period):
+        calls.append(('bid_offers', period))
+        return data['bod'][data['bod']['settlementPeriod'] == period]
+
+    summary = data['disbsad_summary'] if disbsad_summary is None else disbsad_summary
+    monkeypatch.setattr(elexon, 'CACHE_DIR', tmp_path / 'cache')
+    monkeypatch.setattr(elexon, 'get_balancing_acceptances_all', acceptances)
+    monkeypatch.setattr(elexon, 'get_balancing_bid_offer_all', bid_offers)
+    monkeypatch.setattr(elexon, 'get_bm_units_reference', lambda: data['bm_units'])
+    monkeypatch.setattr(elexon, 'get_demand_outturn_stream', lambda *args: data['demand_outturn'])
+    monkeypatch.setattr(elexon, 'get_balancing_nonbm_disbsad_summary', lambda *args: summary)
+
+
+def test_repair_requests_only_missing_periods(tmp_path, capsys, monkeypatch):
+    """A failed period is left out of the stored day, and --repair re-requests just that period"""
+    from synthetic import generate_market_data
+
+    date = '2025-11-03'
+    data = generate_market_data(date, n_bmus=40)
+    calls = []
+    failing = {20}
+    patch_elexon(monkeypatch, tmp_path, data, calls, failing)
+    args = ['--data-dir', str(tmp_path / 'data'), '--log-format', 'json', 'backfill', '--start', date, '--end', date,
+            '--sources', 'elexon']
+
+    assert main(args) == 0
+    stored = pd.read_csv(tmp_path / 'data' / 'elexon' / f'{date}_balancing_costs.csv')
+    assert 20 not in set(stored['settlementPeriod']) and len(stored) == 47
+
+    failing.clear()
+    calls.clear()
+    capsys.readouterr()
+    assert main(args + ['--repair']) == 0
+    events = json_events(capsys)
+    assert [e['status'] for e in events if e['event'] == 'repair'] == ['repaired']
+    assert {period for name, period in calls if name == 'acceptances'} == {20}
+    assert len(calls) <= 4
+
+    costs = pd.read_csv(tmp_path / 'data' / 'elexon' / f'{date}_balancing_costs.csv')
+    assert costs['settlementPeriod'].tolist() == list(range(1, 49))
+    accepted = pd.read_csv(tmp_path / 'data' / 'elexon' / f'{date}_acceptances.csv')
+    assert 20 in set(accepted['settlementPeriodFrom'])
+    assert main(args[:4] + ['gaps', '--start', date, '--end', date, '--sources', 'elexon']) == 0
+    assert json_events(capsys)[-1]['days'] == 0
+
+
+def test_repair_converges_with_sparse_disbsad(tmp_path, capsys, monkeypatch):
+    """Periods without DISBSAD actions or acceptances are not gaps, so a second --repair makes no calls"""
+    from synthetic import generate_market_data
+
+    date = '2025-11-03'
+    data = generate_market_data(date, n_bmus=40)
+    summary = data['disbsad_summary']
+    data['boalf'] = data['boalf'][data['boalf']['settlementPeriodFrom'] != 33]
+    calls = []
+    failing = {20}
+    sparse = summary[summary['settlementPeriod'].isin([5, 30])]
+    patch_elexon(monkeypatch, tmp_path, data, calls, failing, disbsad_summary=sparse)
+    args = ['--data-dir', str(tmp_path / 'data'), '--log-format', 'json', 'backfill', '--start', date, '--end', date,
+            '--sources', 'elexon']
+
+    assert main(args) == 0
+    stored = pd.read_csv(tmp_path / 'data' / 'elexon' / f'{date}_balancing_costs.csv')
+    assert stored['settlementPeriod'].tolist() == [p for p in range(1, 49) if p != 20]
+
+    failing.clear()
+    calls.clear()
+    capsys.readouterr()
+    assert main(args + ['--repair']) == 0
+    assert [e['status'] for e in json_events(capsys) if e['event'] == 'repair'] == ['repaired']
+    assert {period for name, period in calls if name == 'acceptances'} == {20}
+
+    calls.clear()
+    assert main(args + ['--repair']) == 0
+    assert calls == []
+    assert [e['repairs'] for e in json_events(capsys) if e['event'] == 'plan'] == [0]
+
+
+def test_backfill_of_today_stores_only_ended_periods(tmp_path, capsys, monkeypatch):
+    """Today's balancing costs stop at the last finished period, are not cached and count as incomplete"""
+    import scrapers.elexon as elexon
+    from synthetic import generate_market_data
+
+    date = datetime.now().strftime('%Y-%m-%d')
+    patch_elexon(monkeypatch, tmp_path, generate_market_data(date, n_bmus=40), [], set())
+    monkeypatch.setattr(elexon, 'ended_settlement_periods', lambda settlement_date: list(range(1, 21)))
+    args = ['--data-dir', str(tmp_path / 'data'), '--log-format', 'json']
+
+    assert main(args + ['backfill', '--start', date, '--end', date, '--sources', 'elexon']) == 0
+    stored = pd.read_csv(tmp_path / 'data' / 'elexon' / f'{date}_balancing_costs.csv')
+    assert stored['settlementPeriod'].tolist() == list(range(1, 21))
+    assert not list((tmp_path / 'cache').glob('balancing_costs_simple_*'))
+
+    capsys.readouterr()
+    assert main(args + ['gaps', '--start', date, '--end', date, '--sources', 'elexon']) == 0
+    gaps = {e['dataset']: e['status'] for e in json_events(capsys) if e['event'] == 'gap'}
+    assert gaps['elexon/balancing_costs'] == 'incomplete'
@@ -0,0 +1,94 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+from compact import compact_archive, load_manifest, verify_manifest, read_compacted, closed_months
+
+
+def write_prices(data_dir, date_str, prices):
+    path = data_dir / 'nordpool' / 'prices' / f'{date_str}_prices.csv'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame({'period': ['23:00 - 00:00', '00:00 - 01:00'], 'price': prices}).to_csv(path, index=False)
+    return path
+
+
+def test_closed_months():
+    """The month containing the cut-off date is still open"""
+    assert closed_months(['2025-11-30', '2025-12-01', '2025-12-19'], before='2025-12-20') == ['2025-11']
+
+
+def test_compact_archive_and_manifest(tmp_path):
+    """Closed months become one Parquet partition each, listed in the manifest"""
+    write_prices(tmp_path, '2025-11-01', [70.0, 71.0])
+    write_prices(tmp_path, '2025-11-02', [72.0, 73.0])
+    write_prices(tmp_path, '2025-12-01', [74.0, 75.0])
+
+    assert compact_archive(str(tmp_path), datasets=['nordpool/prices'], before='2025-12-15') == 1
+    entry = load_manifest(str(tmp_path))['datasets']['nordpool/prices']['2025-11']
+    assert entry['rows'] == 4
+    assert entry['dates'] == ['2025-11-01', '2025-11-02']
+    assert verify_manifest(str(tmp_path)) == []
+
+    # Nothing changed, so a second run is a no-op
+    assert compact_archive(str(tmp_path), datasets=['nordpool/prices'], before='2025-12-15') == 0
+
+    df = read_compacted('nordpool/prices', '2025-11-02', '2025-11-30', data_dir=str(tmp_path))
+    assert df['deliveryDate'].unique().tolist() == ['2025-11-02']
+    assert df['price'].tolist() == [72.0, 73.0]
+
+
+def test_restated_day_replaces_compacted_rows(tmp_path):
+    """A re-scraped day is merged in and its old rows are dropped"""
+    path = write_prices(tmp_path, '2025-11-01', [70.0, 71.0])
+    compact_archive(str(tmp_path), datasets=['nordpool/prices'], before='2025-12-15', remove_sources=True)
+    assert not path.exists()
+
+    write_prices(tmp_path, '2025-11-01', [80.0, 81.0])
+    compact_archive(str(tmp_path), datasets=['nordpool/prices'], before='2025-12-15')
+
+    entry = load_manifest(str(tmp_path))['datasets']['nordpool/prices']['2025-11']
+    assert entry['rows'] == 2
+    assert entry['replaced_rows'] == 2
+    df = read_compacted('nordpool/prices', '2025-11-01', '2025-11-30', data_dir=str(tmp_path))
+    assert df['price'].tolist() == [80.0, 81.0]
+
+
+def test_clock_change_day_keeps_repeated_labels(tmp_path):
+    """The repeated hour of 2025-10-26 is two intervals, not a restatement"""
+    from synthetic import write_synthetic_archive
+    write_synthetic_archive('2025-10-25', '2025-10-27', str(tmp_path))
+    datasets = ['epexspot/GB/product_30', 'nordpool/prices']
+
+    compact_archive(str(tmp_path), datasets=datasets, before='2025-11-15')
+    entry = load_manifest(str(tmp_path))['datasets']['epexspot/GB/product_30']['2025-10']
+    assert entry['replaced_rows'] == 0
+    df = read_compacted('epexspot/GB/product_30', '2025-10-26', '2025-10-26', data_dir=str(tmp_path))
+    assert len(df) == 50
+    prices = read_compacted('nordpool/prices', '2025-10-26', '2025-10-26', data_dir=str(tmp_path))
+    assert len(prices) == 25
+
+    # Re-scraping the day restates both copies of the repeated hour rather than adding rows
+    day = tmp_path / 'epexspot' / 'GB' / 'product_30' / '2025-10-26.csv'
+    later = day.stat().st_mtime + 60
+    os.utime(day, (later, later))
+    assert compact_archive(str(tmp_path), datasets=datasets, before='2025-11-15') == 1
+    assert load_manifest(str(tmp_path))['datasets']['epexspot/GB/product_30']['2025-10']['replaced_rows'] == 48 + 50 + 48
+    df = read_compacted('epexspot/GB/product_30', '2025-10-26', '2025-10-26', data_dir=str(tmp_path))
+    assert len(df) == 50
+
+
+def test_rescraped_day_replaces_rows_without_a_key(tmp_path):
+    """Acceptances have no row key, so a corrected day replaces the whole compacted day"""
+    path = tmp_path / 'elexon' / '2025-11-01_acceptances.csv'
+    path.parent.mkdir(parents=True)
+    day = pd.DataFrame({'settlementDate': '2025-11-01', 'settlementPeriodFrom': [3, 4], 'bmUnit': ['A', 'B'],
+                        'offer': [10.0, 20.0]})
+    day.to_csv(path, index=False)
+    compact_archive(str(tmp_path), datasets=['elexon/acceptances'], before='2025-12-15', remove_sources=True)
+
+    day.assign(offer=[11.0, 20.0]).to_csv(path, index=False)
+    compact_archive(str(tmp_path), datasets=['elexon/acceptances'], before='2025-12-15')
+    df = read_compacted('elexon/acceptances', '2025-11-01', '2025-11-01', data_dir=str(tmp_path))
+    assert df['offer'].tolist() == [11.0, 20.0]
+    assert verify_manifest(str(tmp_path)) == []
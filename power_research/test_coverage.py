@@ -0,0 +1,87 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+from coverage import coverage_entry, expected_periods, load_coverage, plan_gaps, summarise_gaps, update_coverage
+from scrapers.storage import LocalStorage, write_csv
+from synthetic import write_synthetic_archive
+
+
+def test_expected_periods_follow_each_products_day():
+    """Settlement, hourly 23:00-23:00 and half-day auction products count their own periods"""
+    assert len(expected_periods('elexon/demand_outturn', '2025-03-30')) == 46
+    assert len(expected_periods('elexon/demand_outturn', '2025-10-26')) == 50
+    assert len(expected_periods('nordpool/prices', '2025-10-26')) == 25
+    assert len(expected_periods('epexspot_auction/GB/GB-IDA2/product_30', '2025-06-01')) == 24
+
+
+def test_coverage_index_and_gap_plan(tmp_path):
+    """Complete files have no gaps, truncated files list their missing periods, absent days are missing"""
+    storage = LocalStorage(tmp_path)
+    write_synthetic_archive('2025-10-25', '2025-10-26', str(tmp_path))
+    demand = pd.read_csv(tmp_path / 'elexon' / '2025-10-26_demand_outturn.csv')
+    write_csv(storage, 'elexon/2025-10-26_demand_outturn.csv', demand[demand['settlementPeriod'] <= 30])
+
+    datasets = ['nordpool/prices', 'epexspot/GB/product_30', 'elexon/demand_outturn']
+    index = update_coverage(storage, datasets)
+    assert len(index) == 6
+    assert set(index.loc[index['dataset'] == 'nordpool/prices', 'periods']) == {24, 25}
+
+    gaps = plan_gaps(index, datasets, ['2025-10-25', '2025-10-26', '2025-10-27'])
+    summary = summarise_gaps(gaps).set_index(['dataset', 'date'])
+    assert summary.loc[('elexon/demand_outturn', '2025-10-26'), 'status'] == 'incomplete'
+    assert summary.loc[('elexon/demand_outturn', '2025-10-26'), 'missing_periods'] == list(range(31, 51))
+    assert (summary.xs('2025-10-27', level='date')['status'] == 'missing').all()
+    assert ('nordpool/prices', '2025-10-26') not in summary.index
+
+    compacted = plan_gaps(index, datasets, ['2025-10-27'], compacted={d: {'2025-10-27'} for d in datasets})
+    assert compacted.empty
+
+
+def test_coverage_only_reads_new_or_refreshed_files(tmp_path):
+    """Known files are not re-read, refreshed dates are, and deleted files drop out"""
+    storage = LocalStorage(tmp_path)
+    write_synthetic_archive('2025-06-01', '2025-06-02', str(tmp_path))
+    first = update_coverage(storage, ['elexon/demand_outturn'])
+    assert load_coverage(storage)['key'].tolist() == first['key'].tolist()
+
+    (tmp_path / 'elexon' / '2025-06-01_demand_outturn.csv').write_text('settlementPeriod\n1\n')
+    assert update_coverage(storage, ['elexon/demand_outturn'])['periods'].tolist() == [48, 48]
+    refreshed = update_coverage(storage, ['elexon/demand_outturn'], refresh_dates={'2025-06-01'})
+    assert refreshed.set_index('date').loc['2025-06-01', 'periods'] == 1
+
+    # verify re-hashes every file and re-indexes only the one that changed
+    (tmp_path / 'elexon' / '2025-06-02_demand_outturn.csv').write_text('settlementPeriod\n1\n2\n')
+    unchanged = refreshed.set_index('key').loc['elexon/2025-06-01_demand_outturn.csv', 'md5']
+    verified = update_coverage(storage, ['elexon/demand_outturn'], verify=True).set_index('date')
+    assert (verified.loc['2025-06-01', 'periods'], verified.loc['2025-06-02', 'periods']) == (1, 2)
+    assert verified.loc['2025-06-01', 'md5'] == unchanged
+
+    (tmp_path / 'elexon' / '2025-06-02_demand_outturn.csv').unlink()
+    assert update_coverage(storage, ['elexon/demand_outturn'])['date'].tolist() == ['2025-06-01']
+    assert '_coverage.parquet' not in storage.list_keys()
+
+
+def test_datasets_without_period_layout_are_complete_once_stored(tmp_path):
+    """Acceptances only have rows for active periods, so a stored day has no gaps and an absent day is missing"""
+    storage = LocalStorage(tmp_path)
+    write_csv(storage, 'elexon/2025-06-01_acceptances.csv',
+              pd.DataFrame({'settlementDate': '2025-06-01', 'settlementPeriodFrom': [3, 17], 'bmUnit': ['A', 'B']}))
+
+    index = update_coverage(storage, ['elexon/acceptances'])
+    assert index['periods'].tolist() == [1] and index['expected_periods'].tolist() == [1]
+    gaps = summarise_gaps(plan_gaps(index, ['elexon/acceptances'], ['2025-06-01', '2025-06-02']))
+    assert gaps[['date', 'status']].values.tolist() == [['2025-06-02', 'missing']]
+
+
+def test_outturn_periods_count_once_they_have_ended():
+    """A demand file fetched mid-morning only covers the periods that had finished"""
+    data = pd.DataFrame({'settlementPeriod': range(1, 49), 'demand': 25000.0}).to_csv(index=False).encode()
+    key = 'elexon/2025-06-01_demand_outturn.csv'
+
+    during = coverage_entry('elexon/demand_outturn', '2025-06-01', key, data, now=pd.Timestamp('2025-06-01 09:00Z'))
+    assert (during['periods'], during['expected_periods']) == (20, 48)
+    after = coverage_entry('elexon/demand_outturn', '2025-06-01', key, data, now=pd.Timestamp('2025-06-02 09:00Z'))
+    assert after['periods'] == 48
@@ -0,0 +1,54 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from dynamic import DynamicStore, dynamic_at, dynamic_path, load_dynamic
+
+
+def dynamic_rows():
+    return pd.DataFrame({
+        'dataset': ['SEL', 'SEL', 'SEL', 'SIL', 'SEL'],
+        'bmUnit': ['T_DRAXX-1', 'T_DRAXX-1', 'T_DRAXX-1', 'T_DRAXX-1', 'T_PEMB-11'],
+        'time': ['2025-10-01T00:00:00Z', '2025-10-02T06:00:00Z', '2025-10-03T06:00:00Z',
+                 '2025-10-01T00:00:00Z', '2025-10-01T12:00:00Z'],
+        'value': [645, 645, 400, 0, 200],
+    })
+
+
+def test_only_changes_are_kept():
+    """Resubmitted unchanged values are dropped from the change log"""
+    store = DynamicStore.from_frame(dynamic_rows())
+    assert len(store.times) == 4
+    assert len(store.series) == 3
+
+
+def test_point_in_time_lookup():
+    """Values are the last change at or before t, NaN before the first change or for unknown units"""
+    store = DynamicStore.from_frame(dynamic_rows())
+    assert store.value_at('T_DRAXX-1', 'SEL', '2025-10-02T23:59:00Z') == 645
+    assert store.value_at('T_DRAXX-1', 'SEL', '2025-10-03T06:00:00Z') == 400
+    assert store.value_at('T_DRAXX-1', 'SIL', '2026-01-01T00:00:00Z') == 0
+    assert np.isnan(store.value_at('T_PEMB-11', 'SEL', '2025-10-01T11:59:00Z'))
+    assert np.isnan(store.value_at('T_UNKNOWN', 'SEL', '2025-10-02T00:00:00Z'))
+
+
+def test_dynamic_at_acceptances_and_persistence(tmp_path):
+    """Acceptances get SEL/SIL columns, and merged updates survive a save and load"""
+    store = DynamicStore.from_frame(dynamic_rows())
+    acceptances = pd.DataFrame({
+        'bmUnit': ['T_DRAXX-1', 'T_PEMB-11', 'T_DRAXX-1'],
+        'timeFrom': ['2025-10-01T10:00:00Z', '2025-10-02T10:00:00Z', '2025-10-04T10:00:00Z'],
+    })
+    enriched = dynamic_at(acceptances, store)
+    assert enriched['SEL'].tolist() == [645, 200, 400]
+    assert enriched['SIL'].fillna(-1).tolist() == [0, -1, 0]
+
+    store = store.merge(pd.DataFrame({'dataset': ['SEL'], 'bmUnit': ['T_PEMB-11'],
+                                      'time': ['2025-10-05T00:00:00Z'], 'value': [150]}))
+    store.save(dynamic_path(str(tmp_path)))
+    loaded = load_dynamic(str(tmp_path))
+    assert loaded.value_at('T_PEMB-11', 'SEL', '2025-10-06T00:00:00Z') == 150
+    assert np.isnan(load_dynamic(str(tmp_path / 'empty')).value_at('T_PEMB-11', 'SEL', '2025-10-06T00:00:00Z'))
@@ -0,0 +1,53 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+import pytest
+
+from compact import compact_archive
+from history import history_partitions, load_history
+from synthetic import write_synthetic_archive
+
+
+def test_load_history_matches_a_serial_read(tmp_path):
+    """Per-day files load into one frame with the date from the file name"""
+    write_synthetic_archive('2025-10-24', '2025-10-28', str(tmp_path))
+    df = load_history('nordpool', 'prices', '2025-10-25', '2025-10-27', data_dir=str(tmp_path))
+
+    expected = pd.concat([
+        pd.read_csv(tmp_path / 'nordpool' / 'prices' / f'{date}_prices.csv').assign(deliveryDate=date)
+        for date in ('2025-10-25', '2025-10-26', '2025-10-27')
+    ], ignore_index=True)
+    assert df.columns.tolist() == ['deliveryDate', 'period', 'price']
+    assert len(df) == 24 + 25 + 24
+    assert (df['price'].to_numpy() == expected['price'].to_numpy()).all()
+    assert df['deliveryDate'].tolist() == expected['deliveryDate'].tolist()
+
+
+def test_load_history_combines_compacted_and_daily_partitions(tmp_path):
+    """Compacted months and newer per-day files give one typed frame, per-day files winning"""
+    write_synthetic_archive('2025-09-29', '2025-10-02', str(tmp_path))
+    compact_archive(str(tmp_path), ['elexon/demand_outturn'], before='2025-10-01')
+    rescraped = tmp_path / 'elexon' / '2025-09-30_demand_outturn.csv'
+    day = pd.read_csv(rescraped)
+    day['initialDemandOutturn'] = 1
+    day.to_csv(rescraped, index=False)
+    (tmp_path / 'elexon' / '2025-09-29_demand_outturn.csv').unlink()
+
+    kinds = [kind for kind, _, _ in history_partitions('elexon/demand_outturn', '2025-09-29', '2025-10-02', str(tmp_path))]
+    assert kinds == ['compacted', 'daily', 'daily', 'daily']
+
+    df = load_history('elexon', 'demand_outturn', '2025-09-29', '2025-10-01',
+                      columns=['startTime', 'initialDemandOutturn'], data_dir=str(tmp_path))
+    assert df.columns.tolist() == ['settlementDate', 'startTime', 'initialDemandOutturn']
+    assert str(df['startTime'].dtype).startswith('datetime64') and str(df['startTime'].dt.tz) == 'UTC'
+    assert df.groupby('settlementDate').size().tolist() == [48, 48, 48]
+    assert (df.loc[df['settlementDate'] == '2025-09-30', 'initialDemandOutturn'] == 1).all()
+    assert df['startTime'].is_monotonic_increasing
+
+
+def test_load_history_unknown_dataset_and_empty_range(tmp_path):
+    with pytest.raises(ValueError):
+        load_history('nordpool', 'bids', '2025-10-01', data_dir=str(tmp_path))
+    assert load_history('epexspot_auction', 'GB/GB-IDA2/product_30', '2025-10-01', data_dir=str(tmp_path)) is None
@@ -0,0 +1,77 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+from datetime import datetime
+
+import leaderboard
+from leaderboard import bmu_day_partials, partial_path, save_day_partials, get_top_called_bmus, update_leaderboard
+
+
+def day_partials(date, calls):
+    acceptances = pd.DataFrame({
+        'bmUnit': [bmu for bmu, n in calls.items() for _ in range(n)],
+        'acceptanceNumber': range(sum(calls.values())),
+        'settlementPeriodFrom': [10 + i for n in calls.values() for i in range(n)],
+        'levelFrom': 100.0,
+        'levelTo': 150.0,
+    })
+    bid_offers = pd.DataFrame({
+        'bmUnit': ['T_A', 'T_A', 'T_B', 'T_C'],
+        'offer': [80.0, 120.0, 95.0, 999.0],
+    })
+    return bmu_day_partials(date, acceptances, bid_offers)
+
+
+def test_day_partials_keep_called_bmus_only():
+    """Partials hold one row per accepted BMU with mergeable offer sums"""
+    partials = day_partials('2025-10-17', {'T_A': 3, 'T_B': 1})
+
+    assert partials['bmUnit'].tolist() == ['T_A', 'T_B']
+    row = partials.set_index('bmUnit').loc['T_A']
+    assert (row['call_count'], row['first_period'], row['last_period']) == (3, 10, 12)
+    assert (row['offer_min'], row['offer_max'], row['offer_sum'], row['offer_count']) == (80.0, 120.0, 200.0, 2)
+
+
+def test_top_called_bmus_merge_across_days(tmp_path):
+    """Range queries combine stored partials without downloading anything"""
+    save_day_partials(day_partials('2025-10-16', {'T_A': 1, 'T_B': 4}), '2025-10-16', str(tmp_path))
+    save_day_partials(day_partials('2025-10-17', {'T_A': 5}), '2025-10-17', str(tmp_path))
+
+    top = get_top_called_bmus('2025-10-16', '2025-10-18', top_n=1, data_dir=str(tmp_path), update=False)
+
+    assert len(top) == 1
+    row = top.iloc[0]
+    assert row['bmUnit'] == 'T_A'
+    assert (row['call_count'], row['days_called']) == (6, 2)
+    assert (row['first_date'], row['last_date']) == ('2025-10-16', '2025-10-17')
+    assert row['offer_mean'] == 100.0
+    assert row['total_level_to'] == 900.0
+
+
+def test_days_with_failed_periods_are_not_stored(tmp_path, monkeypatch):
+    """A day missing a period's bid-offers is fetched again, and today is never stored"""
+    import scrapers.elexon as elexon
+    failing = {11}
+
+    def acceptances(settlement_date, period):
+        if period not in (10, 11):
+            return pd.DataFrame()
+        return pd.DataFrame({'bmUnit': ['T_A'], 'acceptanceNumber': [period], 'settlementPeriodFrom': [period],
+                             'settlementPeriodTo': [period], 'levelFrom': 100.0, 'levelTo': 150.0})
+
+    def bid_offers(settlement_date, period):
+        return None if period in failing else pd.DataFrame({'bmUnit': ['T_A'], 'offer': [80.0]})
+
+    monkeypatch.setattr(elexon, 'get_balancing_acceptances_all', acceptances)
+    monkeypatch.setattr(leaderboard, 'get_balancing_bid_offer_all', bid_offers)
+
+    assert update_leaderboard('2025-10-16', '2025-10-16', str(tmp_path)) == []
+    failing.clear()
+    assert update_leaderboard('2025-10-16', '2025-10-16', str(tmp_path)) == ['2025-10-16']
+    assert pd.read_parquet(partial_path('2025-10-16', str(tmp_path)))['call_count'].tolist() == [2]
+
+    today = datetime.now().strftime('%Y-%m-%d')
+    assert update_leaderboard(today, today, str(tmp_path)) == []
+    assert not partial_path(today, str(tmp_path)).exists()
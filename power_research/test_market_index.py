@@ -0,0 +1,72 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+import market_index
+from market_index import chunk_dates, load_market_index, provider_prices
+
+
+def api_rows(from_date, to_date):
+    """Market index rows as the API returns them, every provider, for settlement dates in [from, to)."""
+    rows = []
+    for date in pd.date_range(from_date, to_date, freq='D', inclusive='left').strftime('%Y-%m-%d'):
+        for period in range(1, 49):
+            rows.append({'settlementDate': date, 'settlementPeriod': period, 'dataProvider': 'APXMIDP',
+                         'price': 80.0 + period, 'volume': 500.0})
+            rows.append({'settlementDate': date, 'settlementPeriod': period, 'dataProvider': 'N2EXMIDP',
+                         'price': 0.0, 'volume': 0.0})
+    return pd.DataFrame(rows)
+
+
+def test_chunk_dates():
+    """Consecutive missing days are grouped up to the chunk size, gaps start a new chunk"""
+    dates = ['2025-06-01', '2025-06-02', '2025-06-03', '2025-06-05', '2025-06-06']
+    assert chunk_dates(dates, chunk_days=2) == [
+        ('2025-06-01', '2025-06-02'), ('2025-06-03', '2025-06-03'), ('2025-06-05', '2025-06-06')
+    ]
+
+
+def test_range_is_stored_once_per_provider(tmp_path, monkeypatch):
+    """A range is fetched in chunks, stored as a provider matrix, and not fetched again"""
+    calls = []
+
+    def fake_market_index(from_date, to_date=None, **kwargs):
+        calls.append((from_date, to_date))
+        return api_rows(from_date, to_date)
+
+    monkeypatch.setattr(market_index, 'get_market_index_data', fake_market_index)
+
+    matrix = load_market_index('2025-06-01', '2025-06-10', str(tmp_path))
+    assert len(calls) == 2
+    assert len(matrix) == 10 * 48
+    assert {'price_APXMIDP', 'volume_APXMIDP', 'price_N2EXMIDP', 'volume_N2EXMIDP'} <= set(matrix.columns)
+    assert not matrix.duplicated(['settlementDate', 'settlementPeriod']).any()
+
+    apx = provider_prices('2025-06-03', data_dir=str(tmp_path))
+    assert len(calls) == 2
+    assert apx['settlementPeriod'].tolist() == list(range(1, 49))
+    assert apx['price'].iloc[0] == 81.0
+    assert (apx['dataProvider'] == 'APXMIDP').all()
+
+    load_market_index('2025-06-08', '2025-06-12', str(tmp_path))
+    assert calls[-1] == ('2025-06-10', '2025-06-13')
+    assert len(load_market_index('2025-06-01', '2025-06-12', str(tmp_path), update=False)) == 12 * 48
+
+
+def test_partial_day_is_completed_later(tmp_path, monkeypatch):
+    """A day stored while in progress is fetched again until every period is there"""
+    calls = []
+
+    def fake_market_index(from_date, to_date=None, **kwargs):
+        calls.append((from_date, to_date))
+        rows = api_rows(from_date, to_date)
+        return rows[rows['settlementPeriod'] <= 20] if len(calls) == 1 else rows
+
+    monkeypatch.setattr(market_index, 'get_market_index_data', fake_market_index)
+
+    assert len(load_market_index('2025-06-01', data_dir=str(tmp_path))) == 20
+    assert len(load_market_index('2025-06-01', data_dir=str(tmp_path))) == 48
+    load_market_index('2025-06-01', data_dir=str(tmp_path))
+    assert len(calls) == 2
@@ -0,0 +1,70 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+from panel import (settlement_periods_in_day, settlement_period_index, period_label_index,
+                   build_market_panel)
+
+
+def test_settlement_periods_in_day():
+    """Clock-change days have 46 and 50 settlement periods"""
+    assert settlement_periods_in_day('2025-03-30') == 46
+    assert settlement_periods_in_day('2025-10-26') == 50
+    assert settlement_periods_in_day('2025-10-17') == 48
+
+
+def test_settlement_period_index_autumn_clock_change():
+    """Periods on a 50 period day map to consecutive UTC half hours"""
+    index = settlement_period_index(['2025-10-26'] * 50, range(1, 51))
+
+    assert index[0] == pd.Timestamp('2025-10-25 23:00', tz='UTC')
+    assert index[-1] == pd.Timestamp('2025-10-26 23:30', tz='UTC')
+    assert index.is_unique and index.is_monotonic_increasing
+
+
+def test_settlement_period_index_spring_clock_change():
+    """Period 3 on a 46 period day starts at 02:00 BST (01:00 UTC)"""
+    index = settlement_period_index(['2025-03-30'] * 3, [1, 2, 3])
+    assert index[2] == pd.Timestamp('2025-03-30 01:00', tz='UTC')
+
+
+def test_nordpool_day_starts_previous_evening():
+    """Nord Pool UK 23:00 - 00:00 row belongs to the evening before the delivery date"""
+    index = period_label_index(['23:00 - 00:00', '00:00 - 01:00', '22:00 - 23:00'],
+                               '2025-10-17', day_start_hour=23)
+
+    assert index[0] == pd.Timestamp('2025-10-16 22:00', tz='UTC')
+    assert index[1] == pd.Timestamp('2025-10-16 23:00', tz='UTC')
+    assert index[2] == pd.Timestamp('2025-10-17 21:00', tz='UTC')
+
+
+def test_repeated_hour_resolves_to_bst_then_gmt():
+    """The repeated 01:00 label on the autumn clock change maps to two distinct instants"""
+    index = period_label_index(['00:30 - 01:00', '01:00 - 01:30', '01:00 - 01:30'], '2025-10-26')
+
+    assert index[1] == pd.Timestamp('2025-10-26 00:00', tz='UTC')
+    assert index[2] == pd.Timestamp('2025-10-26 01:00', tz='UTC')
+
+
+def test_build_market_panel():
+    """Hourly Nord Pool prices are spread over both half hours next to Elexon data"""
+    nordpool = pd.DataFrame({
+        'period': ['23:00 - 00:00', '00:00 - 01:00'],
+        'price': [78.2, 75.98],
+        'deliveryDate': '2025-10-17'
+    })
+    elexon = pd.DataFrame({
+        'settlementDate': ['2025-10-17'] * 2,
+        'settlementPeriod': [1, 2],
+        'initialDemandOutturn': [26639, 26999],
+        'hour': [0, 0]
+    })
+
+    panel = build_market_panel(nordpool=nordpool, elexon=elexon, tz='Europe/London')
+
+    assert list(panel.columns) == ['nordpool_price', 'elexon_initialDemandOutturn']
+    assert len(panel) == 4
+    assert (panel.dtypes == 'float32').all()
+    assert panel['nordpool_price'].iloc[2] == panel['nordpool_price'].iloc[3]
+    assert panel.loc['2025-10-17 00:30', 'elexon_initialDemandOutturn'].item() == 26999
@@ -0,0 +1,71 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+from datetime import datetime
+
+import physical
+from physical import LevelStore, load_physical, physical_path, total_by_fuel, update_physical
+
+
+def physical_rows(date='2025-06-01'):
+    return pd.DataFrame({
+        'dataset': 'PN',
+        'bmUnit': ['T_CCGT-1', 'T_CCGT-1', 'T_WIND-1', 'T_WIND-2'],
+        'timeFrom': [f'{date}T10:00:00Z', f'{date}T10:30:00Z', f'{date}T10:00:00Z', f'{date}T10:15:00Z'],
+        'timeTo': [f'{date}T10:30:00Z', f'{date}T11:00:00Z', f'{date}T11:00:00Z', f'{date}T10:45:00Z'],
+        'levelFrom': [300, 300, 50, 20],
+        'levelTo': [300, 400, 50, 20],
+    })
+
+
+def test_levels_at_steps_and_ramps():
+    """Flat segments are steps, ramps are interpolated, and uncovered units are NaN"""
+    store = LevelStore.from_frame(physical_rows())
+    assert store.start.dtype == np.int32 and store.level_from.dtype == np.float32
+
+    levels = store.levels_at('2025-06-01T10:45:00Z')
+    assert levels['T_CCGT-1'] == 350
+    assert levels['T_WIND-1'] == 50
+    assert np.isnan(levels['T_WIND-2'])
+    assert store.levels_at('2025-06-01T10:29:59Z')['T_CCGT-1'] == 300
+    assert store.levels_at('2025-06-01T12:00:00Z').isna().all()
+
+
+def test_total_by_fuel():
+    """Unit levels are summed per fuel type, unknown units under UNKNOWN"""
+    store = LevelStore.from_frame(physical_rows())
+    bm_units = pd.DataFrame({'elexonBmUnit': ['T_CCGT-1', 'T_WIND-1'], 'fuelType': ['CCGT', 'WIND']})
+    totals = total_by_fuel(store, pd.Timestamp('2025-06-01 10:20', tz='UTC'), bm_units)
+    assert totals.to_dict() == {'CCGT': 300.0, 'WIND': 50.0, 'UNKNOWN': 20.0}
+
+
+def test_save_load_range(tmp_path):
+    """Per-day stores round-trip and load as one store over a range"""
+    for date in ('2025-06-01', '2025-06-02'):
+        LevelStore.from_frame(physical_rows(date)).save(physical_path(date, 'PN', str(tmp_path)))
+
+    store = load_physical('2025-06-01', '2025-06-03', 'PN', str(tmp_path))
+    assert len(store.start) == 8
+    assert store.levels_at('2025-06-02T10:45:00Z')['T_CCGT-1'] == 350
+    assert store.levels_at('2025-06-01T10:45:00Z')['T_CCGT-1'] == 350
+
+
+def test_days_with_failed_periods_are_not_stored(tmp_path, monkeypatch):
+    """A day with a period that got no response is downloaded again, and today is never stored"""
+    failing = {7}
+
+    def fetch(dataset, date, period):
+        return None if period in failing else physical_rows(date)[physical_rows(date)['bmUnit'] == 'T_WIND-1']
+
+    monkeypatch.setattr(physical, 'get_balancing_physical_all', fetch)
+
+    assert update_physical('2025-06-01', '2025-06-01', ('PN',), str(tmp_path)) == []
+    failing.clear()
+    assert update_physical('2025-06-01', '2025-06-01', ('PN',), str(tmp_path)) == [('PN', '2025-06-01')]
+    assert physical_path('2025-06-01', 'PN', str(tmp_path)).exists()
+
+    today = datetime.now().strftime('%Y-%m-%d')
+    assert update_physical(today, today, ('PN',), str(tmp_path)) == []
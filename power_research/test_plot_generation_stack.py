@@ -0,0 +1,26 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+from plot_generation_stack import generation_stack
+
+
+def test_generation_stack_matches_groupby():
+    """One-pass stack equals the per-day groupby/unstack it replaces"""
+    fuel_generation = pd.DataFrame({
+        'settlementDate': ['2025-10-17'] * 5 + ['2025-10-18'] * 3,
+        'settlementPeriod': [1, 1, 1, 2, 2, 1, 1, 1],
+        'fuelType': ['CCGT', 'INTFR', 'INTNSL', 'CCGT', 'UNKNOWN', 'WIND', 'INTVKL', 'PS'],
+        'generation': [5000, 1000, 1400, 5200, 99, 8000, -500, -300],
+    })
+
+    stack = generation_stack(fuel_generation)
+
+    assert list(stack.columns) == ['Wind', 'CCGT', 'Pumped Storage', 'Interconnectors']
+    assert stack.index.names == ['settlementDate', 'settlementPeriod']
+    assert len(stack) == 3
+    assert stack.loc[('2025-10-17', 1), 'Interconnectors'] == 2400
+    assert stack.loc[('2025-10-17', 2), 'CCGT'] == 5200
+    assert stack.loc[('2025-10-18', 1), 'Interconnectors'] == -500
+    assert stack.loc[('2025-10-18', 1), 'CCGT'] == 0
@@ -0,0 +1,52 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+from query import connect, max_offer_by_fuel_type, nordpool_epex_spread_by_hour, daily_balancing_summary
+
+
+def write_csv(path, rows):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(rows).to_csv(path, index=False)
+
+
+def test_archive_views_and_helpers(tmp_path):
+    """Views pick up dates and partition values from file paths"""
+    write_csv(tmp_path / 'nordpool/prices/2025-12-16_prices.csv', [
+        {'period': '23:00 - 00:00', 'price': 80.0},
+        {'period': '00:00 - 01:00', 'price': 70.0},
+    ])
+    write_csv(tmp_path / 'epexspot/GB/product_30/2025-12-16.csv', [
+        {'period': '00:00 - 00:30', 'weight_avg_price': 60.0, 'volume': 100.0},
+        {'period': '00:30 - 01:00', 'weight_avg_price': 80.0, 'volume': 50.0},
+    ])
+    write_csv(tmp_path / 'elexon/2025-12-16_acceptances.csv', [
+        {'settlementDate': '2025-12-16', 'bmUnit': 'T_A-1', 'fuelType': 'CCGT', 'offer': 120.0},
+        {'settlementDate': '2025-12-16', 'bmUnit': 'T_B-1', 'fuelType': 'CCGT', 'offer': 150.0},
+        {'settlementDate': '2025-12-16', 'bmUnit': 'T_C-1', 'fuelType': 'OCGT', 'offer': 300.0},
+    ])
+    write_csv(tmp_path / 'elexon/2025-12-16_balancing_costs.csv', [
+        {'settlementDate': '2025-12-16', 'settlementPeriod': 1, 'buyPriceMaximum': 98.0,
+         'buyVolumeTotal': 41.8, 'sellVolumeTotal': 0.0, 'acceptance_count': 138},
+        {'settlementDate': '2025-12-16', 'settlementPeriod': 2, 'buyPriceMaximum': 105.0,
+         'buyVolumeTotal': 10.0, 'sellVolumeTotal': 5.0, 'acceptance_count': 12},
+    ])
+
+    con = connect(str(tmp_path), threads=2)
+
+    offers = max_offer_by_fuel_type(con, '2025-12-01', '2025-12-31')
+    assert offers['fuelType'].tolist() == ['OCGT', 'CCGT']
+    assert offers['max_offer'].tolist() == [300.0, 150.0]
+
+    spread = nordpool_epex_spread_by_hour(con, '2025-12-16', '2025-12-16')
+    assert len(spread) == 1
+    assert spread['epex_price'].iloc[0] == 70.0
+    assert spread['spread'].iloc[0] == 0.0
+
+    summary = daily_balancing_summary(con, '2025-12-16', '2025-12-16')
+    assert summary['acceptance_count'].iloc[0] == 150
+    assert summary['max_buy_price'].iloc[0] == 105.0
+
+    epex_area = con.execute("SELECT DISTINCT marketArea, product FROM epex_continuous").fetchall()
+    assert epex_area == [('GB', '30')]
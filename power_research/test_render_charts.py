@@ -0,0 +1,35 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+from render_charts import render_date
+
+
+def chart_inputs(scale=1.0):
+    periods = pd.Index(range(1, 49), name='settlementPeriod')
+    return {
+        'generation': pd.DataFrame({'Nuclear': 4000.0 * scale, 'Wind': 9000.0, 'CCGT': 6000.0}, index=periods),
+        'apx': pd.DataFrame({'settlementPeriod': list(periods), 'price': 80.0, 'volume': 500.0}),
+        'nordpool_prices': pd.DataFrame({'period': [f'{h:02d}:00 - {h + 1:02d}:00' for h in range(24)], 'price': 75.0}),
+        'nordpool_volumes': pd.DataFrame({'period': [f'{h:02d}:00 - {h + 1:02d}:00' for h in range(24)], 'sell_volume': 1200.0}),
+    }
+
+
+def test_render_date_skips_unchanged_inputs(tmp_path):
+    """Every chart is written once, then only charts whose inputs changed are redrawn"""
+    hashes = render_date('2025-10-17', tmp_path, formats=('png',), inputs=chart_inputs())
+
+    assert sorted(hashes) == ['ccgt_vs_price/2025-10-17', 'generation_stack/2025-10-17',
+                              'nordpool_price_volume/2025-10-17', 'percentage_stack/2025-10-17']
+    image = tmp_path / 'generation_stack' / '2025-10-17.png'
+    assert image.exists()
+    mtime = image.stat().st_mtime_ns
+
+    assert render_date('2025-10-17', tmp_path, formats=('png',), previous_hashes=hashes, inputs=chart_inputs()) == hashes
+    assert image.stat().st_mtime_ns == mtime
+
+    changed = render_date('2025-10-17', tmp_path, formats=('png',), previous_hashes=hashes, inputs=chart_inputs(1.1))
+    assert changed['generation_stack/2025-10-17'] != hashes['generation_stack/2025-10-17']
+    assert changed['nordpool_price_volume/2025-10-17'] == hashes['nordpool_price_volume/2025-10-17']
+    assert image.stat().st_mtime_ns != mtime
@@ -0,0 +1,70 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+from archive import daily_files
+from panel import period_label_index, settlement_periods_in_day
+from synthetic import (
+    disbsad_summary, generate_market_data, synthetic_bm_units, synthetic_boalf, synthetic_bod,
+    synthetic_epexspot, synthetic_fuelhh, synthetic_nordpool_prices, write_synthetic_archive,
+)
+
+
+def test_settlement_datasets_follow_clock_changes():
+    """FUELHH and BOD cover 46, 48 and 50 periods on spring, normal and autumn days."""
+    for date, periods in (('2025-03-30', 46), ('2025-06-01', 48), ('2025-10-26', 50)):
+        fuelhh = synthetic_fuelhh(date)
+        assert fuelhh['settlementPeriod'].max() == periods == settlement_periods_in_day(date)
+        bod = synthetic_bod(date, bm_units=synthetic_bm_units(5))
+        assert len(bod) == periods * 5 * 4
+
+
+def test_nordpool_and_epex_labels_round_trip():
+    """Hourly Nord Pool has 23/25 rows on clock-change days and labels map back to unique instants."""
+    assert len(synthetic_nordpool_prices('2025-03-30')) == 23
+    assert len(synthetic_nordpool_prices('2025-10-26')) == 25
+    prices = synthetic_nordpool_prices('2025-10-26')
+    index = period_label_index(prices['period'], '2025-10-26', day_start_hour=23)
+    assert index.notna().all() and index.is_unique
+    assert len(synthetic_epexspot('2025-10-26')) == 50
+
+
+def test_acceptances_match_bod_units_and_periods():
+    """Acceptances stay within their day and reference BMUs that submitted bid-offer pairs."""
+    units = synthetic_bm_units(50, seed=3)
+    boalf = synthetic_boalf('2025-06-01', bm_units=units, seed=3)
+    assert not boalf.empty
+    assert set(boalf['bmUnit']) <= set(units['elexonBmUnit'])
+    assert (pd.to_datetime(boalf['timeTo']) > pd.to_datetime(boalf['timeFrom'])).all()
+    assert (boalf['settlementPeriodTo'] >= boalf['settlementPeriodFrom']).all()
+    assert boalf['settlementPeriodTo'].max() <= 48
+    bod = synthetic_bod('2025-06-01', bm_units=units, seed=3)
+    assert (bod['bid'] < bod['offer']).all()
+
+
+def test_generation_is_deterministic_per_day():
+    """A range equals its days generated one at a time, and the same seed gives the same data."""
+    both = synthetic_fuelhh('2025-06-01', '2025-06-02', seed=1)
+    single = pd.concat([synthetic_fuelhh('2025-06-01', seed=1), synthetic_fuelhh('2025-06-02', seed=1)], ignore_index=True)
+    pd.testing.assert_frame_equal(both, single)
+    assert not synthetic_fuelhh('2025-06-01', seed=2).equals(synthetic_fuelhh('2025-06-01', seed=1))
+
+
+def test_generate_market_data_and_summary():
+    """Every dataset is produced and the DISBSAD summary covers each period."""
+    data = generate_market_data('2025-10-26', n_bmus=20)
+    assert {'bm_units', 'fuelhh', 'bod', 'boalf', 'disbsad_details', 'disbsad_summary',
+            'nordpool_prices', 'epexspot', 'epexspot_auction'} <= set(data)
+    summary = disbsad_summary(data['disbsad_details'])
+    assert len(summary) == 50
+    assert summary['buyActionCount'].sum() + summary['sellActionCount'].sum() == len(data['disbsad_details'])
+
+
+def test_write_synthetic_archive(tmp_path):
+    """Synthetic files land in the archive layout read by panels and compaction."""
+    written = write_synthetic_archive('2025-06-01', '2025-06-02', str(tmp_path))
+    assert written == 14
+    assert len(daily_files(str(tmp_path), 'nordpool/prices')) == 2
+    assert len(daily_files(str(tmp_path), 'elexon/demand_outturn')) == 2